@@ -16,7 +16,9 @@ Version: 1.0.0
 """
 
 import argparse
+import subprocess
 import sys
+import time
 from pathlib import Path
 
 # Ajouter le répertoire parent au path si nécessaire
@@ -34,19 +36,46 @@ def mode_graphique():
         sys.exit(1)
 
 
-def mode_cli(url: str, max_pages: int = 1, sortie: str = None):
+def mode_cli(url: str, max_pages: int = 1, sortie: str = None, jobs: int = None,
+             depuis_cache: bool = False, sitemap: bool = False,
+             echantillon: int = None, arret_statistique: bool = False,
+             reprise: str = None, processus_analyse: int = None,
+             partition: str = None, dossier_partitions: str = "partitions",
+             incremental: str = None, priorite_cadres: bool = False,
+             explorer_cadres: bool = False, sonder_cadres: bool = False):
     """
     Lance l'analyse en mode ligne de commande.
 
     Args:
-        url: URL à analyser.
+        url: URL à analyser (ignorée en cas de reprise).
         max_pages: Nombre maximum de pages à crawler.
         sortie: Chemin du fichier de rapport (optionnel).
+        jobs: Nombre de récupérations simultanées (optionnel, défaut: config).
+        depuis_cache: Analyse les réponses du cache HTTP sans accès réseau.
+        sitemap: Amorce le crawl avec les sitemaps du site.
+        echantillon: Nombre de pages analysées par gabarit d'URL (optionnel).
+        arret_statistique: Arrête le crawl dès que les estimations ont convergé.
+        reprise: Identifiant d'un audit interrompu à reprendre (optionnel).
+        processus_analyse: Nombre de processus d'analyse (optionnel, défaut: config).
+        partition: Partition "K/N" d'un crawl réparti (optionnel) : les résultats
+            partiels sont écrits dans `dossier_partitions`, sans rapport.
+        dossier_partitions: Dossier partagé entre les partitions.
+        incremental: Audit incrémental : identifiant de l'audit de référence,
+            ou chaîne vide pour le dernier audit terminé du site (optionnel).
+        priorite_cadres: Récupère d'abord les pages susceptibles de contenir des cadres.
+        explorer_cadres: Analyse aussi les documents chargés par les cadres de même origine.
+        sonder_cadres: Sonde les sources des cadres (statut HTTP, titre du contenu).
     """
     from rgaa_tester.config import get_config
     from rgaa_tester.crawler import Crawler
     from rgaa_tester.analyzer import AnalyseurRGAA, ResultatAnalyseGlobal
-    from rgaa_tester.report_generator import GenerateurRapport
+    from rgaa_tester.cadres import creer_explorateur_cadres
+    from rgaa_tester.convergence import creer_suivi_convergence
+    from rgaa_tester.incremental import charger_audit_precedent
+    from rgaa_tester.pipeline import PipelineAnalyse
+    from rgaa_tester.repartition import Repartiteur, ecrire_partiel
+    from rgaa_tester.reprise import ouvrir_journal
+    from rgaa_tester.sondes import creer_sonde_cadres
     from rgaa_tester.utils import normaliser_url, formater_date
 
     print("=" * 60)
@@ -55,46 +84,283 @@ def mode_cli(url: str, max_pages: int = 1, sortie: str = None):
     print()
 
     config = get_config()
+    if jobs is not None:
+        config.set("crawler.nombre_workers", jobs)
+    if depuis_cache:
+        config.set("crawler.hors_ligne", True)
+    if sitemap:
+        config.set("crawler.utiliser_sitemap", True)
+    if echantillon:
+        config.set("crawler.echantillonnage_gabarits", True)
+        config.set("crawler.pages_par_gabarit", echantillon)
+    if arret_statistique:
+        config.set("crawler.arret_statistique", True)
+    if processus_analyse is not None:
+        config.set("analyse.processus_analyse", processus_analyse)
+    if incremental is not None:
+        config.set("crawler.audit_incremental", True)
+    if priorite_cadres:
+        config.set("crawler.priorite_cadres", True)
+    if explorer_cadres:
+        config.set("analyse.explorer_cadres", True)
+    if sonder_cadres:
+        config.set("analyse.sonder_sources_cadres", True)
+
     crawler = Crawler(config)
     analyseur = AnalyseurRGAA(config)
-    generateur = GenerateurRapport(config)
 
     # Configurer le callback de log
     crawler.definir_callback_log(lambda msg: print(f"  {msg}"))
 
+    # Journal de reprise : un audit repris garde son URL et ses limites
+    journal = None
+    if reprise:
+        try:
+            journal = ouvrir_journal(config, url, max_pages, reprise)
+        except KeyError:
+            print(f"Erreur: Audit inconnu : {reprise}")
+            sys.exit(1)
+        url, max_pages = journal.url_depart, journal.max_pages
+        print(f"Reprise de l'audit : {reprise}")
+
     url = normaliser_url(url)
+
+    # Crawl réparti : cette exécution ne parcourt qu'une partition
+    repartiteur = None
+    if partition:
+        try:
+            numero, nombre = (int(partie) for partie in partition.split('/'))
+            repartiteur = Repartiteur(dossier_partitions, numero - 1, nombre, max_pages,
+                                      expiration=float(config.get("crawler.expiration_partition", 120)))
+        except ValueError:
+            print(f"Erreur: Partition invalide : {partition} (attendu : K/N, 1 <= K <= N)")
+            sys.exit(1)
+        print(f"Partition : {numero}/{nombre} (dossier partagé : {dossier_partitions})")
+
+    # Audit incrémental : seules les pages modifiées ou nouvelles sont analysées
+    audit_precedent = None
+    if config.get("crawler.audit_incremental", False) and repartiteur is None:
+        try:
+            audit_precedent = charger_audit_precedent(
+                config, url, incremental, journal.id_audit if journal else None, analyseur.signature
+            )
+        except KeyError:
+            print(f"Erreur: Audit inconnu : {incremental}")
+            sys.exit(1)
+        except ValueError:
+            print(f"Erreur: L'audit {incremental} a été analysé avec d'autres paramètres "
+                  "(version ou règles de titres) et ne peut pas servir de référence")
+            sys.exit(1)
+        analyseur.definir_audit_precedent(audit_precedent)
+
     print(f"URL de départ : {url}")
     print(f"Maximum de pages : {max_pages}")
+    if audit_precedent is not None:
+        print(f"Audit de référence : {audit_precedent.id_audit} ({len(audit_precedent)} page(s))")
+    elif config.get("crawler.audit_incremental", False):
+        print("Audit de référence : aucun audit terminé avec les mêmes paramètres pour ce site, audit complet")
+    if depuis_cache:
+        print(f"Source : cache HTTP ({config.get('crawler.dossier_cache', 'cache')}), sans accès réseau")
     print()
 
-    # Crawl
-    print("[1/3] Récupération des pages...")
-    if max_pages == 1:
+    # Récupération et analyse en flux : chaque page est analysée dès son
+    # arrivée puis libérée
+    print("[1/3] Récupération et analyse RGAA Section 2...")
+    resultat = ResultatAnalyseGlobal(
+        url_depart=url,
+        date_analyse=formater_date()
+    )
+
+    if repartiteur is not None:
+        # La reprise n'est pas prise en charge en crawl réparti
+        pages = crawler.iterer_pages(url, max_pages, repartiteur=repartiteur)
+    elif max_pages == 1:
         page = crawler.crawl_page_unique(url)
         pages = [page] if page and page.html else []
     else:
-        pages = crawler.crawl(url, max_pages)
+        if journal is None:
+            journal = ouvrir_journal(config, url, max_pages, signature_analyse=analyseur.signature)
+        if journal is not None:
+            resultat.pages = journal.pages()
+        pages = crawler.iterer_pages(url, max_pages, journal)
+
+    # Sans page récupérée ou en cas d'erreur, l'audit reste à reprendre
+    # et ne sert pas de référence
+    interrompu = True
+    try:
+        pipeline = PipelineAnalyse(
+            analyseur,
+            config.get("analyse.taille_file_attente", 8),
+            config.get("analyse.processus_analyse", 1)
+        )
+        explorateur = creer_explorateur_cadres(config, analyseur, crawler)
+        sonde = creer_sonde_cadres(config, crawler)
+        pipeline.executer(
+            pages,
+            resultat,
+            lambda page, resultat_page: print(
+                f"  -> {page.url[:50]}... : {resultat_page.cadres_testes} cadre(s)"
+            ),
+            creer_suivi_convergence(config),
+            journal,
+            explorateur,
+            sonde
+        )
+        if explorateur is not None:
+            explorateur.fermer()
+            resultat.exploration_cadres = explorateur.vers_dict()
+        if sonde is not None:
+            sonde.fermer()
+            resultat.sonde_cadres = sonde.vers_dict()
+        crawler.fermer()
+
+        resultat.motifs_pieges = crawler.statistiques.motifs_pieges
+        resultat.doublons_redirection = crawler.statistiques.doublons_redirection
+        resultat.doublons_canonique = crawler.statistiques.doublons_canonique
+        resultat.requetes_evitees = crawler.statistiques.requetes_evitees
+        resultat.priorisation_cadres = crawler.statistiques.priorisation_cadres
+        resultat.populations_gabarits = crawler.statistiques.populations_gabarits
+        resultat.raison_arret = resultat.raison_arret or crawler.statistiques.raison_arret
+        if audit_precedent is not None:
+            resultat.delta = audit_precedent.comparer(resultat)
+
+        if repartiteur is not None:
+            repartiteur.fermer()
+            chemin = ecrire_partiel(dossier_partitions, repartiteur.numero, resultat)
+            print(f"  -> {len(resultat.pages)} page(s) analysée(s), "
+                  f"{crawler.statistiques.urls_transmises} URL(s) transmise(s), "
+                  f"{crawler.statistiques.urls_recues} reçue(s)")
+            if crawler.statistiques.partitions_perdues:
+                print(f"  -> Partition(s) perdue(s) : "
+                      f"{', '.join(f'{n}/{repartiteur.nombre}' for n in crawler.statistiques.partitions_perdues)}, "
+                      f"{crawler.statistiques.urls_abandonnees} URL(s) abandonnée(s)")
+            print(f"  -> Résultats partiels : {chemin}")
+            return
+
+        if not resultat.pages:
+            print("Erreur: Aucune page récupérée.")
+            sys.exit(1)
+        interrompu = crawler.statistiques.arret_demande
+    finally:
+        if journal is not None:
+            journal.terminer(resultat.raison_arret or "Analyse interrompue par une erreur", interrompu)
+            journal.fermer()
+
+    print(f"  -> {len(resultat.pages)} page(s) analysée(s)")
+    if resultat.delta:
+        print(f"  -> Depuis l'audit {resultat.delta['audit_reference']} : "
+              f"{resultat.delta['inchangees']} inchangée(s), "
+              f"{len(resultat.delta['modifiees'])} modifiée(s), "
+              f"{len(resultat.delta['nouvelles'])} nouvelle(s)")
+    if resultat.sonde_cadres:
+        print(f"  -> Sources de cadres sondées : {resultat.sonde_cadres['sources']}, "
+              f"dont {resultat.sonde_cadres['sources_en_erreur']} en erreur")
+    if resultat.raison_arret:
+        print(f"  -> Arrêt : {resultat.raison_arret}")
+    print()
 
-    if not pages:
-        print("Erreur: Aucune page récupérée.")
+    synthese_et_rapport(resultat, sortie)
+
+
+def mode_partitions(url: str, nombre: int, dossier: str, sortie: str = None, options: list = None):
+    """
+    Lance un crawl réparti sur N processus locaux, puis fusionne leurs résultats.
+
+    Chaque processus exécute `main.py --cli URL --shard K/N` ; la même
+    commande lancée sur plusieurs hôtes partageant `dossier` répartit le
+    crawl entre ces hôtes (fusion ensuite avec --merge).
+
+    Args:
+        url: URL de départ.
+        nombre: Nombre de partitions (processus).
+        dossier: Dossier partagé entre les partitions.
+        sortie: Chemin du fichier de rapport (optionnel).
+        options: Options transmises à chaque partition (--max-pages, --jobs...).
+    """
+    from rgaa_tester.repartition import FICHIER_ECHANGES
+
+    # Un dossier de partitions ne sert qu'à un seul crawl
+    dossier_partage = Path(dossier)
+    dossier_partage.mkdir(parents=True, exist_ok=True)
+    for ancien in [dossier_partage / FICHIER_ECHANGES, *dossier_partage.glob("partiel-*.json")]:
+        ancien.unlink(missing_ok=True)
+
+    print(f"Crawl réparti sur {nombre} processus (dossier partagé : {dossier})")
+    processus = []
+    for numero in range(1, nombre + 1):
+        journal = open(dossier_partage / f"partition-{numero:03d}.log", 'w', encoding='utf-8')
+        processus.append((numero, journal, subprocess.Popen(
+            [sys.executable, str(Path(__file__).resolve()), '--cli', url,
+             '--shard', f"{numero}/{nombre}", '--shard-dir', dossier] + (options or []),
+            stdout=journal, stderr=subprocess.STDOUT
+        )))
+
+    # Une partition en erreur interrompt les autres : le crawl serait incomplet
+    echec = None
+    en_cours = list(processus)
+    while en_cours:
+        for numero, journal, proc in list(en_cours):
+            code = proc.poll()
+            if code is None:
+                continue
+            en_cours.remove((numero, journal, proc))
+            journal.close()
+            if code != 0 and echec is None:
+                echec = numero
+                print(f"  -> Partition {numero}/{nombre} en erreur (code {code}), voir {journal.name}")
+                for _, _, autre in en_cours:
+                    autre.terminate()
+        if en_cours:
+            time.sleep(0.5)
+    if echec is not None:
+        print("Erreur: Crawl réparti interrompu, aucun rapport généré.")
         sys.exit(1)
+    print()
 
-    print(f"  -> {len(pages)} page(s) récupérée(s)")
+    mode_fusion(dossier, sortie)
+
+
+def mode_fusion(dossier: str, sortie: str = None):
+    """
+    Fusionne les résultats partiels d'un crawl réparti et génère le rapport.
+
+    Args:
+        dossier: Dossier partagé contenant les fichiers partiel-*.json.
+        sortie: Chemin du fichier de rapport (optionnel).
+    """
+    from rgaa_tester.repartition import fusionner_partiels
+
+    try:
+        resultat = fusionner_partiels(dossier)
+    except FileNotFoundError as e:
+        print(f"Erreur: {e}")
+        sys.exit(1)
+
+    print(f"Fusion des résultats partiels : {len(resultat.pages)} page(s) analysée(s)")
+    if resultat.raison_arret:
+        print(f"  -> Arrêt : {resultat.raison_arret}")
     print()
 
-    # Analyse
-    print("[2/3] Analyse RGAA Section 2...")
-    resultat = ResultatAnalyseGlobal(
-        url_depart=url,
-        date_analyse=formater_date()
-    )
+    if not resultat.pages:
+        print("Erreur: Aucune page récupérée.")
+        sys.exit(1)
+
+    synthese_et_rapport(resultat, sortie)
+
+
+def synthese_et_rapport(resultat, sortie: str = None):
+    """
+    Affiche la synthèse d'une analyse et génère son rapport.
 
-    for page in pages:
-        if page.html:
-            resultat_page = analyseur.analyser_page(page.html, page.url)
-            resultat.pages.append(resultat_page)
-            print(f"  -> {page.url[:50]}... : {resultat_page.cadres_testes} cadre(s)")
+    Args:
+        resultat: Résultat global de l'analyse.
+        sortie: Chemin du fichier de rapport (optionnel).
+    """
+    from rgaa_tester.config import get_config
+    from rgaa_tester.report_generator import GenerateurRapport
 
+    # Synthèse
+    print("[2/3] Synthèse de l'analyse...")
     resultat.calculer_statistiques()
     print()
 
@@ -111,6 +377,12 @@ def mode_cli(url: str, max_pages: int = 1, sortie: str = None):
     print(f"    Conformes          : {resultat.total_conformes_2_1}")
     print(f"    Non conformes      : {resultat.total_non_conformes_2_1}")
     print(f"    Taux de conformité : {resultat.taux_conformite_2_1:.1f}%")
+    if resultat.gabarits:
+        print(f"    Taux extrapolé     : {resultat.taux_conformite_2_1_extrapole:.1f}% "
+              f"({len(resultat.gabarits)} gabarit(s), {resultat.total_pages_estime} URLs découvertes)")
+    if resultat.convergence.get('intervalle_2_1'):
+        bas, haut = resultat.convergence['intervalle_2_1']
+        print(f"    Intervalle ({resultat.convergence['niveau_confiance']:.0%})  : {bas:.1f}% - {haut:.1f}%")
     print()
     print("  CRITÈRE 2.2 - Pertinence du titre :")
     print(f"    À vérifier         : {resultat.total_a_verifier_2_2}")
@@ -122,7 +394,7 @@ def mode_cli(url: str, max_pages: int = 1, sortie: str = None):
 
     # Génération du rapport
     print("[3/3] Génération du rapport...")
-    chemin_rapport = generateur.generer_rapport(resultat, sortie)
+    chemin_rapport = GenerateurRapport(get_config()).generer_rapport(resultat, sortie)
     print(f"  -> Rapport généré : {chemin_rapport}")
     print()
     print("Terminé.")
@@ -138,6 +410,20 @@ Exemples:
   python main.py                          # Interface graphique
   python main.py --cli https://exemple.fr # Analyse une page
   python main.py --cli https://exemple.fr --max-pages 10  # Crawler
+  python main.py --cli https://exemple.fr --max-pages 500 --jobs 8
+  python main.py --cli https://exemple.fr --max-pages 500 --from-cache
+  python main.py --cli https://exemple.fr --max-pages 500 --sitemap
+  python main.py --cli https://exemple.fr --max-pages 500 --sample 3
+  python main.py --cli https://exemple.fr --max-pages 5000 --early-stop
+  python main.py --cli https://exemple.fr --max-pages 200 --frame-priority
+  python main.py --cli https://exemple.fr --max-pages 50 --follow-frames
+  python main.py --cli https://exemple.fr --max-pages 50 --probe-frames
+  python main.py --cli https://exemple.fr --max-pages 5000 --jobs 16 --analysis-workers 8
+  python main.py --resume 20260101-120000-a1b2c3
+  python main.py --cli https://exemple.fr --max-pages 5000 --incremental
+  python main.py --cli https://exemple.fr --max-pages 20000 --shards 4
+  python main.py --cli https://exemple.fr --max-pages 20000 --shard 2/4 --shard-dir /partage/audit
+  python main.py --merge /partage/audit
   python main.py --cli https://exemple.fr --output rapport.md
 
 Pour plus d'informations, consultez le README.md
@@ -157,6 +443,109 @@ Pour plus d'informations, consultez le README.md
         help="Nombre maximum de pages à crawler (défaut: 1)"
     )
 
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        help="Nombre de pages récupérées simultanément (défaut: crawler.nombre_workers)"
+    )
+
+    parser.add_argument(
+        '--analysis-workers',
+        type=int,
+        metavar='N',
+        help="Nombre de processus d'analyse (0 : un par cœur ; défaut: analyse.processus_analyse)"
+    )
+
+    parser.add_argument(
+        '--from-cache',
+        action='store_true',
+        help="Réanalyse les réponses du cache HTTP (crawler.dossier_cache) sans accès réseau"
+    )
+
+    parser.add_argument(
+        '--sitemap',
+        action='store_true',
+        help="Amorce le crawl avec les sitemaps du site (robots.txt et /sitemap.xml)"
+    )
+
+    parser.add_argument(
+        '--sample',
+        type=int,
+        metavar='N',
+        help="Analyse N pages représentatives par gabarit d'URL et extrapole les résultats"
+    )
+
+    parser.add_argument(
+        '--early-stop',
+        action='store_true',
+        help="Parcourt le site dans un ordre aléatoire et s'arrête dès que le taux 2.1 "
+             "et le nombre de sources de cadres sont estimés avec la précision configurée"
+    )
+
+    parser.add_argument(
+        '--frame-priority',
+        action='store_true',
+        help="Récupère d'abord les pages susceptibles de contenir des cadres "
+             "(gabarits déjà vus avec cadres, pages parentes à cadres, /video, /carte...)"
+    )
+
+    parser.add_argument(
+        '--follow-frames',
+        action='store_true',
+        help="Analyse aussi les documents chargés par les cadres de même origine "
+             "(framesets, iframes internes), jusqu'à analyse.profondeur_cadres niveaux"
+    )
+
+    parser.add_argument(
+        '--probe-frames',
+        action='store_true',
+        help="Sonde chaque source de cadre distincte (statut HTTP, URL finale, titre du "
+             "contenu) pour aider la vérification du critère 2.2"
+    )
+
+    parser.add_argument(
+        '--resume',
+        metavar='AUDIT_ID',
+        help="Reprend un crawl interrompu (même URL et mêmes limites, "
+             "sans récupérer à nouveau les pages déjà analysées)"
+    )
+
+    parser.add_argument(
+        '--incremental',
+        nargs='?',
+        const='',
+        metavar='AUDIT_ID',
+        help="Réaudit incrémental : reprend les résultats des pages inchangées depuis "
+             "l'audit de référence (défaut: dernier audit terminé du site)"
+    )
+
+    parser.add_argument(
+        '--shards',
+        type=int,
+        metavar='N',
+        help="Crawl réparti sur N processus locaux, chacun propriétaire d'une partition des URLs"
+    )
+
+    parser.add_argument(
+        '--shard',
+        metavar='K/N',
+        help="Exécute la partition K sur N d'un crawl réparti (plusieurs hôtes "
+             "partageant --shard-dir) ; fusionner ensuite avec --merge"
+    )
+
+    parser.add_argument(
+        '--shard-dir',
+        default='partitions',
+        metavar='DOSSIER',
+        help="Dossier partagé entre les partitions, propre à un seul crawl (défaut: partitions)"
+    )
+
+    parser.add_argument(
+        '--merge',
+        metavar='DOSSIER',
+        help="Fusionne les résultats partiels d'un crawl réparti en un seul rapport"
+    )
+
     parser.add_argument(
         '--output', '-o',
         help="Chemin du fichier de rapport (défaut: auto-généré)"
@@ -170,8 +559,35 @@ Pour plus d'informations, consultez le README.md
 
     args = parser.parse_args()
 
-    if args.cli:
-        mode_cli(args.cli, args.max_pages, args.output)
+    if args.merge:
+        mode_fusion(args.merge, args.output)
+    elif args.cli and args.shards:
+        # Options reprises par chaque partition
+        options = ['--max-pages', str(args.max_pages)]
+        if args.jobs is not None:
+            options += ['--jobs', str(args.jobs)]
+        if args.from_cache:
+            options.append('--from-cache')
+        if args.sitemap:
+            options.append('--sitemap')
+        if args.sample:
+            options += ['--sample', str(args.sample)]
+        if args.early_stop:
+            options.append('--early-stop')
+        if args.frame_priority:
+            options.append('--frame-priority')
+        if args.follow_frames:
+            options.append('--follow-frames')
+        if args.probe_frames:
+            options.append('--probe-frames')
+        if args.analysis_workers is not None:
+            options += ['--analysis-workers', str(args.analysis_workers)]
+        mode_partitions(args.cli, args.shards, args.shard_dir, args.output, options)
+    elif args.cli or args.resume:
+        mode_cli(args.cli, args.max_pages, args.output, args.jobs, args.from_cache,
+                 args.sitemap, args.sample, args.early_stop, args.resume, args.analysis_workers,
+                 args.shard, args.shard_dir, args.incremental, args.frame_priority,
+                 args.follow_frames, args.probe_frames)
     else:
         mode_graphique()
 
@@ -5,15 +5,24 @@ Module d'analyse RGAA Section 2 - Cadres (Frames)
 Implémente les tests de conformité pour les critères 2.1 et 2.2 du RGAA 4.1.2.
 """
 
-from dataclasses import dataclass, field
+import hashlib
+import json
+from dataclasses import asdict, dataclass, field, fields
 from enum import Enum
-from typing import Any, Dict, List, Optional
-from bs4 import BeautifulSoup, Tag
+from typing import Any, Dict, Iterator, List, Optional, Union
+from urllib.parse import urljoin
+
+import lxml.html
 
 from .config import get_config
+from .document import DocumentHTML, calculer_empreinte, parser_document
+from .echantillonnage import gabarit_url
 from .utils import (
+    analyser_url,
     est_element_cache,
+    est_url_valide,
     nettoyer_texte,
+    normaliser_url,
     obtenir_emoji_statut
 )
 
@@ -41,6 +50,7 @@ class DonnesCadre:
     id_element: Optional[str] = None
     classe: Optional[str] = None
     src: Optional[str] = None
+    url_src: Optional[str] = None  # src résolu en URL absolue (http/https uniquement)
 
     # Attributs de titre
     has_title: bool = False
@@ -76,6 +86,21 @@ class DonnesCadre:
     code_html: str = ""
     numero_ligne: Optional[int] = None
 
+    # Document chargé par le cadre (exploration des cadres imbriqués)
+    url_cible: Optional[str] = None  # URL finale du document récupéré (exploration ou sonde)
+    profondeur: int = 0  # 0 : cadre de la page, 1 : cadre d'un document de cadre...
+    cadres_imbriques: List["DonnesCadre"] = field(default_factory=list)
+
+    # Sonde de la source (aide à la vérification du critère 2.2)
+    statut_source: Optional[int] = None  # Statut HTTP de la source (0 : pas de réponse)
+    titre_source: Optional[str] = None  # og:title ou <title> du contenu chargé
+    similarite_titre: Optional[float] = None  # Proximité entre title et titre_source (0 à 1)
+
+    @property
+    def source_en_erreur(self) -> bool:
+        """Indique si la source sondée n'a pas répondu ou a répondu en erreur (4xx, 5xx)."""
+        return self.statut_source is not None and (self.statut_source == 0 or self.statut_source >= 400)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convertit les données en dictionnaire."""
         return {
@@ -83,6 +108,7 @@ class DonnesCadre:
             'id': self.id_element,
             'class': self.classe,
             'src': self.src,
+            'url_src': self.url_src,
             'has_title': self.has_title,
             'title': self.title,
             'longueur_titre': self.longueur_titre,
@@ -101,9 +127,37 @@ class DonnesCadre:
             'auto_evaluation': self.auto_evaluation,
             'priorite': self.priorite.value if self.priorite else None,
             'url_page': self.url_page,
-            'code_html': self.code_html
+            'code_html': self.code_html,
+            'url_cible': self.url_cible,
+            'profondeur': self.profondeur,
+            'cadres_imbriques': [cadre.to_dict() for cadre in self.cadres_imbriques],
+            'statut_source': self.statut_source,
+            'titre_source': self.titre_source,
+            'similarite_titre': self.similarite_titre,
+            'source_en_erreur': self.source_en_erreur
         }
 
+    def vers_dict(self) -> Dict[str, Any]:
+        """Sérialise le cadre (JSON) ; réciproque de `depuis_dict`."""
+        donnees = asdict(self)
+        donnees['resultat_test_2_1'] = self.resultat_test_2_1.value
+        donnees['resultat_test_2_2'] = self.resultat_test_2_2.value
+        donnees['priorite'] = self.priorite.value if self.priorite else None
+        donnees['cadres_imbriques'] = [cadre.vers_dict() for cadre in self.cadres_imbriques]
+        return donnees
+
+    @classmethod
+    def depuis_dict(cls, donnees: Dict[str, Any]) -> "DonnesCadre":
+        """Reconstruit un cadre sérialisé par `vers_dict`."""
+        noms = {f.name for f in fields(cls)}
+        valeurs = {cle: valeur for cle, valeur in donnees.items() if cle in noms}
+        valeurs['resultat_test_2_1'] = ResultatTest(valeurs.get('resultat_test_2_1', ResultatTest.NON_APPLICABLE.value))
+        valeurs['resultat_test_2_2'] = ResultatTest(valeurs.get('resultat_test_2_2', ResultatTest.NON_APPLICABLE.value))
+        if valeurs.get('priorite'):
+            valeurs['priorite'] = PrioriteCorrection(valeurs['priorite'])
+        valeurs['cadres_imbriques'] = [cls.depuis_dict(cadre) for cadre in valeurs.get('cadres_imbriques', [])]
+        return cls(**valeurs)
+
 
 @dataclass
 class ResultatPage:
@@ -129,13 +183,84 @@ class ResultatPage:
     statut_2_1: ResultatTest = ResultatTest.NON_APPLICABLE
     statut_2_2: ResultatTest = ResultatTest.NON_APPLICABLE
 
+    # Résultat servi par le mémo d'analyse (contenu identique déjà analysé)
+    depuis_memo: bool = False
+
+    # Empreinte du contenu analysé (audit incrémental)
+    empreinte: str = ""
+
+    # Résultat reporté de l'audit précédent (contenu inchangé)
+    reportee: bool = False
+
+    # Attribut href brut du <base> de la page (sources des cadres d'un résultat réutilisé)
+    base_href: Optional[str] = None
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Sérialise le résultat (JSON) ; réciproque de `depuis_dict`."""
+        return {
+            'url': self.url,
+            'titre_page': self.titre_page,
+            'empreinte': self.empreinte,
+            'base_href': self.base_href,
+            'cadres': [cadre.vers_dict() for cadre in self.cadres]
+        }
+
+    @classmethod
+    def depuis_dict(cls, donnees: Dict[str, Any]) -> "ResultatPage":
+        """Reconstruit un résultat sérialisé par `vers_dict` (statistiques recalculées)."""
+        resultat = cls(
+            url=donnees['url'],
+            titre_page=donnees.get('titre_page', ""),
+            empreinte=donnees.get('empreinte', ""),
+            base_href=donnees.get('base_href'),
+            cadres=[DonnesCadre.depuis_dict(cadre) for cadre in donnees.get('cadres', [])]
+        )
+        resultat.calculer_statistiques()
+        return resultat
+
+    def rattacher(self, url: str) -> None:
+        """
+        Rattache à une page le résultat d'un contenu identique (mémo, audit précédent).
+
+        Les sources des cadres sont résolues de nouveau par rapport à l'URL
+        de la page et à son <base href> ; les cadres imbriqués et la sonde
+        des sources, propres à la page d'origine, sont retirés.
+
+        Args:
+            url: URL de la page.
+        """
+        self.url = url
+        base = urljoin(url, self.base_href) if self.base_href else url
+        for cadre in self.cadres:
+            cadre.url_page = url
+            cadre.url_src = resoudre_source(cadre.src, base)
+            cadre.url_cible = None
+            cadre.cadres_imbriques = []
+            cadre.statut_source = cadre.titre_source = cadre.similarite_titre = None
+        self.calculer_statistiques()
+
+    def tous_cadres(self) -> Iterator[DonnesCadre]:
+        """
+        Parcourt les cadres de la page puis, après chacun, les cadres des
+        documents qu'il charge (exploration des cadres imbriqués).
+
+        Returns:
+            Itérateur sur les cadres, en profondeur d'abord.
+        """
+        pile = list(reversed(self.cadres))
+        while pile:
+            cadre = pile.pop()
+            yield cadre
+            pile.extend(reversed(cadre.cadres_imbriques))
+
     def calculer_statistiques(self) -> None:
-        """Calcule les statistiques basées sur les cadres analysés."""
-        self.total_cadres = len(self.cadres)
-        self.cadres_exemptes = sum(1 for c in self.cadres if c.est_cache)
+        """Calcule les statistiques basées sur les cadres analysés (cadres imbriqués compris)."""
+        cadres = list(self.tous_cadres())
+        self.total_cadres = len(cadres)
+        self.cadres_exemptes = sum(1 for c in cadres if c.est_cache)
         self.cadres_testes = self.total_cadres - self.cadres_exemptes
 
-        cadres_testables = [c for c in self.cadres if not c.est_cache]
+        cadres_testables = [c for c in cadres if not c.est_cache]
 
         self.conformes_2_1 = sum(
             1 for c in cadres_testables
@@ -168,6 +293,38 @@ class ResultatPage:
             self.statut_2_2 = ResultatTest.A_VERIFIER
 
 
+def resoudre_source(src: Optional[str], base: str) -> Optional[str]:
+    """
+    Résout l'attribut src d'un cadre en URL absolue.
+
+    Args:
+        src: Attribut src brut.
+        base: URL de la page, ou de son <base href>.
+
+    Returns:
+        URL normalisée (http/https uniquement), ou None.
+    """
+    if not src or not src.strip():
+        return None
+    url_src = urljoin(base, src.strip())
+    return normaliser_url(url_src) if est_url_valide(url_src) else None
+
+
+def signature_parametres(parametres: Dict[str, Any]) -> str:
+    """
+    Calcule la signature des paramètres d'analyse.
+
+    Args:
+        parametres: Paramètres dont dépend un résultat d'analyse.
+
+    Returns:
+        Empreinte courte (16 caractères hexadécimaux).
+    """
+    return hashlib.sha256(
+        json.dumps(parametres, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    ).hexdigest()[:16]
+
+
 class AnalyseurRGAA:
     """Analyseur de conformité RGAA Section 2 (Cadres)."""
 
@@ -183,58 +340,134 @@ class AnalyseurRGAA:
         self._longueur_min_titre = self.config.get("analyse.longueur_titre_minimum", 3)
         self._detecter_generiques = self.config.get("analyse.detecter_titres_generiques", True)
 
-    def analyser_page(self, html: str, url: str) -> ResultatPage:
+        # Paramètres dont dépend un résultat d'analyse : un résultat obtenu avec
+        # d'autres paramètres (mémo, audit de référence) n'est pas réutilisé
+        from . import __version__
+        self.signature = signature_parametres({
+            'version': __version__,
+            'format_resultat': 2,  # 2 : <base href> conservé pour résoudre les sources
+            'titres_generiques': self._titres_generiques,
+            'longueur_titre_minimum': self._longueur_min_titre,
+            'detecter_titres_generiques': self._detecter_generiques,
+        })
+
+        # Mémo des résultats par empreinte de contenu (import local : memo dépend de ce module)
+        self._memo = None
+        if self.config.get("analyse.memo_analyse", True):
+            from .memo import MemoAnalyse
+            self._memo = MemoAnalyse(
+                signature=self.signature,
+                fichier=self.config.get("analyse.fichier_memo") or None,
+                entrees_memoire=self.config.get("analyse.entrees_memo", 1000),
+                taille_max_mo=self.config.get("analyse.taille_memo_mo", 100)
+            )
+
+        # Audit de référence d'un audit incrémental (voir definir_audit_precedent)
+        self._audit_precedent = None
+
+    @property
+    def memo(self):
+        """Retourne le mémo d'analyse (None s'il est désactivé)."""
+        return self._memo
+
+    def definir_audit_precedent(self, audit_precedent) -> None:
+        """
+        Active l'audit incrémental : les pages dont le contenu n'a pas changé
+        depuis l'audit de référence reprennent son résultat sans analyse.
+
+        Args:
+            audit_precedent: AuditPrecedent de référence (None pour désactiver).
+        """
+        self._audit_precedent = audit_precedent
+
+    def resultat_connu(self, empreinte: str, url: str) -> Optional[ResultatPage]:
+        """
+        Retourne un résultat existant pour un contenu, sans l'analyser.
+
+        L'audit de référence (même URL, même contenu) est consulté avant le
+        mémo (même contenu, quelle que soit l'URL).
+
+        Args:
+            empreinte: Empreinte du contenu HTML.
+            url: URL de la page.
+
+        Returns:
+            Copie du résultat rattachée à l'URL, ou None.
+        """
+        if self._audit_precedent is not None:
+            resultat = self._audit_precedent.reporter(url, empreinte)
+            if resultat is not None:
+                return resultat
+        if self._memo is not None:
+            return self._memo.obtenir(empreinte, url)
+        return None
+
+    def analyser_page(self, html: Union[str, bytes, DocumentHTML], url: str) -> ResultatPage:
         """
         Analyse une page HTML pour les critères RGAA Section 2.
 
         Args:
-            html: Contenu HTML de la page.
+            html: Contenu HTML de la page, ou document déjà parsé par le crawler.
             url: URL de la page.
 
         Returns:
             Résultat d'analyse de la page.
         """
-        soup = BeautifulSoup(html, 'lxml')
-        resultat = ResultatPage(url=url)
+        if isinstance(html, DocumentHTML):
+            document, empreinte = html, html.empreinte
+        else:
+            document, empreinte = None, calculer_empreinte(html or b"")
 
-        # Extraire le titre de la page
-        titre_tag = soup.find('title')
-        resultat.titre_page = titre_tag.get_text().strip() if titre_tag else "Sans titre"
+        # Contenu inchangé depuis l'audit précédent ou identique à un contenu déjà analysé
+        resultat = self.resultat_connu(empreinte, url)
+        if resultat is not None:
+            return resultat
 
-        # Trouver tous les cadres (iframe et frame)
-        cadres_html = soup.find_all(['iframe', 'frame'])
+        if document is None:
+            document = parser_document(html, url, empreinte)
+        resultat = ResultatPage(url=url, empreinte=empreinte, base_href=document.base_href)
+
+        # Extraire le titre de la page
+        resultat.titre_page = document.titre.strip() if document.titre is not None else "Sans titre"
 
-        for cadre in cadres_html:
-            donnees = self._analyser_cadre(cadre, url)
+        # Analyser tous les cadres (iframe et frame)
+        for cadre in document.cadres:
+            donnees = self._analyser_cadre(cadre, url, document.base)
             resultat.cadres.append(donnees)
 
         # Calculer les statistiques
         resultat.calculer_statistiques()
 
+        if self._memo is not None:
+            self._memo.enregistrer(empreinte, resultat)
+
         return resultat
 
-    def _analyser_cadre(self, element: Tag, url_page: str) -> DonnesCadre:
+    def _analyser_cadre(self, element: lxml.html.HtmlElement, url_page: str,
+                        base: Optional[str] = None) -> DonnesCadre:
         """
         Analyse un élément cadre individuel.
 
         Args:
-            element: Élément BeautifulSoup (iframe ou frame).
+            element: Élément lxml (iframe ou frame).
             url_page: URL de la page contenant le cadre.
+            base: URL du <base href> de la page (optionnel).
 
         Returns:
             Données d'analyse du cadre.
         """
         donnees = DonnesCadre(
-            type_element=element.name,
+            type_element=element.tag,
             url_page=url_page
         )
 
         # Extraire les attributs de base
         donnees.id_element = element.get('id')
         donnees.classe = element.get('class')
-        if isinstance(donnees.classe, list):
-            donnees.classe = ' '.join(donnees.classe)
+        if donnees.classe is not None:
+            donnees.classe = ' '.join(donnees.classe.split())
         donnees.src = element.get('src')
+        donnees.url_src = resoudre_source(donnees.src, base or url_page)
 
         # Extraire les attributs de titre
         donnees.title = element.get('title')
@@ -254,7 +487,7 @@ class AnalyseurRGAA:
         est_cache, raison = est_element_cache(
             style=element.get('style'),
             aria_hidden=donnees.aria_hidden,
-            hidden=element.has_attr('hidden'),
+            hidden='hidden' in element.attrib,
             width=element.get('width'),
             height=element.get('height')
         )
@@ -262,7 +495,7 @@ class AnalyseurRGAA:
         donnees.raison_cache = raison
 
         # Générer le code HTML pour le rapport
-        donnees.code_html = str(element)
+        donnees.code_html = lxml.html.tostring(element, encoding='unicode', with_tail=False)
         # Tronquer si trop long
         if len(donnees.code_html) > 500:
             donnees.code_html = donnees.code_html[:500] + "..."
@@ -427,7 +660,7 @@ class AnalyseurRGAA:
         }
 
         for page in pages:
-            for cadre in page.cadres:
+            for cadre in page.tous_cadres():
                 # Ne compter que les frames testées (non exemptées)
                 if not cadre.est_cache:
                     metrics['total_frames'] += 1
@@ -461,6 +694,21 @@ class AnalyseurRGAA:
         return metrics
 
 
+@dataclass
+class StatistiqueGabarit:
+    """Résultats d'un gabarit d'URL échantillonné, extrapolés à sa population."""
+    gabarit: str
+    population: int = 0  # URLs découvertes
+    echantillon: int = 0  # Pages analysées
+    cadres: int = 0
+    cadres_testes: int = 0
+    conformes_2_1: int = 0
+    non_conformes_2_1: int = 0
+    cadres_estimes: float = 0.0
+    cadres_testes_estimes: float = 0.0
+    taux_conformite_2_1: float = 100.0
+
+
 @dataclass
 class ResultatAnalyseGlobal:
     """Résultat global d'analyse pour un site complet."""
@@ -483,21 +731,56 @@ class ResultatAnalyseGlobal:
     total_a_verifier_2_2: int = 0
     total_alertes_2_2: int = 0
 
+    # Analyses servies par le mémo (contenu identique déjà analysé)
+    total_depuis_memo: int = 0
+
+    # Audit incrémental : résultats reportés et changements depuis l'audit de référence
+    total_reportees: int = 0
+    delta: Dict[str, Any] = field(default_factory=dict)
+
+    # Pages en double écartées avant analyse et récupérations évitées
+    doublons_redirection: int = 0
+    doublons_canonique: int = 0
+    requetes_evitees: int = 0
+
+    # Motifs d'URLs écartés par la détection des pièges de crawl
+    motifs_pieges: List[dict] = field(default_factory=list)
+
+    # Priorisation des pages à cadres : rendement comparé au parcours en largeur
+    priorisation_cadres: Dict[str, Any] = field(default_factory=dict)
+
+    # Exploration des cadres imbriqués : compteurs de l'explorateur
+    exploration_cadres: Dict[str, Any] = field(default_factory=dict)
+
+    # Sonde des sources de cadres : compteurs de la sonde
+    sonde_cadres: Dict[str, Any] = field(default_factory=dict)
+
+    # Échantillonnage par gabarit : population découverte de chaque gabarit
+    populations_gabarits: Dict[str, int] = field(default_factory=dict)
+    gabarits: List[StatistiqueGabarit] = field(default_factory=list)
+    total_pages_estime: int = 0
+    total_cadres_estime: float = 0.0
+    taux_conformite_2_1_extrapole: float = 0.0
+
+    # Fin du crawl et arrêt statistique (intervalles de confiance courants)
+    raison_arret: str = ""
+    convergence: Dict[str, Any] = field(default_factory=dict)
+
     # Statut global
     statut_section_2: str = ""
 
     def calculer_statistiques(self) -> None:
-        """Calcule les statistiques globales."""
+        """Calcule les statistiques globales (peut être rappelée sans cumuler)."""
         self.total_pages = len(self.pages)
-
-        for page in self.pages:
-            self.total_cadres += page.total_cadres
-            self.total_cadres_testes += page.cadres_testes
-            self.total_exemptes += page.cadres_exemptes
-            self.total_conformes_2_1 += page.conformes_2_1
-            self.total_non_conformes_2_1 += page.non_conformes_2_1
-            self.total_a_verifier_2_2 += page.a_verifier_2_2
-            self.total_alertes_2_2 += page.alertes_2_2
+        self.total_depuis_memo = sum(1 for page in self.pages if page.depuis_memo)
+        self.total_reportees = sum(1 for page in self.pages if page.reportee)
+        self.total_cadres = sum(page.total_cadres for page in self.pages)
+        self.total_cadres_testes = sum(page.cadres_testes for page in self.pages)
+        self.total_exemptes = sum(page.cadres_exemptes for page in self.pages)
+        self.total_conformes_2_1 = sum(page.conformes_2_1 for page in self.pages)
+        self.total_non_conformes_2_1 = sum(page.non_conformes_2_1 for page in self.pages)
+        self.total_a_verifier_2_2 = sum(page.a_verifier_2_2 for page in self.pages)
+        self.total_alertes_2_2 = sum(page.alertes_2_2 for page in self.pages)
 
         # Calculer le taux de conformité
         if self.total_cadres_testes > 0:
@@ -514,3 +797,43 @@ class ResultatAnalyseGlobal:
             self.statut_section_2 = "Conforme (vérification manuelle critère 2.2 requise)"
         else:
             self.statut_section_2 = "Non conforme"
+
+        if self.populations_gabarits:
+            self._extrapoler_gabarits()
+
+    def _extrapoler_gabarits(self) -> None:
+        """
+        Extrapole les résultats de l'échantillon à la population de chaque gabarit.
+
+        Pour chaque gabarit, les moyennes par page de l'échantillon sont
+        multipliées par le nombre d'URLs découvertes ; le taux de conformité
+        2.1 extrapolé pondère chaque gabarit par ses cadres testés estimés.
+        """
+        gabarits: Dict[str, StatistiqueGabarit] = {}
+        for page in self.pages:
+            gabarit = gabarit_url(analyser_url(page.url))
+            stat = gabarits.setdefault(gabarit, StatistiqueGabarit(gabarit))
+            stat.echantillon += 1
+            stat.cadres += page.total_cadres
+            stat.cadres_testes += page.cadres_testes
+            stat.conformes_2_1 += page.conformes_2_1
+            stat.non_conformes_2_1 += page.non_conformes_2_1
+
+        conformes_estimes = 0.0
+        for gabarit, stat in gabarits.items():
+            stat.population = max(self.populations_gabarits.get(gabarit, 0), stat.echantillon)
+            facteur = stat.population / stat.echantillon
+            stat.cadres_estimes = stat.cadres * facteur
+            stat.cadres_testes_estimes = stat.cadres_testes * facteur
+            if stat.cadres_testes:
+                stat.taux_conformite_2_1 = round(stat.conformes_2_1 / stat.cadres_testes * 100, 2)
+            conformes_estimes += stat.conformes_2_1 * facteur
+
+        self.gabarits = sorted(gabarits.values(), key=lambda g: (-g.population, g.gabarit))
+        self.total_pages_estime = sum(stat.population for stat in self.gabarits)
+        self.total_cadres_estime = round(sum(stat.cadres_estimes for stat in self.gabarits), 1)
+        cadres_testes_estimes = sum(stat.cadres_testes_estimes for stat in self.gabarits)
+        self.taux_conformite_2_1_extrapole = (
+            round(conformes_estimes / cadres_testes_estimes * 100, 2)
+            if cadres_testes_estimes else 100.0
+        )
@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+"""
+Module de cache HTTP sur disque pour RGAA Section 2 Tester
+
+Conserve les réponses HTML entre deux exécutions afin de les revalider
+par requête conditionnelle (ETag / Last-Modified) ou de les réanalyser
+sans aucun accès réseau.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+@dataclass
+class EntreeCache:
+    """Réponse HTTP conservée dans le cache."""
+    url: str
+    url_finale: str
+    statut_http: int
+    en_tetes: Dict[str, str] = field(default_factory=dict)
+    contenu: bytes = b""
+    date_stockage: float = 0.0
+
+    @property
+    def etag(self) -> Optional[str]:
+        """Retourne l'ETag de la réponse."""
+        return CaseInsensitiveDict(self.en_tetes).get('ETag')
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        """Retourne la date Last-Modified de la réponse."""
+        return CaseInsensitiveDict(self.en_tetes).get('Last-Modified')
+
+    def en_tetes_conditionnels(self) -> Dict[str, str]:
+        """
+        Construit les en-têtes d'une requête de revalidation.
+
+        Returns:
+            En-têtes If-None-Match / If-Modified-Since.
+        """
+        en_tetes = {}
+        if self.etag:
+            en_tetes['If-None-Match'] = self.etag
+        if self.last_modified:
+            en_tetes['If-Modified-Since'] = self.last_modified
+        return en_tetes
+
+    def en_reponse(self) -> requests.Response:
+        """
+        Reconstruit une réponse requests à partir de l'entrée.
+
+        Returns:
+            Réponse équivalente à celle d'origine.
+        """
+        reponse = requests.Response()
+        reponse.status_code = self.statut_http
+        reponse.headers = CaseInsensitiveDict(self.en_tetes)
+        reponse.url = self.url_finale
+        reponse._content = self.contenu
+        reponse.encoding = None
+        return reponse
+
+
+class CacheHTTP:
+    """
+    Cache de réponses HTTP sur disque, indexé par URL normalisée.
+
+    Chaque entrée est stockée dans deux fichiers (métadonnées JSON et
+    corps brut) écrits de manière atomique : le cache peut être lu et
+    alimenté simultanément par plusieurs workers.
+    """
+
+    def __init__(self, dossier: str):
+        """
+        Initialise le cache.
+
+        Args:
+            dossier: Répertoire de stockage des entrées.
+        """
+        self._dossier = Path(dossier)
+        self._verrou = threading.Lock()
+
+        # Compteurs
+        self.lectures = 0
+        self.revalidations = 0
+        self.ecritures = 0
+
+    @staticmethod
+    def cle(url: str) -> str:
+        """
+        Calcule la clé de stockage d'une URL.
+
+        Args:
+            url: URL normalisée.
+
+        Returns:
+            Empreinte SHA-256 de l'URL.
+        """
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def _chemins(self, url: str):
+        """Retourne les chemins (métadonnées, corps) d'une entrée."""
+        cle = self.cle(url)
+        dossier = self._dossier / cle[:2]
+        return dossier / f"{cle}.json", dossier / f"{cle}.body"
+
+    def lire(self, url: str) -> Optional[EntreeCache]:
+        """
+        Lit l'entrée associée à une URL.
+
+        Args:
+            url: URL normalisée.
+
+        Returns:
+            Entrée du cache, ou None si absente ou illisible.
+        """
+        chemin_meta, chemin_corps = self._chemins(url)
+        try:
+            with open(chemin_meta, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            contenu = chemin_corps.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+        return EntreeCache(
+            url=meta.get('url', url),
+            url_finale=meta.get('url_finale', url),
+            statut_http=meta.get('statut_http', 200),
+            en_tetes=meta.get('en_tetes', {}),
+            contenu=contenu,
+            date_stockage=meta.get('date_stockage', 0.0)
+        )
+
+    def ecrire(self, url: str, reponse: requests.Response) -> None:
+        """
+        Enregistre une réponse HTTP.
+
+        Args:
+            url: URL normalisée demandée.
+            reponse: Réponse complète (corps déjà téléchargé).
+        """
+        chemin_meta, chemin_corps = self._chemins(url)
+        meta = {
+            'url': url,
+            'url_finale': reponse.url or url,
+            'statut_http': reponse.status_code,
+            'en_tetes': dict(reponse.headers),
+            'date_stockage': time.time()
+        }
+
+        try:
+            chemin_meta.parent.mkdir(parents=True, exist_ok=True)
+            # Corps d'abord : une entrée dont les métadonnées existent est complète
+            self._ecrire_atomique(chemin_corps, reponse.content)
+            self._ecrire_atomique(
+                chemin_meta,
+                json.dumps(meta, ensure_ascii=False).encode('utf-8')
+            )
+        except OSError:
+            return
+
+        with self._verrou:
+            self.ecritures += 1
+
+    def rafraichir(self, url: str, entree: EntreeCache, reponse: requests.Response) -> None:
+        """
+        Met à jour les en-têtes d'une entrée revalidée (réponse 304).
+
+        Args:
+            url: URL normalisée.
+            entree: Entrée revalidée.
+            reponse: Réponse 304 du serveur.
+        """
+        for nom in ('ETag', 'Last-Modified', 'Cache-Control', 'Expires', 'Date'):
+            if nom in reponse.headers:
+                entree.en_tetes[nom] = reponse.headers[nom]
+
+        chemin_meta, _ = self._chemins(url)
+        meta = {
+            'url': entree.url,
+            'url_finale': entree.url_finale,
+            'statut_http': entree.statut_http,
+            'en_tetes': entree.en_tetes,
+            'date_stockage': time.time()
+        }
+        try:
+            self._ecrire_atomique(
+                chemin_meta,
+                json.dumps(meta, ensure_ascii=False).encode('utf-8')
+            )
+        except OSError:
+            pass
+
+    def noter_lecture(self, revalidation: bool = False) -> None:
+        """
+        Comptabilise une réponse servie depuis le cache.
+
+        Args:
+            revalidation: True si le serveur a confirmé l'entrée (304).
+        """
+        with self._verrou:
+            self.lectures += 1
+            if revalidation:
+                self.revalidations += 1
+
+    @staticmethod
+    def _ecrire_atomique(chemin: Path, donnees: bytes) -> None:
+        """Écrit un fichier via un fichier temporaire renommé."""
+        descripteur, temporaire = tempfile.mkstemp(dir=chemin.parent, suffix='.tmp')
+        try:
+            with os.fdopen(descripteur, 'wb') as f:
+                f.write(donnees)
+            os.replace(temporaire, chemin)
+        except OSError:
+            try:
+                os.unlink(temporaire)
+            except OSError:
+                pass
+            raise
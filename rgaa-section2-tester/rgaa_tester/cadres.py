@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+Module d'exploration des cadres imbriqués pour RGAA Section 2 Tester
+
+Récupère les documents chargés par les cadres de même origine que la page
+(framesets, iframes internes), les analyse et rattache leurs propres cadres
+au cadre parent, jusqu'à une profondeur maximale. Une même source de cadre
+apparaissant souvent sur des milliers de pages, chaque document n'est
+récupéré et analysé qu'une fois par audit.
+"""
+
+import copy
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .analyzer import AnalyseurRGAA, DonnesCadre, ResultatPage
+from .config import Config
+from .crawler import Crawler, PageCrawlee
+from .utils import analyser_url, normaliser_url
+
+
+def creer_explorateur_cadres(config: Config,
+                             analyseur: AnalyseurRGAA,
+                             crawler: Crawler) -> Optional["ExplorateurCadres"]:
+    """
+    Crée l'explorateur de cadres imbriqués s'il est activé.
+
+    Args:
+        config: Configuration de l'application.
+        analyseur: Analyseur appliqué aux documents des cadres.
+        crawler: Crawler utilisé pour les récupérer.
+
+    Returns:
+        Un nouvel explorateur, ou None si l'exploration est désactivée.
+    """
+    if not config.get("analyse.explorer_cadres", False):
+        return None
+    return ExplorateurCadres(
+        analyseur,
+        crawler.recuperer_cible,
+        profondeur_max=int(config.get("analyse.profondeur_cadres", 2)),
+        workers=int(config.get("analyse.workers_cadres", 4)),
+        max_documents=int(config.get("analyse.max_documents_cadres", 1000))
+    )
+
+
+class ExplorateurCadres:
+    """
+    Explorateur des documents chargés par les cadres d'une page.
+
+    Les cadres sont explorés niveau par niveau : les documents de tous les
+    cadres d'un niveau sont récupérés simultanément, puis les cadres qu'ils
+    contiennent forment le niveau suivant. Le cache par source conserve le
+    résultat d'analyse de chaque document (sans ses cadres imbriqués, qui
+    sont rattachés à chaque exploration) : un document partagé par
+    plusieurs pages, ou en cours de récupération pour une autre page,
+    n'est pas demandé de nouveau.
+
+    Seuls les cadres visibles de même origine (schéma et hôte) que la page
+    sont suivis ; un cadre chargeant l'un de ses ancêtres n'est pas suivi.
+    """
+
+    def __init__(self,
+                 analyseur: AnalyseurRGAA,
+                 recuperer: Callable[[str], Optional[PageCrawlee]],
+                 profondeur_max: int = 2,
+                 workers: int = 4,
+                 max_documents: int = 1000):
+        """
+        Initialise l'explorateur.
+
+        Args:
+            analyseur: Analyseur appliqué aux documents des cadres.
+            recuperer: Fonction(url) récupérant un document (Crawler.recuperer_cible).
+            profondeur_max: Nombre maximum de niveaux de documents récupérés
+                (1 : documents des cadres de la page seulement).
+            workers: Nombre de documents récupérés simultanément.
+            max_documents: Nombre maximum de documents distincts récupérés par audit.
+        """
+        self._analyseur = analyseur
+        self._recuperer = recuperer
+        self._profondeur_max = max(1, profondeur_max)
+        self._max_documents = max_documents
+        self._executeur = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="rgaa-cadres")
+        # Source normalisée -> résultat d'analyse du document (None : non récupérable)
+        self._cache: Dict[str, Future] = {}
+        self._verrou = threading.Lock()
+
+        # Compteurs
+        self.documents = 0  # Documents récupérés et analysés
+        self.erreurs = 0  # Documents non récupérables (erreur HTTP, non-HTML, robots.txt)
+        self.reutilisations = 0  # Cadres servis par le cache par source
+        self.hors_origine = 0  # Cadres d'une autre origine, non suivis
+        self.cycles = 0  # Cadres chargeant l'un de leurs ancêtres
+        self.hors_limite = 0  # Cadres non suivis, `max_documents` atteint
+        self.cadres_imbriques = 0  # Cadres rattachés à un cadre parent
+        self.profondeur_atteinte = 0
+
+    def explorer(self, resultat: ResultatPage) -> None:
+        """
+        Rattache aux cadres d'une page les cadres des documents qu'ils chargent.
+
+        Les cadres imbriqués d'un résultat repris (mémo, audit précédent)
+        sont remplacés ; les statistiques de la page sont recalculées.
+
+        Args:
+            resultat: Résultat d'analyse de la page.
+        """
+        origine = self._origine(resultat.url)
+        niveau: List[Tuple[DonnesCadre, Tuple[str, ...]]] = [
+            (cadre, (resultat.url,)) for cadre in resultat.cadres
+        ]
+
+        for profondeur in range(self._profondeur_max):
+            # Lancer toutes les récupérations du niveau avant d'attendre la première
+            a_suivre = []
+            for cadre, ancetres in niveau:
+                cadre.cadres_imbriques = []
+                cadre.url_cible = None
+                source = self._source_a_suivre(cadre, origine, ancetres)
+                if source is not None:
+                    future = self._document(source)
+                    if future is not None:
+                        a_suivre.append((cadre, ancetres, source, future))
+
+            niveau = []
+            for cadre, ancetres, source, future in a_suivre:
+                document = future.result()
+                if document is None:
+                    continue
+                if document.url in ancetres:
+                    self._compter('cycles')
+                    continue
+
+                cadre.url_cible = document.url
+                cadre.cadres_imbriques = copy.deepcopy(document.cadres)
+                for imbrique in cadre.cadres_imbriques:
+                    imbrique.profondeur = profondeur + 1
+                    niveau.append((imbrique, ancetres + (source, document.url)))
+                if cadre.cadres_imbriques:
+                    with self._verrou:
+                        self.cadres_imbriques += len(cadre.cadres_imbriques)
+                        self.profondeur_atteinte = max(self.profondeur_atteinte, profondeur + 1)
+
+            if not niveau:
+                break
+
+        resultat.calculer_statistiques()
+
+    def _source_a_suivre(self, cadre: DonnesCadre, origine: Tuple[str, str],
+                         ancetres: Tuple[str, ...]) -> Optional[str]:
+        """
+        Retourne la source normalisée d'un cadre à suivre, ou None.
+
+        Args:
+            cadre: Cadre analysé.
+            origine: Origine (schéma, hôte) de la page.
+            ancetres: URLs de la page et des documents de cadres englobants.
+
+        Returns:
+            URL du document à récupérer.
+        """
+        if cadre.est_cache or not cadre.url_src:
+            return None
+        source = normaliser_url(cadre.url_src)
+        if self._origine(source) != origine:
+            self._compter('hors_origine')
+            return None
+        if source in ancetres:
+            self._compter('cycles')
+            return None
+        return source
+
+    def _document(self, source: str) -> Optional[Future]:
+        """
+        Retourne le résultat (futur) d'un document, en lançant sa récupération si besoin.
+
+        Args:
+            source: URL normalisée du document.
+
+        Returns:
+            Futur du résultat d'analyse, ou None si la limite de documents est atteinte.
+        """
+        with self._verrou:
+            future = self._cache.get(source)
+            if future is not None:
+                self.reutilisations += 1
+                return future
+            if len(self._cache) >= self._max_documents:
+                self.hors_limite += 1
+                return None
+            future = self._executeur.submit(self._analyser_document, source)
+            self._cache[source] = future
+            return future
+
+    def _analyser_document(self, source: str) -> Optional[ResultatPage]:
+        """
+        Récupère et analyse le document d'un cadre (thread de l'explorateur).
+
+        Args:
+            source: URL normalisée du document.
+
+        Returns:
+            Résultat d'analyse sans cadres imbriqués, ou None si le document
+            n'a pas pu être récupéré.
+        """
+        try:
+            page = self._recuperer(source)
+            if page is None or not page.html or page.erreur:
+                self._compter('erreurs')
+                return None
+            resultat = self._analyseur.analyser_page(page.document or page.html, page.url)
+        except Exception:
+            self._compter('erreurs')
+            return None
+
+        self._compter('documents')
+        return resultat
+
+    @staticmethod
+    def _origine(url: str) -> Tuple[str, str]:
+        """Origine d'une URL : schéma et hôte (port compris)."""
+        composants = analyser_url(url)
+        return composants.schema, composants.hote
+
+    def _compter(self, nom: str) -> None:
+        """Incrémente un compteur (appelé depuis plusieurs threads)."""
+        with self._verrou:
+            setattr(self, nom, getattr(self, nom) + 1)
+
+    def fermer(self) -> None:
+        """Arrête les threads de récupération."""
+        self._executeur.shutdown(wait=True, cancel_futures=True)
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Retourne les compteurs de l'exploration (rapport)."""
+        with self._verrou:
+            return {
+                'profondeur_max': self._profondeur_max,
+                'documents': self.documents,
+                'erreurs': self.erreurs,
+                'reutilisations': self.reutilisations,
+                'hors_origine': self.hors_origine,
+                'cycles': self.cycles,
+                'hors_limite': self.hors_limite,
+                'cadres_imbriques': self.cadres_imbriques,
+                'profondeur_atteinte': self.profondeur_atteinte,
+            }
@@ -27,14 +27,82 @@ class Config:
             "user_agent": "RGAA-Tester/1.0 (Accessibility Checker)",
             "respecter_robots_txt": True,
             "delai_entre_requetes": 1.0,  # Secondes
-            "suivre_liens_externes": False
+            "suivre_liens_externes": False,
+            "respecter_canonique": True,  # Page écartée si son <link rel="canonical"> a déjà été visité
+            "nombre_workers": 1,  # Récupérations simultanées (1 = séquentiel)
+            "max_requetes_par_hote": 4,  # Plafond de la régulation par hôte
+            "regulation_adaptative": True,  # Requêtes simultanées et délai adaptés à chaque hôte
+            "requetes_par_hote_min": 1,  # Plancher de requêtes simultanées
+            "delai_min": None,  # Bornes du délai adaptatif (s) ; None : delai_entre_requetes
+            "delai_max": 10.0,
+            "seuil_latence": 2.0,  # Latence / meilleure latence signalant une saturation
+            "tentatives_max": 3,  # Nouvelles tentatives (429, 502, 503, 504, timeouts)
+            "delai_tentative": 1.0,  # Attente avant la première nouvelle tentative, doublée ensuite
+            "attente_max": 60.0,  # Attente maximale (nouvelle tentative, Retry-After)
+            "seuil_disjoncteur": 5,  # Échecs consécutifs suspendant un hôte (0 : jamais)
+            "duree_disjoncteur": 60.0,  # Secondes
+            "taille_pool_connexions": 4,  # Connexions persistantes par hôte
+            "keep_alive": True,
+            "cache_http": False,  # Cache disque avec revalidation conditionnelle
+            "dossier_cache": "cache",
+            "hors_ligne": False,  # Analyse depuis le cache uniquement
+            "parametres_requete": "conserver",  # 'supprimer', 'conserver' ou 'liste_blanche'
+            "parametres_ignores": ["utm_*", "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "_ga"],
+            "parametres_conserves": [],  # Mode 'liste_blanche' (ex: "page", "id")
+            "taille_memo_url": 10000,
+            "detection_pieges": True,  # Calendriers, facettes, sessions dans les chemins
+            "action_pieges": "retrograder",  # 'retrograder' ou 'bloquer'
+            "seuil_motif_piege": 200,  # URLs d'un même motif avant suppression
+            "cardinalite_max_parametre": 50,
+            "longueur_max_url": 300,
+            "profondeur_max_chemin": 15,
+            "repetitions_max_segment": 3,
+            "echantillonnage_gabarits": False,  # N pages analysées par gabarit d'URL
+            "pages_par_gabarit": 3,
+            "arret_statistique": False,  # Ordre aléatoire, arrêt quand les estimations convergent
+            "graine_aleatoire": 0,
+            "priorite_cadres": False,  # Récupère d'abord les pages susceptibles de contenir des cadres
+            "mots_cles_cadres": ["video", "videos", "carte", "cartes", "plan", "formulaire", "formulaires",
+                                 "contact", "inscription", "map", "maps", "embed", "player", "lecteur",
+                                 "widget", "podcast", "agenda", "localisation", "acces"],
+            "tolerance_taux_2_1": 2.0,  # Demi-largeur maximale de l'intervalle (points)
+            "tolerance_sources": 0.05,  # Part maximale de sources de cadres non vues
+            "niveau_confiance": 0.95,
+            "pages_min_convergence": 50,
+            "cadres_min_convergence": 30,
+            "reprise_crawl": True,  # Journal SQLite permettant de reprendre un crawl interrompu
+            "audit_incremental": False,  # Reporte les résultats des pages inchangées depuis le dernier audit
+            "fichier_reprise": "audits/reprise.sqlite",
+            "audits_conserves": 10,  # Audits gardés par site dans le journal (0 : tous)
+            "intervalle_sauvegarde": 25,  # Pages entre deux points de sauvegarde
+            "intervalle_releve_partitions": 0.5,  # Crawl réparti : relève des URLs reçues (s)
+            "expiration_partition": 120,  # Crawl réparti : partition perdue sans signe de vie (s)
+            "taille_max_page_mo": 10,  # Téléchargement interrompu au-delà
+            "sonde_head": False,  # Requête HEAD avant les URLs d'extension inhabituelle
+            "utiliser_sitemap": False,  # Amorce la frontière avec les sitemaps du site
+            "max_urls_sitemap": 10000,
+            "max_fichiers_sitemap": 100
         },
 
         # Paramètres d'analyse
         "analyse": {
             "inclure_cadres_caches": False,
             "longueur_titre_minimum": 3,
-            "detecter_titres_generiques": True
+            "detecter_titres_generiques": True,
+            "taille_file_attente": 8,  # Pages récupérées en attente d'analyse
+            "memo_analyse": True,  # Réutilise l'analyse des contenus identiques
+            "fichier_memo": "",  # Base SQLite pour conserver le mémo entre exécutions
+            "entrees_memo": 1000,
+            "taille_memo_mo": 100,
+            "processus_analyse": 1,  # Processus d'analyse (1 : aucun pool, 0 : un par cœur)
+            "explorer_cadres": False,  # Analyse les documents chargés par les cadres de même origine
+            "profondeur_cadres": 2,  # Niveaux de documents de cadres récupérés
+            "workers_cadres": 4,  # Documents de cadres récupérés simultanément
+            "max_documents_cadres": 1000,  # Documents de cadres distincts récupérés par audit
+            "sonder_sources_cadres": False,  # Sonde les sources des cadres (statut, titre du contenu)
+            "workers_sonde": 8,  # Sources sondées simultanément
+            "max_sources_sondees": 2000,  # Sources distinctes sondées par audit
+            "seuil_similarite_titre": 0.2  # En deçà, titre de cadre sans rapport apparent avec le contenu
         },
 
         # Titres génériques à détecter (critère 2.2)
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Module d'arrêt statistique pour RGAA Section 2 Tester
+
+Suit, page après page, l'estimation du taux de conformité 2.1 et du nombre
+de sources de cadres distinctes, et signale le moment où ces estimations
+sont assez précises pour arrêter le crawl.
+"""
+
+import math
+from collections import Counter
+from statistics import NormalDist
+from typing import Any, Dict, Optional, Tuple
+
+from .analyzer import ResultatPage
+from .config import Config
+
+
+def creer_suivi_convergence(config: Config) -> Optional["SuiviConvergence"]:
+    """
+    Crée le suivi de convergence si l'arrêt statistique est activé.
+
+    Args:
+        config: Configuration de l'application.
+
+    Returns:
+        Un nouveau suivi, ou None si l'arrêt statistique est désactivé.
+    """
+    crawler_config = config.crawler_config
+    if not crawler_config.get('arret_statistique', False):
+        return None
+    return SuiviConvergence(
+        tolerance_taux=float(crawler_config.get('tolerance_taux_2_1', 2.0)),
+        tolerance_sources=float(crawler_config.get('tolerance_sources', 0.05)),
+        niveau_confiance=float(crawler_config.get('niveau_confiance', 0.95)),
+        pages_min=int(crawler_config.get('pages_min_convergence', 50)),
+        cadres_min=int(crawler_config.get('cadres_min_convergence', 30))
+    )
+
+
+class SuiviConvergence:
+    """
+    Intervalles de confiance courants sur les résultats d'un crawl.
+
+    - Taux 2.1 : estimateur par ratio (cadres conformes / cadres testés),
+      avec une variance calculée par page, les cadres d'une même page
+      n'étant pas indépendants.
+    - Sources de cadres : estimateur Chao2 du nombre de sources distinctes,
+      à partir des sources vues sur une seule page ou sur deux pages ;
+      intervalle log-normal.
+
+    Ces intervalles supposent des pages tirées au hasard : le mode d'arrêt
+    statistique parcourt la frontière dans un ordre aléatoire.
+    """
+
+    def __init__(self,
+                 tolerance_taux: float = 2.0,
+                 tolerance_sources: float = 0.05,
+                 niveau_confiance: float = 0.95,
+                 pages_min: int = 50,
+                 cadres_min: int = 30):
+        """
+        Initialise le suivi.
+
+        Args:
+            tolerance_taux: Demi-largeur maximale de l'intervalle du taux 2.1 (points).
+            tolerance_sources: Part maximale de sources estimées encore non vues.
+            niveau_confiance: Niveau de confiance des intervalles (ex: 0.95).
+            pages_min: Nombre minimum de pages analysées avant tout arrêt.
+            cadres_min: Nombre minimum de cadres testés avant tout arrêt.
+        """
+        self._tolerance_taux = tolerance_taux
+        self._tolerance_sources = tolerance_sources
+        self._niveau_confiance = niveau_confiance
+        self._z = NormalDist().inv_cdf(0.5 + niveau_confiance / 2)
+        self._pages_min = max(2, pages_min)
+        self._cadres_min = max(1, cadres_min)
+
+        # Sommes pour l'estimateur par ratio
+        self._pages = 0
+        self._testes = 0
+        self._conformes = 0
+        self._somme_t2 = 0.0
+        self._somme_ct = 0.0
+        self._somme_c2 = 0.0
+
+        # Nombre de pages sur lesquelles chaque source apparaît
+        self._incidences: Counter = Counter()
+
+        self.converge = False
+        self.raison = ""
+
+    def ajouter(self, page: ResultatPage) -> bool:
+        """
+        Prend en compte une page analysée.
+
+        Args:
+            page: Résultat d'analyse de la page.
+
+        Returns:
+            True si les estimations ont convergé (le crawl peut s'arrêter).
+        """
+        self._pages += 1
+        c, t = page.conformes_2_1, page.cadres_testes
+        self._conformes += c
+        self._testes += t
+        self._somme_t2 += t * t
+        self._somme_ct += c * t
+        self._somme_c2 += c * c
+
+        sources = {cadre.src.strip() for cadre in page.tous_cadres() if cadre.src and cadre.src.strip()}
+        self._incidences.update(sources)
+
+        if not self.converge and self._a_converge():
+            self.converge = True
+            demi_taux = self.demi_largeur_taux()
+            self.raison = (
+                f"Convergence après {self._pages} pages : taux 2.1 à ±{demi_taux:.1f} points, "
+                f"sources de cadres estimées à {self.sources_estimees():.0f} "
+                f"({self.sources_observees} observées)"
+            )
+        return self.converge
+
+    def _a_converge(self) -> bool:
+        """Indique si les deux estimations respectent les tolérances."""
+        if self._pages < self._pages_min or self._testes < self._cadres_min:
+            return False
+
+        if self.demi_largeur_taux() > self._tolerance_taux:
+            return False
+
+        estimees = self.sources_estimees()
+        return estimees == 0 or (estimees - self.sources_observees) / estimees <= self._tolerance_sources
+
+    @property
+    def taux_2_1(self) -> float:
+        """Taux de conformité 2.1 estimé (%)."""
+        return self._conformes / self._testes * 100 if self._testes else 100.0
+
+    def demi_largeur_taux(self) -> float:
+        """
+        Demi-largeur de l'intervalle de confiance du taux 2.1.
+
+        Returns:
+            Demi-largeur en points de pourcentage (infinie si non calculable).
+        """
+        n = self._pages
+        if n < 2 or self._testes == 0:
+            return math.inf
+
+        r = self._conformes / self._testes
+        moyenne_t = self._testes / n
+        # Somme des résidus (c_i - r * t_i)² développée
+        residus = self._somme_c2 - 2 * r * self._somme_ct + r * r * self._somme_t2
+        variance = max(residus, 0.0) / (n - 1) / (n * moyenne_t * moyenne_t)
+        return self._z * math.sqrt(variance) * 100
+
+    def intervalle_taux(self) -> Optional[Tuple[float, float]]:
+        """Intervalle de confiance du taux 2.1 (%), ou None s'il n'est pas calculable."""
+        demi = self.demi_largeur_taux()
+        if math.isinf(demi):
+            return None
+        return max(0.0, self.taux_2_1 - demi), min(100.0, self.taux_2_1 + demi)
+
+    @property
+    def sources_observees(self) -> int:
+        """Nombre de sources de cadres distinctes observées."""
+        return len(self._incidences)
+
+    def _frequences(self) -> Tuple[int, int]:
+        """Nombre de sources vues sur exactement une page, et sur exactement deux."""
+        q1 = sum(1 for n in self._incidences.values() if n == 1)
+        q2 = sum(1 for n in self._incidences.values() if n == 2)
+        return q1, q2
+
+    def sources_estimees(self) -> float:
+        """Nombre de sources distinctes estimé (Chao2 corrigé du biais)."""
+        m = self._pages
+        if m == 0:
+            return 0.0
+        q1, q2 = self._frequences()
+        return self.sources_observees + (m - 1) / m * q1 * (q1 - 1) / (2 * (q2 + 1))
+
+    def intervalle_sources(self) -> Tuple[float, float]:
+        """Intervalle de confiance log-normal du nombre de sources distinctes."""
+        observees = self.sources_observees
+        non_vues = self.sources_estimees() - observees
+        if non_vues <= 0:
+            return float(observees), float(observees)
+
+        m = self._pages
+        q1, q2 = self._frequences()
+        a = (m - 1) / m
+        variance = (
+            a * q1 * (q1 - 1) / (2 * (q2 + 1))
+            + a * a * q1 * (2 * q1 - 1) ** 2 / (4 * (q2 + 1) ** 2)
+            + a * a * q1 * q1 * q2 * (q1 - 1) ** 2 / (4 * (q2 + 1) ** 4)
+        )
+        k = math.exp(self._z * math.sqrt(math.log(1 + variance / (non_vues * non_vues))))
+        return observees + non_vues / k, observees + non_vues * k
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Résume l'état des estimations (pour le rapport)."""
+        return {
+            'niveau_confiance': self._niveau_confiance,
+            'pages': self._pages,
+            'cadres_testes': self._testes,
+            'taux_2_1': round(self.taux_2_1, 2),
+            'intervalle_2_1': self.intervalle_taux(),
+            'sources_observees': self.sources_observees,
+            'sources_estimees': round(self.sources_estimees(), 1),
+            'intervalle_sources': self.intervalle_sources(),
+            'converge': self.converge
+        }
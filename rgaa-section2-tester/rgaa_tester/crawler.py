@@ -5,26 +5,45 @@ Module de crawling pour RGAA Section 2 Tester
 Permet de parcourir un site web et de collecter les pages à analyser.
 """
 
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Callable, List, Optional, Set
-from urllib.parse import urljoin, urlparse
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Union
+from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
 
+from .cache import CacheHTTP
 from .config import get_config
-from .utils import normaliser_url, est_url_valide, est_meme_domaine
+from .document import DocumentHTML, detecter_encodage, parser_document
+from .echantillonnage import Echantillonneur
+from .frontiere import FrontiereCrawl
+from .liens import ExtracteurLiens
+from .pieges import BLOQUER, RETROGRADER, DetecteurPieges
+from .priorite import MOTS_CLES_CADRES, EstimateurCadres
+from .regulation import ECHEC, SATURATION, SUCCES, RegulateurHote, lire_retry_after
+from .repartition import Repartiteur
+from .reprise import JournalCrawl
+from .robots import GestionnaireRobots
+from .sitemap import LecteurSitemap
+from .transport import TransportHTTP
+from .utils import (analyser_url, configurer_normalisation_depuis,
+                    est_meme_domaine, est_url_valide, normaliser_url)
 
 
 @dataclass
 class PageCrawlee:
     """Informations sur une page crawlée."""
     url: str
-    html: str
+    html: Union[str, bytes]  # Corps brut de la réponse
     statut_http: int
     erreur: Optional[str] = None
     temps_reponse: float = 0.0
+    document: Optional[DocumentHTML] = None  # Page parsée une seule fois
+    attente_demandee: Optional[float] = None  # Retry-After d'une réponse 429 ou 503
+    url_demandee: str = ""  # URL demandée, si des redirections ont mené à `url`
+    alias: List[str] = field(default_factory=list)  # Autres URLs couvertes (demandée, canonique)
 
 
 @dataclass
@@ -35,6 +54,64 @@ class StatistiqueCrawl:
     pages_erreur: int = 0
     temps_total: float = 0.0
 
+    # Frontière de crawl
+    taille_frontiere: int = 0
+    taille_frontiere_max: int = 0
+    profondeur_max: int = 0
+    liens_doublons: int = 0
+    liens_filtres: int = 0
+
+    # Pages en double : redirections et URLs canoniques
+    doublons_redirection: int = 0  # Redirigées vers une page déjà visitée
+    doublons_canonique: int = 0  # URL canonique déjà visitée
+    requetes_evitees: int = 0  # URLs découvertes déjà couvertes par une redirection ou une URL canonique
+
+    # Cache HTTP
+    reponses_cache: int = 0
+    revalidations_304: int = 0
+
+    # robots.txt
+    urls_bloquees_robots: int = 0
+    delais_hotes: Dict[str, float] = field(default_factory=dict)  # Délai appliqué par hôte
+
+    # Régulation par hôte (requêtes simultanées, délai, latence, erreurs)
+    regulation_hotes: Dict[str, dict] = field(default_factory=dict)
+    reessais: int = 0
+    urls_disjoncteur: int = 0  # Refusées par le disjoncteur d'un hôte
+
+    # Téléchargements
+    octets_telecharges: int = 0  # Corps HTML conservés
+    octets_gaspilles: int = 0  # Lus puis abandonnés (taille maximale dépassée)
+    octets_evites: int = 0  # Annoncés (Content-Length) mais jamais lus
+    reponses_interrompues: int = 0  # Non-HTML ou trop volumineuses
+    sondes_head: int = 0
+
+    # Pièges de crawl
+    urls_pieges_bloquees: int = 0
+    urls_pieges_retrogradees: int = 0
+    motifs_pieges: List[dict] = field(default_factory=list)  # Motifs écartés
+
+    # Priorisation des pages à cadres (rendement comparé au parcours en largeur)
+    priorisation_cadres: Dict[str, Any] = field(default_factory=dict)
+
+    # Échantillonnage par gabarit
+    urls_hors_echantillon: int = 0
+    populations_gabarits: Dict[str, int] = field(default_factory=dict)  # URLs découvertes par gabarit
+
+    # Sitemaps
+    sitemaps_lus: int = 0
+    urls_sitemap: int = 0  # URLs ajoutées à la frontière depuis les sitemaps
+
+    # Crawl réparti
+    urls_transmises: int = 0  # Vers la partition propriétaire
+    urls_recues: int = 0  # Depuis les autres partitions
+    partitions_perdues: List[int] = field(default_factory=list)  # Sans signe de vie (numéros à partir de 1)
+    urls_abandonnees: int = 0  # Destinées à une partition perdue
+
+    # Fin du crawl
+    raison_arret: str = ""
+    arret_demande: bool = False  # Crawl interrompu par Crawler.arreter
+
 
 class Crawler:
     """
@@ -59,10 +136,111 @@ class Crawler:
         self._user_agent = crawler_config.get('user_agent', 'RGAA-Tester/1.0')
         self._delai = crawler_config.get('delai_entre_requetes', 1.0)
         self._suivre_externe = crawler_config.get('suivre_liens_externes', False)
+        self._nombre_workers = max(1, int(crawler_config.get('nombre_workers', 1)))
+        self._max_par_hote = max(1, int(crawler_config.get('max_requetes_par_hote', 4)))
+        self._respecter_canonique = crawler_config.get('respecter_canonique', True)
+
+        # Régulation adaptative par hôte, nouvelles tentatives et disjoncteur ;
+        # sans `delai_min` explicite, le délai ne descend pas sous celui configuré
+        delai_min = crawler_config.get('delai_min')
+        self._config_regulation = {
+            'en_vol_min': int(crawler_config.get('requetes_par_hote_min', 1)),
+            'delai_min': None if delai_min is None else float(delai_min),
+            'delai_max': float(crawler_config.get('delai_max', 10.0)),
+            'adaptatif': bool(crawler_config.get('regulation_adaptative', True)),
+            'seuil_latence': float(crawler_config.get('seuil_latence', 2.0)),
+            'seuil_disjoncteur': int(crawler_config.get('seuil_disjoncteur', 5)),
+            'duree_disjoncteur': float(crawler_config.get('duree_disjoncteur', 60.0))
+        }
+        self._tentatives_max = max(0, int(crawler_config.get('tentatives_max', 3)))
+        self._delai_tentative = float(crawler_config.get('delai_tentative', 1.0))
+        self._attente_max = float(crawler_config.get('attente_max', 60.0))
+
+        # Canonicalisation des URLs (règles de la chaîne de requête)
+        configurer_normalisation_depuis(crawler_config)
+
+        # Sessions HTTP persistantes par hôte (partagées entre les workers)
+        self._transport = TransportHTTP(
+            self._user_agent,
+            taille_pool=max(
+                int(crawler_config.get('taille_pool_connexions', 4)),
+                min(self._max_par_hote, self._nombre_workers)
+            ),
+            keep_alive=crawler_config.get('keep_alive', True)
+        )
+
+        # Cache HTTP sur disque (optionnel) ; hors ligne, seul le cache est lu.
+        # Un audit incrémental revalide les pages par requêtes conditionnelles
+        self._hors_ligne = crawler_config.get('hors_ligne', False)
+        self._cache: Optional[CacheHTTP] = None
+        if (crawler_config.get('cache_http', False) or self._hors_ligne
+                or crawler_config.get('audit_incremental', False)):
+            self._cache = CacheHTTP(crawler_config.get('dossier_cache', 'cache'))
+
+        # robots.txt (inutile hors ligne : aucune requête n'est émise)
+        self._robots: Optional[GestionnaireRobots] = None
+        if crawler_config.get('respecter_robots_txt', True) and not self._hors_ligne:
+            self._robots = GestionnaireRobots(
+                self._transport, self._user_agent, self._timeout, self._log
+            )
+
+        # Téléchargement en flux : en-têtes vérifiés avant la lecture du corps
+        self._taille_max_page = int(float(crawler_config.get('taille_max_page_mo', 10)) * 1024 * 1024)
+        self._sonde_head = crawler_config.get('sonde_head', False)
+        self._verrou_statistiques = threading.Lock()
+
+        # Détection des pièges de crawl (espaces d'URLs sans fin)
+        self._config_pieges = {
+            'seuil_motif': int(crawler_config.get('seuil_motif_piege', 200)),
+            'cardinalite_max': int(crawler_config.get('cardinalite_max_parametre', 50)),
+            'longueur_max': int(crawler_config.get('longueur_max_url', 300)),
+            'profondeur_max': int(crawler_config.get('profondeur_max_chemin', 15)),
+            'repetitions_max': int(crawler_config.get('repetitions_max_segment', 3)),
+            'action': crawler_config.get('action_pieges', RETROGRADER)
+        } if crawler_config.get('detection_pieges', True) else None
+        self._pieges: Optional[DetecteurPieges] = None
+
+        # Échantillonnage : N pages représentatives par gabarit d'URL
+        self._pages_par_gabarit = (
+            int(crawler_config.get('pages_par_gabarit', 3))
+            if crawler_config.get('echantillonnage_gabarits', False) else 0
+        )
+        self._echantillonneur: Optional[Echantillonneur] = None
+
+        # Amorçage de la frontière par les sitemaps (inutile hors ligne)
+        self._utiliser_sitemap = crawler_config.get('utiliser_sitemap', False) and not self._hors_ligne
+        self._max_urls_sitemap = int(crawler_config.get('max_urls_sitemap', 10000))
+        self._max_fichiers_sitemap = int(crawler_config.get('max_fichiers_sitemap', 100))
+
+        # Reprise : pages entre deux points de sauvegarde du journal
+        self._intervalle_sauvegarde = max(1, int(crawler_config.get('intervalle_sauvegarde', 25)))
+
+        # Crawl réparti : partition courante et fréquence de relève des URLs reçues
+        self._repartiteur: Optional[Repartiteur] = None
+        self._intervalle_releve = float(crawler_config.get('intervalle_releve_partitions', 0.5))
+        self._derniere_releve = 0.0
+
+        # Régulateurs par hôte (partagés entre les workers et conservés d'un crawl à l'autre)
+        self._regulateurs: Dict[str, RegulateurHote] = {}
+        self._verrou_regulateurs = threading.Lock()
+
+        # Arrêt statistique : la frontière est parcourue dans un ordre aléatoire
+        # pour que les pages analysées forment un échantillon du site ; sinon,
+        # les pages susceptibles de contenir des cadres peuvent passer en tête
+        aleatoire = bool(crawler_config.get('arret_statistique', False))
+        self._priorite_cadres = bool(crawler_config.get('priorite_cadres', False)) and not aleatoire
+        self._mots_cles_cadres = crawler_config.get('mots_cles_cadres', MOTS_CLES_CADRES)
+        self._estimateur: Optional[EstimateurCadres] = None
+        self._frontiere = FrontiereCrawl(
+            aleatoire=aleatoire,
+            graine=int(crawler_config.get('graine_aleatoire', 0)),
+            prioritaire=self._priorite_cadres
+        )
 
         # État du crawl
-        self._urls_visitees: Set[str] = set()
-        self._urls_a_visiter: List[str] = []
+        self._extracteur = ExtracteurLiens()
+        # URLs finales et canoniques marquées visitées sans avoir été demandées
+        self._alias: Set[str] = set()
         self._pages_collectees: List[PageCrawlee] = []
         self._statistiques = StatistiqueCrawl()
 
@@ -95,12 +273,16 @@ class Crawler:
         """Demande l'arrêt du crawl."""
         self._arreter = True
 
+    def fermer(self) -> None:
+        """Ferme les connexions HTTP persistantes."""
+        self._transport.fermer()
+
     def reinitialiser(self) -> None:
         """Réinitialise l'état du crawler."""
-        self._urls_visitees.clear()
-        self._urls_a_visiter.clear()
-        self._pages_collectees.clear()
+        self._frontiere.vider()
+        self._pages_collectees = []
         self._statistiques = StatistiqueCrawl()
+        self._alias = set()
         self._arreter = False
 
     def _log(self, message: str) -> None:
@@ -117,6 +299,9 @@ class Crawler:
         """
         Lance le crawl à partir d'une URL de départ.
 
+        Toutes les pages sont conservées en mémoire jusqu'à la fin du crawl ;
+        pour les sites volumineux, préférer `iterer_pages`.
+
         Args:
             url_depart: URL de départ du crawl.
             max_pages: Nombre maximum de pages à crawler (optionnel).
@@ -124,6 +309,42 @@ class Crawler:
         Returns:
             Liste des pages crawlées.
         """
+        pages = list(self.iterer_pages(url_depart, max_pages))
+        self._pages_collectees = pages
+        return pages
+
+    def iterer_pages(self,
+                     url_depart: str,
+                     max_pages: Optional[int] = None,
+                     journal: Optional[JournalCrawl] = None,
+                     repartiteur: Optional[Repartiteur] = None) -> Iterator[PageCrawlee]:
+        """
+        Parcourt le site et produit les pages au fur et à mesure de leur récupération.
+
+        Le crawler ne conserve aucune page : chacune peut être analysée puis
+        libérée par l'appelant avant que la suivante soit produite.
+
+        Avec un journal, l'état de la frontière y est sauvegardé toutes les
+        `intervalle_sauvegarde` pages et à la fin du crawl ; si le journal
+        décrit un audit interrompu, le crawl reprend depuis son état (les
+        pages déjà analysées comptent dans la limite et ne sont pas
+        récupérées à nouveau).
+
+        Avec un répartiteur, le crawler ne parcourt que sa partition : les
+        URLs des autres partitions leur sont transmises, celles qu'elles lui
+        transmettent sont relevées régulièrement, et la limite de pages est
+        commune. Le crawl ne se termine que lorsque toutes les partitions
+        ont épuisé leur frontière.
+
+        Args:
+            url_depart: URL de départ du crawl.
+            max_pages: Nombre maximum de pages à crawler (optionnel).
+            journal: Journal de reprise de l'audit (optionnel).
+            repartiteur: Partition d'un crawl réparti (optionnel).
+
+        Returns:
+            Itérateur sur les pages crawlées, dans l'ordre du parcours.
+        """
         self.reinitialiser()
         debut = time.time()
 
@@ -134,53 +355,181 @@ class Crawler:
         url_depart = normaliser_url(url_depart)
         if not est_url_valide(url_depart):
             self._log(f"Erreur : URL invalide : {url_depart}")
-            return []
-
-        self._urls_a_visiter.append(url_depart)
-        self._domaine_principal = urlparse(url_depart).netloc
+            return
+
+        if self._robots and not self._robots.autorise(url_depart):
+            self._statistiques.urls_bloquees_robots += 1
+            self._log(f"URL interdite par robots.txt : {url_depart}")
+            return
+
+        reprise = journal is not None and journal.reprise
+        self._repartiteur = repartiteur
+        # En crawl réparti, seule la partition propriétaire amorce le crawl
+        amorce = repartiteur is None or repartiteur.est_locale(url_depart)
+        if journal is not None:
+            self._frontiere.journaliser()
+        self._estimateur = None
+        if self._priorite_cadres:
+            self._estimateur = EstimateurCadres(self._max_pages, self._mots_cles_cadres)
+            self._frontiere.definir_evaluateur(self._estimateur.reevaluer)
+            self._log("Priorisation des pages susceptibles de contenir des cadres")
+        if reprise:
+            self._frontiere.restaurer(journal.etat_frontiere())
+        elif amorce:
+            self._frontiere.ajouter(url_depart, 0, priorite=self._priorite(url_depart))
+        self._domaine_principal = analyser_url(url_depart).hote
+        self._extracteur = ExtracteurLiens(
+            None if self._suivre_externe else self._domaine_principal
+        )
+        self._pieges = self._creer_detecteur_pieges()
+        self._echantillonneur = None
+        if self._pages_par_gabarit:
+            self._echantillonneur = Echantillonneur(self._pages_par_gabarit)
+            self._echantillonneur.retenir(analyser_url(url_depart))
+            self._log(f"Échantillonnage : {self._pages_par_gabarit} page(s) par gabarit d'URL")
+
+        if self._utiliser_sitemap and not reprise and amorce:
+            self._amorcer_depuis_sitemaps(url_depart)
 
         self._log(f"Démarrage du crawl sur : {url_depart}")
         self._log(f"Maximum de pages : {self._max_pages}")
+        if self._nombre_workers > 1:
+            self._log(
+                f"Récupération concurrente : {self._nombre_workers} workers, "
+                f"{self._max_par_hote} requête(s) simultanée(s) par hôte"
+            )
 
-        while self._urls_a_visiter and not self._arreter:
-            if len(self._pages_collectees) >= self._max_pages:
-                self._log(f"Limite de {self._max_pages} pages atteinte.")
-                break
-
-            url = self._urls_a_visiter.pop(0)
-            url_normalisee = normaliser_url(url)
-
-            if url_normalisee in self._urls_visitees:
-                continue
-
-            self._urls_visitees.add(url_normalisee)
-            self._progression(
-                len(self._pages_collectees),
-                min(len(self._urls_a_visiter) + len(self._pages_collectees) + 1, self._max_pages),
-                f"Analyse de : {url_normalisee[:50]}..."
+        # Les pages sont récupérées par anticipation dans l'ordre de la file,
+        # mais traitées (liens extraits, pages produites) strictement dans cet
+        # ordre : le résultat est identique quel que soit le nombre de workers.
+        executeur = ThreadPoolExecutor(
+            max_workers=self._nombre_workers,
+            thread_name_prefix="rgaa-crawl"
+        )
+        en_vol: Dict[str, Future] = {}
+        pages_produites = 0
+        if reprise:
+            pages_produites = journal.pages_enregistrees
+            self._log(
+                f"Reprise de l'audit {journal.id_audit} : {pages_produites} page(s) déjà analysée(s), "
+                f"{len(self._frontiere)} URL(s) en attente"
             )
+        elif journal is not None:
+            self._log(f"Audit {journal.id_audit} (reprise possible avec --resume {journal.id_audit})")
+        if repartiteur is not None:
+            self._log(f"Partition {repartiteur.numero + 1}/{repartiteur.nombre} du crawl réparti")
+        # Remplacée ci-dessous si le crawl ne s'arrête pas à la demande de l'appelant
+        raison_arret = "Arrêt demandé"
 
-            page = self._recuperer_page(url_normalisee)
-            if page:
-                self._pages_collectees.append(page)
-                self._statistiques.pages_crawlees += 1
+        try:
+            while not self._arreter and self._frontiere_disponible():
+                if pages_produites >= self._max_pages:
+                    self._log(f"Limite de {self._max_pages} pages atteinte.")
+                    raison_arret = f"Limite de {self._max_pages} pages atteinte"
+                    break
+
+                self._anticiper(executeur, en_vol)
+
+                url_normalisee, profondeur = self._frontiere.extraire()
+                if self._frontiere.est_visitee(url_normalisee):
+                    # Déjà couverte par la redirection ou l'URL canonique d'une page
+                    future = en_vol.pop(url_normalisee, None)
+                    if url_normalisee in self._alias and (future is None or future.cancel()):
+                        self._alias.discard(url_normalisee)
+                        self._statistiques.requetes_evitees += 1
+                    continue
 
-                # Extraire les liens de la page
-                if page.html:
-                    self._extraire_liens(page.html, url_normalisee)
+                self._frontiere.marquer_visitee(url_normalisee, profondeur)
+                self._progression(
+                    pages_produites,
+                    min(len(self._frontiere) + pages_produites + 1, self._max_pages),
+                    f"Analyse de : {url_normalisee[:50]}..."
+                )
+
+                future = en_vol.pop(url_normalisee, None)
+                if future is None:
+                    future = executeur.submit(self._recuperer_page_limitee, url_normalisee)
+                page = future.result()
+
+                if page:
+                    if url_normalisee == url_depart:
+                        self._suivre_redirection_depart(page)
+                    if self._est_doublon(page, url_normalisee, profondeur):
+                        continue
+                    if repartiteur is not None and not repartiteur.reserver_page():
+                        self._log(f"Limite de {self._max_pages} pages atteinte (toutes partitions).")
+                        raison_arret = f"Limite de {self._max_pages} pages atteinte"
+                        break
+                    pages_produites += 1
+                    self._statistiques.pages_crawlees += 1
+
+                    # Extraire les liens de la page (priorités mises à jour au préalable)
+                    if page.document:
+                        if self._estimateur:
+                            self._estimateur.observer(page.url, len(page.document.cadres))
+                        self._extraire_liens(page.document, profondeur + 1)
+
+                    yield page
+
+                    if journal is not None and pages_produites % self._intervalle_sauvegarde == 0:
+                        journal.sauvegarder(self._frontiere.modifications())
+                else:
+                    self._statistiques.pages_erreur += 1
             else:
-                self._statistiques.pages_erreur += 1
-
-            # Respecter le délai entre les requêtes
-            if self._delai > 0 and self._urls_a_visiter:
-                time.sleep(self._delai)
-
-        self._statistiques.temps_total = time.time() - debut
-        self._statistiques.pages_trouvees = len(self._urls_visitees)
-
-        self._log(f"Crawl terminé. {len(self._pages_collectees)} pages analysées en {self._statistiques.temps_total:.1f}s")
-
-        return self._pages_collectees
+                if not self._frontiere:
+                    raison_arret = "Frontière épuisée (toutes les pages découvertes ont été visitées)"
+        finally:
+            self._statistiques.raison_arret = raison_arret
+            self._statistiques.arret_demande = self._arreter
+            if repartiteur is not None:
+                repartiteur.terminer()
+                self._statistiques.urls_transmises = repartiteur.urls_transmises
+                self._statistiques.urls_recues = repartiteur.urls_recues
+                self._statistiques.partitions_perdues = sorted(n + 1 for n in repartiteur.partitions_perdues)
+                self._statistiques.urls_abandonnees = repartiteur.urls_abandonnees
+                self._repartiteur = None
+            if journal is not None:
+                journal.sauvegarder(self._frontiere.modifications())
+            for future in en_vol.values():
+                future.cancel()
+            executeur.shutdown(wait=False)
+
+            self._statistiques.temps_total = time.time() - debut
+            self._statistiques.pages_trouvees = len(self._frontiere.visitees)
+            self._statistiques.taille_frontiere = len(self._frontiere)
+            self._statistiques.taille_frontiere_max = self._frontiere.taille_max
+            self._statistiques.profondeur_max = self._frontiere.profondeur_max
+            self._statistiques.liens_doublons += self._frontiere.doublons_ecartes + self._extracteur.doublons
+            self._statistiques.liens_filtres += self._extracteur.filtres
+            if self._echantillonneur:
+                self._statistiques.populations_gabarits = self._echantillonneur.populations
+            if self._estimateur:
+                self._statistiques.priorisation_cadres = self._estimateur.comparaison()
+            if self._pieges:
+                self._statistiques.motifs_pieges = [
+                    motif.vers_dict() for motif in self._pieges.motifs_supprimes
+                ]
+            with self._verrou_regulateurs:
+                regulateurs = dict(self._regulateurs)
+            self._statistiques.delais_hotes = {hote: r.delai for hote, r in regulateurs.items()}
+            self._statistiques.regulation_hotes = {hote: r.vers_dict() for hote, r in regulateurs.items()}
+            if self._cache:
+                self._statistiques.reponses_cache = self._cache.lectures
+                self._statistiques.revalidations_304 = self._cache.revalidations
+
+            self._log(f"Crawl terminé. {pages_produites} pages analysées en {self._statistiques.temps_total:.1f}s")
+            for hote, regulation in self._statistiques.regulation_hotes.items():
+                self._log(
+                    f"Régulation de {hote} : {regulation['requetes_simultanees']} requête(s) simultanée(s), "
+                    f"délai {regulation['delai']:.2f}s, latence moyenne {regulation['latence_moyenne']:.2f}s "
+                    f"({regulation['saturations']} saturation(s), {regulation['echecs']} échec(s))"
+                )
+            if self._statistiques.reponses_interrompues:
+                self._log(
+                    f"Téléchargements interrompus : {self._statistiques.reponses_interrompues} "
+                    f"({self._statistiques.octets_evites} octets évités, "
+                    f"{self._statistiques.octets_gaspilles} octets lus inutilement)"
+                )
 
     def crawl_page_unique(self, url: str) -> Optional[PageCrawlee]:
         """
@@ -200,6 +549,186 @@ class Crawler:
         self._log(f"Récupération de la page : {url}")
         return self._recuperer_page(url)
 
+    def recuperer_cible(self, url: str) -> Optional[PageCrawlee]:
+        """
+        Récupère le document chargé par un cadre, hors frontière de crawl.
+
+        La récupération passe par le cache HTTP, le robots.txt et le
+        régulateur de l'hôte, comme celle des pages du crawl ; elle peut
+        être appelée depuis plusieurs threads.
+
+        Args:
+            url: URL normalisée du document.
+
+        Returns:
+            PageCrawlee (éventuellement en erreur), ou None si l'URL est
+            interdite par le robots.txt ou si le contenu n'est pas HTML.
+        """
+        if self._robots and not self._robots.autorise(url):
+            self._compter(urls_bloquees_robots=1)
+            return None
+        return self._recuperer_page_limitee(url)
+
+    def sonder_cible(self, url: str) -> Optional[PageCrawlee]:
+        """
+        Sonde la source d'un cadre, quelle que soit son origine (critère 2.2).
+
+        Contrairement à `recuperer_cible`, une réponse non-HTML ou en erreur
+        est retournée avec son statut et son URL finale ; seul le corps des
+        pages HTML est lu. Le cache HTTP n'est pas consulté ; le robots.txt
+        et le régulateur de l'hôte s'appliquent.
+
+        Args:
+            url: URL normalisée de la source.
+
+        Returns:
+            PageCrawlee (document parsé pour une page HTML), ou None hors
+            ligne, si le robots.txt l'interdit ou si l'hôte est suspendu.
+        """
+        if self._hors_ligne:
+            return None
+        if self._robots and not self._robots.autorise(url):
+            self._compter(urls_bloquees_robots=1)
+            return None
+        return self._recuperer_page_limitee(url, self._sonder_page)
+
+    def _anticiper(self, executeur: ThreadPoolExecutor, en_vol: Dict[str, Future]) -> None:
+        """
+        Lance par anticipation la récupération des prochaines URLs de la file.
+
+        Au plus `nombre_workers` récupérations sont en cours : chaque
+        récupération anticipée garde son document en mémoire jusqu'à ce que
+        son URL sorte de la file.
+
+        Args:
+            executeur: Pool de workers.
+            en_vol: Récupérations en cours, indexées par URL.
+        """
+        if self._nombre_workers <= 1 or len(en_vol) >= self._nombre_workers:
+            return
+
+        for url in self._frontiere.apercu(self._nombre_workers):
+            if len(en_vol) >= self._nombre_workers:
+                break
+            if url not in en_vol:
+                en_vol[url] = executeur.submit(self._recuperer_page_limitee, url)
+
+    def _regulateur(self, url: str) -> RegulateurHote:
+        """
+        Retourne le régulateur associé à l'hôte d'une URL.
+
+        Le Crawl-delay du robots.txt remplace `delai_entre_requetes` pour
+        l'hôte et devient l'intervalle minimal entre deux de ses requêtes :
+        il est réparti sur les créneaux simultanés de sorte que l'hôte ne
+        reçoive pas plus d'une requête par Crawl-delay en moyenne.
+
+        Args:
+            url: URL à récupérer.
+
+        Returns:
+            Régulateur de l'hôte.
+        """
+        hote = analyser_url(url).hote
+        with self._verrou_regulateurs:
+            regulateur = self._regulateurs.get(hote)
+            if regulateur is not None:
+                return regulateur
+
+        # Lecture du robots.txt hors verrou (peut nécessiter une requête)
+        en_vol = min(self._max_par_hote, self._nombre_workers)
+        delai = self._delai
+        delai_robots = self._robots.delai_crawl(url) if self._robots else None
+        if delai_robots is not None:
+            delai = delai_robots * en_vol
+
+        with self._verrou_regulateurs:
+            regulateur = self._regulateurs.get(hote)
+            if regulateur is None:
+                regulateur = RegulateurHote(
+                    en_vol_max=en_vol,
+                    delai=delai,
+                    intervalle_min=delai_robots or 0.0,
+                    **self._config_regulation
+                )
+                self._regulateurs[hote] = regulateur
+                if delai_robots is not None:
+                    self._log(f"Crawl-delay de {delai_robots}s appliqué à {hote}")
+            return regulateur
+
+    def _recuperer_page_limitee(self, url: str,
+                                recuperer: Optional[Callable[[str], Optional[PageCrawlee]]] = None
+                                ) -> Optional[PageCrawlee]:
+        """
+        Récupère une page sous le contrôle du régulateur de son hôte.
+
+        Les réponses 429, 502, 503 et 504, les timeouts et les erreurs de
+        connexion sont retentés jusqu'à `tentatives_max` fois, avec une
+        attente doublée à chaque tentative (un Retry-After suspend en outre
+        l'hôte). Quand le disjoncteur de l'hôte est ouvert, la page n'est
+        pas demandée.
+
+        Args:
+            url: URL à récupérer.
+            recuperer: Fonction de récupération (défaut : `_recuperer_page`).
+
+        Returns:
+            PageCrawlee (éventuellement en erreur) ou None.
+        """
+        recuperer = recuperer or self._recuperer_page
+        if self._hors_ligne:
+            return recuperer(url)
+
+        regulateur = self._regulateur(url)
+        page = None
+        for tentative in range(self._tentatives_max + 1):
+            if not regulateur.acquerir():
+                self._compter(urls_disjoncteur=1)
+                self._log(f"Ignoré (hôte suspendu après des échecs répétés) : {url}")
+                return None
+
+            issue, latence, retry_after = ECHEC, None, None
+            try:
+                page = recuperer(url)
+                issue = self._issue(page)
+                if issue == SUCCES and page is not None:
+                    latence = page.temps_reponse
+                elif issue == SATURATION and page.attente_demandee is not None:
+                    retry_after = min(page.attente_demandee, self._attente_max)
+            finally:
+                regulateur.liberer(issue, latence, retry_after)
+
+            if issue == SUCCES or tentative == self._tentatives_max or self._arreter:
+                break
+
+            attente = min(self._attente_max, self._delai_tentative * 2 ** tentative)
+            self._compter(reessais=1)
+            self._log(f"Nouvelle tentative dans {attente:.1f}s ({page.erreur}) : {url}")
+            time.sleep(attente)
+
+        return page
+
+    # Réponses retentées : l'hôte demande de ralentir, ou une passerelle a échoué
+    STATUTS_SATURATION = (429, 503)
+    STATUTS_ECHEC = (502, 504)
+
+    def _issue(self, page: Optional[PageCrawlee]) -> str:
+        """
+        Qualifie le résultat d'une récupération pour la régulation.
+
+        Args:
+            page: Page récupérée (None : réponse ignorée, non-HTML par exemple).
+
+        Returns:
+            SUCCES, SATURATION ou ECHEC.
+        """
+        if page is None:
+            return SUCCES
+        if page.statut_http in self.STATUTS_SATURATION:
+            return SATURATION
+        if page.statut_http in self.STATUTS_ECHEC or (page.statut_http == 0 and page.erreur):
+            return ECHEC
+        return SUCCES
+
     def _recuperer_page(self, url: str) -> Optional[PageCrawlee]:
         """
         Récupère le contenu HTML d'une URL.
@@ -210,35 +739,48 @@ class Crawler:
         Returns:
             PageCrawlee ou None en cas d'erreur.
         """
-        headers = {
-            'User-Agent': self._user_agent,
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
-        }
-
         try:
             debut = time.time()
-            response = requests.get(
-                url,
-                headers=headers,
-                timeout=self._timeout,
-                allow_redirects=True
-            )
+            response = self._requeter(url)
             temps_reponse = time.time() - debut
 
-            # Vérifier le type de contenu
+            if response is None:
+                return None
+
+            if response.status_code in self.STATUTS_SATURATION + self.STATUTS_ECHEC:
+                return PageCrawlee(
+                    url=url,
+                    html="",
+                    statut_http=response.status_code,
+                    erreur=f"HTTP {response.status_code}",
+                    temps_reponse=temps_reponse,
+                    attente_demandee=lire_retry_after(response.headers.get('Retry-After'))
+                )
+
+            # Vérifier le type de contenu (réponses servies par le cache)
             content_type = response.headers.get('Content-Type', '')
-            if 'text/html' not in content_type and 'application/xhtml' not in content_type:
+            if not self._est_html(content_type):
                 self._log(f"Ignoré (non-HTML) : {url}")
                 return None
 
-            response.encoding = response.apparent_encoding or 'utf-8'
+            if self._cache and not self._hors_ligne and response.status_code == 200:
+                self._cache.ecrire(url, response)
+
+            # Les octets sont transmis tels quels à lxml, sans copie décodée
+            contenu = response.content
+            encodage = detecter_encodage(contenu, content_type)
 
+            # Après redirections, la page et ses liens relèvent de l'URL finale
+            url_finale = normaliser_url(response.url) if response.url else url
+
+            # Parser dans le worker : le document sert au crawler et à l'analyseur
             return PageCrawlee(
-                url=url,
-                html=response.text,
+                url=url_finale,
+                html=contenu,
                 statut_http=response.status_code,
-                temps_reponse=temps_reponse
+                temps_reponse=temps_reponse,
+                document=parser_document(contenu, url_finale, encodage=encodage),
+                url_demandee=url if url_finale != url else ""
             )
 
         except requests.Timeout:
@@ -253,52 +795,452 @@ class Crawler:
             self._log(f"Erreur inattendue : {url} - {str(e)}")
             return PageCrawlee(url=url, html="", statut_http=0, erreur=str(e))
 
-    def _extraire_liens(self, html: str, url_base: str) -> None:
+    def _sonder_page(self, url: str) -> PageCrawlee:
         """
-        Extrait les liens d'une page HTML.
+        Demande la source d'un cadre et lit le corps s'il s'agit d'une page HTML.
 
         Args:
-            html: Contenu HTML de la page.
-            url_base: URL de base pour résoudre les liens relatifs.
+            url: URL à sonder.
+
+        Returns:
+            PageCrawlee avec le statut et l'URL finale (document parsé pour
+            une page HTML).
         """
         try:
-            soup = BeautifulSoup(html, 'lxml')
+            debut = time.time()
+            response = self._transport.get(url, timeout=self._timeout, allow_redirects=True, stream=True)
+            temps_reponse = time.time() - debut
+            url_finale = normaliser_url(response.url) if response.url else url
+            page = PageCrawlee(
+                url=url_finale,
+                html=b"",
+                statut_http=response.status_code,
+                erreur=f"HTTP {response.status_code}" if response.status_code >= 400 else None,
+                temps_reponse=temps_reponse,
+                attente_demandee=lire_retry_after(response.headers.get('Retry-After')),
+                url_demandee=url if url_finale != url else ""
+            )
 
-            for lien in soup.find_all('a', href=True):
-                href = lien['href']
+            content_type = response.headers.get('Content-Type', '')
+            if response.status_code < 400 and self._est_html(content_type):
+                if self._telecharger(url, response):
+                    page.html = response.content
+                    page.document = parser_document(
+                        page.html, url_finale, encodage=detecter_encodage(page.html, content_type)
+                    )
+            else:
+                response.close()
+            return page
 
-                # Ignorer les liens non-HTTP
-                if href.startswith(('#', 'javascript:', 'mailto:', 'tel:')):
-                    continue
+        except requests.Timeout:
+            return PageCrawlee(url=url, html="", statut_http=0, erreur="Timeout")
 
-                # Construire l'URL absolue
-                url_absolue = urljoin(url_base, href)
-                url_normalisee = normaliser_url(url_absolue)
+        except requests.RequestException as e:
+            return PageCrawlee(url=url, html="", statut_http=0, erreur=str(e))
 
-                # Vérifier la validité
-                if not est_url_valide(url_normalisee):
-                    continue
+        except Exception as e:
+            # Corps illisible (décodage, parsing) : source comptée en erreur
+            self._log(f"Erreur inattendue : {url} - {str(e)}")
+            return PageCrawlee(url=url, html="", statut_http=0, erreur=str(e))
 
-                # Vérifier si c'est le même domaine
-                if not self._suivre_externe:
-                    if urlparse(url_normalisee).netloc != self._domaine_principal:
-                        continue
+    def _requeter(self, url: str) -> Optional[requests.Response]:
+        """
+        Obtient la réponse HTTP d'une URL, en passant par le cache s'il est actif.
 
-                # Ignorer les fichiers non-HTML
-                extensions_ignorees = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg',
-                                       '.css', '.js', '.ico', '.xml', '.json', '.zip',
-                                       '.doc', '.docx', '.xls', '.xlsx', '.mp3', '.mp4')
-                if any(url_normalisee.lower().endswith(ext) for ext in extensions_ignorees):
-                    continue
+        Une entrée en cache est revalidée par requête conditionnelle ; si le
+        serveur répond 304, le corps conservé est réutilisé. Hors ligne,
+        seul le cache est consulté.
+
+        Args:
+            url: URL normalisée.
 
-                # Ajouter si pas encore visité
-                if url_normalisee not in self._urls_visitees:
-                    if url_normalisee not in self._urls_a_visiter:
-                        self._urls_a_visiter.append(url_normalisee)
+        Returns:
+            Réponse HTTP, ou None si hors ligne et absente du cache.
+        """
+        entree = self._cache.lire(url) if self._cache else None
+
+        if self._hors_ligne:
+            if entree is None:
+                self._log(f"Absente du cache : {url}")
+                return None
+            self._cache.noter_lecture()
+            return entree.en_reponse()
+
+        if self._sonde_head and entree is None and self._extension_ambigue(url):
+            if not self._sonder(url):
+                return None
+
+        en_tetes = entree.en_tetes_conditionnels() if entree else None
+        response = self._transport.get(
+            url,
+            headers=en_tetes,
+            timeout=self._timeout,
+            allow_redirects=True,
+            stream=True
+        )
+
+        if response.status_code == 304 and entree is not None:
+            response.close()
+            self._cache.rafraichir(url, entree, response)
+            self._cache.noter_lecture(revalidation=True)
+            return entree.en_reponse()
+
+        # Réponse à retenter : le corps n'est pas lu
+        if response.status_code in self.STATUTS_SATURATION + self.STATUTS_ECHEC:
+            response.close()
+            return response
+
+        if not self._telecharger(url, response):
+            return None
+        return response
+
+    # Extensions usuelles des pages HTML (les autres sont ambiguës)
+    EXTENSIONS_HTML = ('.html', '.htm', '.xhtml', '.shtml', '.php', '.asp',
+                       '.aspx', '.jsp', '.cfm')
+
+    @staticmethod
+    def _est_html(content_type: str) -> bool:
+        """Indique si un Content-Type désigne une page HTML."""
+        return 'text/html' in content_type or 'application/xhtml' in content_type
+
+    def _compter(self, **increments: int) -> None:
+        """Incrémente des compteurs de téléchargement (appelé depuis les workers)."""
+        with self._verrou_statistiques:
+            for nom, valeur in increments.items():
+                setattr(self._statistiques, nom, getattr(self._statistiques, nom) + valeur)
+
+    def _extension_ambigue(self, url: str) -> bool:
+        """
+        Indique si l'extension d'une URL ne permet pas de savoir si c'est une page HTML.
+
+        Args:
+            url: URL normalisée.
+
+        Returns:
+            True si le dernier segment du chemin porte une extension inhabituelle.
+        """
+        segment = analyser_url(url).chemin.rsplit('/', 1)[-1].lower()
+        if '.' not in segment:
+            return False
+        return not segment.endswith(self.EXTENSIONS_HTML)
+
+    def _sonder(self, url: str) -> bool:
+        """
+        Sonde une URL par une requête HEAD avant de la télécharger.
+
+        Args:
+            url: URL normalisée.
+
+        Returns:
+            False si le serveur annonce un contenu non-HTML, True sinon
+            (y compris si la sonde échoue : la requête GET tranchera).
+        """
+        self._compter(sondes_head=1)
+        try:
+            sonde = self._transport.head(url, timeout=self._timeout, allow_redirects=True)
+        except requests.RequestException:
+            return True
+
+        content_type = sonde.headers.get('Content-Type', '')
+        if sonde.status_code < 400 and content_type and not self._est_html(content_type):
+            self._compter(
+                reponses_interrompues=1,
+                octets_evites=int(sonde.headers.get('Content-Length') or 0)
+            )
+            self._log(f"Ignoré (non-HTML, sonde HEAD) : {url}")
+            return False
+        return True
+
+    def _telecharger(self, url: str, response: requests.Response) -> bool:
+        """
+        Lit le corps d'une réponse en flux, après vérification des en-têtes.
+
+        Les contenus non-HTML sont abandonnés sans lecture du corps ; la
+        lecture est interrompue dès que `taille_max_page_mo` est dépassée.
+
+        Args:
+            url: URL normalisée.
+            response: Réponse obtenue avec stream=True.
+
+        Returns:
+            True si le corps a été lu (disponible dans response.content).
+        """
+        try:
+            taille_annoncee = int(response.headers.get('Content-Length') or 0)
+        except ValueError:
+            taille_annoncee = 0
+
+        if not self._est_html(response.headers.get('Content-Type', '')):
+            response.close()
+            self._compter(reponses_interrompues=1, octets_evites=taille_annoncee)
+            self._log(f"Ignoré (non-HTML) : {url}")
+            return False
+
+        if taille_annoncee > self._taille_max_page:
+            response.close()
+            self._compter(reponses_interrompues=1, octets_evites=taille_annoncee)
+            self._log(f"Ignoré (trop volumineux : {taille_annoncee} octets) : {url}")
+            return False
+
+        morceaux = []
+        taille = 0
+        try:
+            for morceau in response.iter_content(chunk_size=64 * 1024):
+                morceaux.append(morceau)
+                taille += len(morceau)
+                if taille > self._taille_max_page:
+                    self._compter(reponses_interrompues=1, octets_gaspilles=taille)
+                    self._log(f"Ignoré (plus de {self._taille_max_page} octets) : {url}")
+                    return False
+        finally:
+            response.close()
+
+        response._content = b''.join(morceaux)
+        self._compter(octets_telecharges=taille)
+        return True
+
+    def _extraire_liens(self, document: DocumentHTML, profondeur: int = 0) -> None:
+        """
+        Ajoute à la frontière les liens d'une page parsée.
+
+        Args:
+            document: Document parsé de la page.
+            profondeur: Profondeur des liens extraits.
+        """
+        try:
+            cadres = len(document.cadres)
+            for url_normalisee in self._extracteur.extraire(document):
+                self._ajouter(url_normalisee, profondeur, cadres)
 
         except Exception as e:
             self._log(f"Erreur lors de l'extraction des liens : {str(e)}")
 
+    def _admettre(self, url_normalisee: str, profondeur: int) -> bool:
+        """
+        Ajoute une URL normalisée à la frontière si elle passe les filtres du crawl
+        (schéma, domaine, extension, robots.txt).
+
+        Args:
+            url_normalisee: URL absolue normalisée.
+            profondeur: Profondeur de l'URL.
+
+        Returns:
+            True si l'URL a été ajoutée à la frontière.
+        """
+        if not self._extracteur.accepter(url_normalisee):
+            self._statistiques.liens_filtres += 1
+            return False
+
+        return self._ajouter(url_normalisee, profondeur)
+
+    def _frontiere_disponible(self) -> bool:
+        """
+        Indique s'il reste des URLs à visiter.
+
+        En crawl réparti, relève régulièrement les URLs transmises par les
+        autres partitions ; une frontière vide n'est définitive que lorsque
+        toutes les partitions ont terminé.
+
+        Returns:
+            True si la frontière contient au moins une URL.
+        """
+        repartiteur = self._repartiteur
+        if repartiteur is None:
+            return bool(self._frontiere)
+
+        while True:
+            if not self._frontiere or time.monotonic() - self._derniere_releve >= self._intervalle_releve:
+                self._derniere_releve = time.monotonic()
+                for url, profondeur in repartiteur.recevoir():
+                    self._ajouter(url, profondeur)
+            if self._frontiere:
+                return True
+            perdues = set(repartiteur.partitions_perdues)
+            fin = self._arreter or repartiteur.verifier_fin()
+            for numero in sorted(repartiteur.partitions_perdues - perdues):
+                logger.warning(f"Partition {numero + 1}/{repartiteur.nombre} sans signe de vie, "
+                               f"ses URLs en attente sont abandonnées")
+            if fin:
+                return False
+            time.sleep(self._intervalle_releve)
+
+    def _ajouter(self, url_normalisee: str, profondeur: int, cadres_parent: int = 0) -> bool:
+        """
+        Ajoute à la frontière une URL déjà filtrée, si elle est nouvelle et autorisée.
+
+        Args:
+            url_normalisee: URL absolue normalisée.
+            profondeur: Profondeur de l'URL.
+            cadres_parent: Nombre de cadres de la page où le lien a été trouvé.
+
+        Returns:
+            True si l'URL a été ajoutée à la frontière.
+        """
+        # Déjà en attente ou visitée
+        if self._frontiere.est_connue(url_normalisee):
+            self._statistiques.liens_doublons += 1
+            if url_normalisee in self._alias:
+                # Visitée sous une autre URL : une récupération évitée
+                self._alias.discard(url_normalisee)
+                self._statistiques.requetes_evitees += 1
+            return False
+
+        # Crawl réparti : l'URL est confiée à sa partition propriétaire
+        if self._repartiteur is not None and not self._repartiteur.est_locale(url_normalisee):
+            self._frontiere.marquer_connue(url_normalisee)
+            self._repartiteur.transmettre(url_normalisee, profondeur)
+            return False
+
+        # Respecter robots.txt avant l'entrée dans la frontière
+        if self._robots and not self._robots.autorise(url_normalisee):
+            self._statistiques.urls_bloquees_robots += 1
+            return False
+
+        # Écarter les pièges de crawl présumés
+        verdict = self._pieges.evaluer(analyser_url(url_normalisee)) if self._pieges else None
+        if verdict == BLOQUER:
+            self._statistiques.urls_pieges_bloquees += 1
+            return False
+        if verdict == RETROGRADER:
+            self._statistiques.urls_pieges_retrogradees += 1
+
+        # Hors échantillon : comptée dans la population de son gabarit, jamais récupérée
+        if self._echantillonneur and not self._echantillonneur.retenir(analyser_url(url_normalisee)):
+            self._frontiere.marquer_connue(url_normalisee)
+            self._statistiques.urls_hors_echantillon += 1
+            return False
+
+        return self._frontiere.ajouter(
+            url_normalisee, profondeur,
+            differee=verdict == RETROGRADER,
+            priorite=self._priorite(url_normalisee, cadres_parent)
+        )
+
+    def _priorite(self, url_normalisee: str, cadres_parent: int = 0) -> float:
+        """
+        Priorité d'une URL dans la frontière (0 sans priorisation des pages à cadres).
+
+        Args:
+            url_normalisee: URL absolue normalisée.
+            cadres_parent: Nombre de cadres de la page où le lien a été trouvé.
+
+        Returns:
+            Priorité estimée.
+        """
+        if self._estimateur is None:
+            return 0.0
+        return self._estimateur.priorite(url_normalisee, cadres_parent)
+
+    def _suivre_redirection_depart(self, page: PageCrawlee) -> None:
+        """
+        Adopte l'hôte final de l'URL de départ si elle redirige vers un autre
+        hôte (ex: exemple.fr vers www.exemple.fr) : les liens de la page sont
+        résolus par rapport à son URL finale.
+
+        Args:
+            page: Page récupérée pour l'URL de départ.
+        """
+        hote = analyser_url(page.url).hote
+        if page.statut_http and hote and hote != self._domaine_principal:
+            self._log(f"L'URL de départ redirige vers {hote} : domaine suivi mis à jour")
+            self._domaine_principal = hote
+            self._extracteur = ExtracteurLiens(None if self._suivre_externe else hote)
+
+    def _est_doublon(self, page: PageCrawlee, url_demandee: str, profondeur: int) -> bool:
+        """
+        Rattache à la page son URL finale et son URL canonique.
+
+        Ces URLs sont marquées visitées (état alias du journal) : une page qui
+        redirige vers une page déjà visitée, ou dont l'URL canonique a déjà été
+        visitée, est écartée avant analyse, et les liens découverts vers ces
+        URLs ne sont pas suivis. Les URLs couvertes par la page autres que son
+        URL finale sont relevées dans `page.alias` pour le journal de reprise.
+
+        Args:
+            page: Page récupérée.
+            url_demandee: URL normalisée demandée.
+            profondeur: Profondeur de l'URL demandée.
+
+        Returns:
+            True si la page double une page déjà visitée.
+        """
+        alias = []
+        if page.url != url_demandee:
+            alias.append((page.url, 'doublons_redirection'))
+
+        canonique = page.document.canonique if self._respecter_canonique and page.document else None
+        if canonique:
+            canonique = normaliser_url(canonique)
+            if canonique not in (url_demandee, page.url) and self._extracteur.accepter(canonique):
+                alias.append((canonique, 'doublons_canonique'))
+
+        for url, compteur in alias:
+            if self._frontiere.est_visitee(url):
+                setattr(self._statistiques, compteur, getattr(self._statistiques, compteur) + 1)
+                self._log(f"Doublon de {url} écarté : {url_demandee}")
+                # Pas de nouvelle récupération à la reprise
+                self._frontiere.marquer_alias(url_demandee, profondeur)
+                return True
+
+        for url, _ in alias:
+            self._frontiere.marquer_alias(url, profondeur)
+            self._alias.add(url)
+        page.alias = [url for url in (url_demandee, canonique) if url and url != page.url]
+        return False
+
+    def _creer_detecteur_pieges(self) -> Optional[DetecteurPieges]:
+        """
+        Crée le détecteur de pièges d'un nouveau crawl.
+
+        Returns:
+            Détecteur, ou None si la détection est désactivée.
+        """
+        if self._config_pieges is None:
+            return None
+        try:
+            return DetecteurPieges(callback_log=self._log, **self._config_pieges)
+        except ValueError as e:
+            self._log(f"Avertissement : {e} ; motifs rétrogradés")
+            return DetecteurPieges(
+                callback_log=self._log, **dict(self._config_pieges, action=RETROGRADER)
+            )
+
+    def _amorcer_depuis_sitemaps(self, url_depart: str) -> None:
+        """
+        Ajoute à la frontière les pages déclarées dans les sitemaps du site.
+
+        Les sitemaps sont ceux déclarés dans le robots.txt, ainsi que
+        /sitemap.xml. Ils sont lus en flux et la lecture s'arrête dès que
+        `max_urls_sitemap` URLs ont été retenues. Les pages ainsi trouvées
+        sont placées à la profondeur 1, avant les liens découverts.
+
+        Args:
+            url_depart: URL de départ normalisée.
+        """
+        depart = analyser_url(url_depart)
+        sources = self._robots.sitemaps(url_depart) if self._robots else []
+        sources.append(f"{depart.schema}://{depart.hote}/sitemap.xml")
+
+        lecteur = LecteurSitemap(
+            self._transport, self._timeout, self._max_fichiers_sitemap, self._log
+        )
+        urls = lecteur.iterer_urls(sources)
+        try:
+            for url in urls:
+                if self._arreter or self._statistiques.urls_sitemap >= self._max_urls_sitemap:
+                    break
+                if self._admettre(normaliser_url(urljoin(url_depart, url)), 1):
+                    self._statistiques.urls_sitemap += 1
+        finally:
+            urls.close()
+
+        self._statistiques.sitemaps_lus = lecteur.sitemaps_lus
+        if lecteur.sitemaps_lus:
+            self._log(
+                f"Sitemaps : {self._statistiques.urls_sitemap} URL(s) ajoutée(s) "
+                f"depuis {lecteur.sitemaps_lus} fichier(s)"
+            )
+
     @property
     def statistiques(self) -> StatistiqueCrawl:
         """Retourne les statistiques du crawl."""
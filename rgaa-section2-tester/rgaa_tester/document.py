@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+Module de document HTML pour RGAA Section 2 Tester
+
+Parse une page une seule fois avec lxml et expose ce dont ont besoin
+le crawler (liens) et l'analyseur (titre, cadres). Les octets reçus sont
+transmis directement à lxml, avec l'encodage détecté à partir de l'en-tête
+HTTP ou de la balise <meta charset>.
+"""
+
+import codecs
+import hashlib
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional, Union
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml import etree
+from requests.compat import chardet
+
+# Nombre d'octets examinés pour trouver la déclaration d'encodage (pré-analyse HTML)
+TAILLE_PREANALYSE = 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16le'),
+    (codecs.BOM_UTF16_BE, 'utf-16be'),
+)
+_CHARSET_EN_TETE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.IGNORECASE)
+_CHARSET_META = re.compile(
+    rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.IGNORECASE
+)
+_ENCODAGE_XML = re.compile(rb'^<\?xml[^>]+encoding\s*=\s*["\']([\w.:-]+)', re.IGNORECASE)
+
+# Les parseurs lxml ne sont pas partagés entre threads
+_parseurs = threading.local()
+
+
+@dataclass
+class DocumentHTML:
+    """Page HTML parsée, partagée entre le crawler et l'analyseur."""
+    url: str
+    arbre: Optional[lxml.html.HtmlElement] = None
+    titre: Optional[str] = None
+    liens: List[str] = field(default_factory=list)  # Attributs href bruts des <a>
+    base: Optional[str] = None  # URL absolue du <base href>, s'il existe
+    base_href: Optional[str] = None  # Attribut href brut du <base>, s'il existe
+    canonique: Optional[str] = None  # URL absolue du <link rel="canonical">, s'il existe
+    cadres: List[lxml.html.HtmlElement] = field(default_factory=list)  # <iframe> et <frame>
+    empreinte: str = ""  # SHA-256 du contenu source
+    encodage: Optional[str] = None  # Encodage utilisé pour décoder les octets
+
+
+def calculer_empreinte(html: Union[str, bytes]) -> str:
+    """
+    Calcule l'empreinte d'un contenu HTML.
+
+    Args:
+        html: Contenu HTML (texte ou octets).
+
+    Returns:
+        Empreinte SHA-256 hexadécimale.
+    """
+    if isinstance(html, str):
+        html = html.encode('utf-8', 'surrogatepass')
+    return hashlib.sha256(html).hexdigest()
+
+
+def _normaliser_encodage(nom: Optional[str]) -> Optional[str]:
+    """
+    Valide un nom d'encodage et le ramène à sa forme canonique.
+
+    Comme les navigateurs, ISO-8859-1 et ASCII sont lus en windows-1252.
+
+    Args:
+        nom: Nom d'encodage déclaré.
+
+    Returns:
+        Nom canonique, ou None si l'encodage est inconnu.
+    """
+    if not nom:
+        return None
+    try:
+        nom = codecs.lookup(nom.strip()).name
+    except LookupError:
+        return None
+    if nom in ('latin-1', 'iso8859-1', 'ascii'):
+        return 'cp1252'
+    return nom
+
+
+def detecter_encodage(contenu: bytes, content_type: str = "") -> str:
+    """
+    Détermine l'encodage d'un contenu HTML sans le décoder.
+
+    Ordre de priorité : BOM, paramètre charset de l'en-tête Content-Type,
+    déclaration <meta charset> ou XML dans les premiers octets, puis
+    UTF-8 s'il est valide, et enfin détection statistique.
+
+    Args:
+        contenu: Corps de la réponse (octets).
+        content_type: Valeur de l'en-tête Content-Type.
+
+    Returns:
+        Nom de l'encodage.
+    """
+    for bom, encodage in _BOMS:
+        if contenu.startswith(bom):
+            return encodage
+
+    correspondance = _CHARSET_EN_TETE.search(content_type or "")
+    encodage = _normaliser_encodage(correspondance.group(1) if correspondance else None)
+    if encodage:
+        return encodage
+
+    debut = contenu[:TAILLE_PREANALYSE]
+    correspondance = _CHARSET_META.search(debut) or _ENCODAGE_XML.search(debut)
+    if correspondance:
+        encodage = _normaliser_encodage(correspondance.group(1).decode('ascii', 'ignore'))
+        # Une page déclarée en UTF-16 mais lisible en ASCII est en fait en UTF-8
+        if encodage and not encodage.startswith('utf-16'):
+            return encodage
+
+    try:
+        contenu.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    encodage = _normaliser_encodage(chardet.detect(contenu).get('encoding'))
+    return encodage or 'cp1252'
+
+
+def _parseur(encodage: str) -> lxml.html.HTMLParser:
+    """Retourne le parseur lxml du thread courant pour un encodage."""
+    cache = getattr(_parseurs, 'cache', None)
+    if cache is None:
+        cache = _parseurs.cache = {}
+    parseur = cache.get(encodage)
+    if parseur is None:
+        parseur = cache[encodage] = lxml.html.HTMLParser(encoding=encodage)
+    return parseur
+
+
+def _parser_arbre(html: Union[str, bytes], encodage: Optional[str] = None) -> Optional[lxml.html.HtmlElement]:
+    """
+    Construit l'arbre lxml d'un contenu HTML.
+
+    Args:
+        html: Contenu HTML (texte ou octets).
+        encodage: Encodage des octets (optionnel).
+
+    Returns:
+        Élément racine, ou None si le document est vide.
+    """
+    if not html:
+        return None
+
+    if isinstance(html, bytes) and encodage:
+        try:
+            parseur = _parseur(encodage)
+        except LookupError:
+            # Encodage connu de Python mais pas de libxml2 : décodage préalable
+            html = html.decode(encodage, 'replace')
+        else:
+            try:
+                return lxml.html.document_fromstring(html, parser=parseur)
+            except etree.ParserError:
+                return None
+
+    try:
+        return lxml.html.document_fromstring(html)
+    except ValueError:
+        # Texte avec déclaration d'encodage XML : lxml exige des octets
+        return lxml.html.document_fromstring(
+            html.encode('utf-8'),
+            parser=lxml.html.HTMLParser(encoding='utf-8')
+        )
+    except etree.ParserError:
+        return None
+
+
+def parser_document(html: Union[str, bytes],
+                    url: str,
+                    empreinte: Optional[str] = None,
+                    encodage: Optional[str] = None) -> DocumentHTML:
+    """
+    Parse une page HTML et en extrait le titre, les liens et les cadres.
+
+    Args:
+        html: Contenu HTML de la page (octets de préférence).
+        url: URL de la page.
+        empreinte: Empreinte du contenu si elle est déjà connue (optionnel).
+        encodage: Encodage des octets ; détecté s'il n'est pas fourni.
+
+    Returns:
+        Document parsé.
+    """
+    if isinstance(html, bytes) and html and not encodage:
+        encodage = detecter_encodage(html)
+
+    document = DocumentHTML(
+        url=url,
+        empreinte=empreinte or calculer_empreinte(html or b""),
+        encodage=encodage if isinstance(html, bytes) else None
+    )
+    arbre = _parser_arbre(html, encodage)
+    if arbre is None:
+        return document
+
+    document.arbre = arbre
+
+    titre = arbre.find('.//title')
+    if titre is not None:
+        document.titre = titre.text_content()
+
+    canonique = None
+    for element in arbre.iter('a', 'iframe', 'frame', 'base', 'link'):
+        tag = element.tag
+        if tag == 'a':
+            href = element.get('href')
+            if href is not None:
+                document.liens.append(href)
+        elif tag == 'base':
+            # Seul le premier <base href> compte
+            href = element.get('href')
+            if href and document.base is None:
+                document.base_href = href.strip()
+                document.base = urljoin(url, document.base_href)
+        elif tag == 'link':
+            # Seul le premier <link rel="canonical"> compte
+            if canonique is None and 'canonical' in (element.get('rel') or '').lower().split():
+                canonique = (element.get('href') or '').strip() or None
+        else:
+            document.cadres.append(element)
+
+    if canonique is not None:
+        document.canonique = urljoin(document.base or url, canonique)
+
+    return document
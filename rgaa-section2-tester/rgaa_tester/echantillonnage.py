@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Module d'échantillonnage par gabarit pour RGAA Section 2 Tester
+
+Regroupe les URLs découvertes par gabarit de chemin (ex: /actualites/{slug},
+/produit/{id}) et ne retient que quelques pages représentatives de chacun :
+sur un site volumineux, les cadres dépendent des gabarits, pas des pages.
+"""
+
+import re
+from collections import Counter
+from typing import Dict
+from urllib.parse import parse_qsl
+
+from .pieges import generaliser_segment
+from .utils import UrlCanonique
+
+_SLUG = re.compile(r'.*[-_\d].*')
+
+
+def gabarit_url(url: UrlCanonique) -> str:
+    """
+    Calcule le gabarit d'une URL.
+
+    Les identifiants, dates et nombres sont généralisés comme pour la
+    détection des pièges ; au-delà du premier niveau, un segment composé
+    (tirets, soulignés, chiffres) est considéré comme un slug.
+
+    Args:
+        url: URL canonique.
+
+    Returns:
+        Gabarit (ex: /actualites/{slug}?page).
+    """
+    segments = []
+    for niveau, segment in enumerate(s for s in url.chemin.split('/') if s):
+        generalise = generaliser_segment(segment)
+        if generalise == '{n}':
+            generalise = '{id}'
+        elif niveau > 0 and generalise not in ('{date}', '{id}') and _SLUG.fullmatch(segment):
+            generalise = '{slug}'
+        segments.append(generalise)
+
+    gabarit = '/' + '/'.join(segments)
+    if url.requete:
+        noms = sorted({nom for nom, _ in parse_qsl(url.requete, keep_blank_values=True)})
+        gabarit += '?' + '&'.join(noms)
+    return gabarit
+
+
+class Echantillonneur:
+    """
+    Retient au plus `pages_par_gabarit` URLs par gabarit.
+
+    Toutes les URLs découvertes sont comptées dans la population de leur
+    gabarit, ce qui permet d'extrapoler les résultats de l'échantillon.
+    """
+
+    def __init__(self, pages_par_gabarit: int = 3):
+        """
+        Initialise l'échantillonneur.
+
+        Args:
+            pages_par_gabarit: Nombre de pages représentatives par gabarit.
+        """
+        self._pages_par_gabarit = max(1, pages_par_gabarit)
+        self._populations: Counter = Counter()
+        self._retenues: Counter = Counter()
+
+    def retenir(self, url: UrlCanonique) -> bool:
+        """
+        Comptabilise une URL découverte et indique si elle fait partie de l'échantillon.
+
+        Args:
+            url: URL canonique, encore inconnue du crawl.
+
+        Returns:
+            True si l'URL doit être récupérée et analysée.
+        """
+        gabarit = gabarit_url(url)
+        self._populations[gabarit] += 1
+        if self._retenues[gabarit] >= self._pages_par_gabarit:
+            return False
+        self._retenues[gabarit] += 1
+        return True
+
+    @property
+    def populations(self) -> Dict[str, int]:
+        """Retourne le nombre d'URLs découvertes par gabarit."""
+        return dict(self._populations)
@@ -0,0 +1,299 @@
+# -*- coding: utf-8 -*-
+"""
+Module de frontière de crawl pour RGAA Section 2 Tester
+
+Gère la file des URLs à visiter et l'index des URLs déjà connues
+(en attente ou visitées) avec des opérations en temps constant.
+"""
+
+import hashlib
+import heapq
+from collections import deque
+from itertools import chain, islice
+from typing import Any, Callable, Deque, Iterable, Iterator, List, Optional, Set, Tuple
+
+# États d'une URL connue (journal de reprise)
+EN_ATTENTE = 'attente'
+DIFFEREE = 'differee'
+VISITEE = 'visitee'
+ALIAS = 'alias'  # Visitée comme URL finale ou canonique d'une autre URL demandée
+ECARTEE = 'ecartee'
+
+
+class FrontiereCrawl:
+    """
+    File FIFO des URLs à visiter avec index d'appartenance.
+
+    Une URL n'entre qu'une seule fois dans la frontière : l'index couvre
+    à la fois les URLs en attente et les URLs déjà visitées, ce qui rend
+    l'ajout, le retrait et le test d'appartenance en O(1).
+
+    Les URLs rétrogradées (pièges de crawl présumés) sont placées dans une
+    file différée, parcourue seulement lorsque la file principale est vide.
+
+    En mode aléatoire, la file principale est servie dans un ordre
+    pseudo-aléatoire : chaque URL reçoit une clé dérivée de la graine et de
+    l'URL elle-même. L'ordre ne dépend donc pas du moment où l'URL a été
+    découverte, et un crawl est reproductible à graine égale.
+
+    En mode prioritaire, la file principale est servie par priorité
+    décroissante (fournie à l'ajout), puis dans l'ordre de découverte. Si
+    un évaluateur est défini, la priorité de l'URL en tête est réévaluée au
+    retrait : une URL dont la priorité a baissé depuis sa découverte est
+    replacée dans le tas à son nouveau rang.
+
+    Une fois `journaliser` appelée, chaque changement d'état d'une URL est
+    consigné jusqu'au prochain appel de `modifications` : le journal de
+    reprise n'enregistre ainsi que ce qui a changé depuis le dernier point
+    de sauvegarde.
+    """
+
+    def __init__(self, aleatoire: bool = False, graine: int = 0, prioritaire: bool = False):
+        """
+        Initialise une frontière vide.
+
+        Args:
+            aleatoire: Sert la file principale dans un ordre pseudo-aléatoire.
+            graine: Graine de l'ordre aléatoire.
+            prioritaire: Sert la file principale par priorité décroissante
+                (ignoré en mode aléatoire).
+        """
+        self._aleatoire = aleatoire
+        self._graine = graine
+        self._prioritaire = prioritaire and not aleatoire
+        self._sel = str(graine).encode('utf-8')
+        self._file: Deque[Tuple[str, int]] = deque()
+        # (clé, url, profondeur) en mode aléatoire ou prioritaire
+        self._tas: List[Tuple[Any, str, int]] = []
+        self._file_differee: Deque[Tuple[str, int]] = deque()
+        self._connues: Set[str] = set()
+        self._visitees: Set[str] = set()
+        self._modifications: Optional[List[Tuple[str, int, str]]] = None
+        self._evaluateur: Optional[Callable[[str], float]] = None
+
+        # Compteurs
+        self.urls_ajoutees = 0
+        self.doublons_ecartes = 0
+        self.taille_max = 0
+        self.profondeur_max = 0
+
+    def ajouter(self, url: str, profondeur: int = 0, differee: bool = False,
+                priorite: float = 0.0) -> bool:
+        """
+        Ajoute une URL en fin de file si elle n'est pas déjà connue.
+
+        Args:
+            url: URL normalisée.
+            profondeur: Profondeur de l'URL depuis l'URL de départ.
+            differee: Place l'URL dans la file différée (basse priorité).
+            priorite: Priorité de l'URL en mode prioritaire.
+
+        Returns:
+            True si l'URL a été ajoutée, False si elle était déjà connue.
+        """
+        if url in self._connues:
+            self.doublons_ecartes += 1
+            return False
+
+        self._connues.add(url)
+        self._consigner(url, profondeur, DIFFEREE if differee else EN_ATTENTE)
+        if differee:
+            self._file_differee.append((url, profondeur))
+        elif self._aleatoire:
+            heapq.heappush(self._tas, (self._cle(url), url, profondeur))
+        elif self._prioritaire:
+            heapq.heappush(self._tas, ((-priorite, self.urls_ajoutees), url, profondeur))
+        else:
+            self._file.append((url, profondeur))
+        self.urls_ajoutees += 1
+
+        if len(self) > self.taille_max:
+            self.taille_max = len(self)
+        if profondeur > self.profondeur_max:
+            self.profondeur_max = profondeur
+
+        return True
+
+    def extraire(self) -> Tuple[str, int]:
+        """
+        Retire la prochaine URL de la file (la file différée en dernier).
+
+        Returns:
+            Tuple (url, profondeur).
+
+        Raises:
+            IndexError: Si la file est vide.
+        """
+        if self._file:
+            return self._file.popleft()
+        if self._tas:
+            if self._prioritaire and self._evaluateur is not None:
+                return self._extraire_reevaluee()
+            _, url, profondeur = heapq.heappop(self._tas)
+            return url, profondeur
+        return self._file_differee.popleft()
+
+    def _extraire_reevaluee(self) -> Tuple[str, int]:
+        """Retire l'URL de plus haute priorité, en réévaluant les priorités en tête du tas."""
+        while True:
+            (cle, rang), url, profondeur = heapq.heappop(self._tas)
+            cle_actuelle = -self._evaluateur(url)
+            # L'URL reste en tête si sa priorité actuelle vaut encore celle des suivantes
+            if not self._tas or cle_actuelle <= cle or (cle_actuelle, rang) <= self._tas[0][0]:
+                return url, profondeur
+            heapq.heappush(self._tas, ((cle_actuelle, rang), url, profondeur))
+
+    def definir_evaluateur(self, evaluateur: Optional[Callable[[str], float]]) -> None:
+        """
+        Définit la fonction de réévaluation des priorités (mode prioritaire).
+
+        Args:
+            evaluateur: Fonction retournant la priorité actuelle d'une URL en attente.
+        """
+        self._evaluateur = evaluateur
+
+    def apercu(self, nombre: int) -> Iterator[str]:
+        """
+        Parcourt les prochaines URLs de la file sans les retirer.
+
+        En mode aléatoire ou prioritaire, l'aperçu suit les clés du tas
+        (priorités de l'ajout, avant une éventuelle réévaluation au retrait).
+
+        Args:
+            nombre: Nombre maximum d'URLs à parcourir.
+
+        Returns:
+            Itérateur sur les URLs.
+        """
+        return (url for url, _ in islice(chain(self._file, self._parcourir_tas(), self._file_differee), nombre))
+
+    def _parcourir_tas(self) -> Iterator[Tuple[str, int]]:
+        """
+        Parcourt le tas dans l'ordre de retrait, sans le modifier.
+
+        Seuls les enfants des entrées déjà produites sont examinés : lire
+        les k premières entrées coûte O(k log k), quelle que soit la taille
+        de la file.
+
+        Returns:
+            Itérateur sur les (url, profondeur).
+        """
+        tas = self._tas
+        candidats = [(tas[0], 0)] if tas else []
+        while candidats:
+            (_, url, profondeur), indice = heapq.heappop(candidats)
+            yield url, profondeur
+            for enfant in (2 * indice + 1, 2 * indice + 2):
+                if enfant < len(tas):
+                    heapq.heappush(candidats, (tas[enfant], enfant))
+
+    def _cle(self, url: str) -> int:
+        """Clé d'ordre aléatoire d'une URL, dérivée de la graine."""
+        return int.from_bytes(
+            hashlib.blake2b(url.encode('utf-8'), digest_size=8, key=self._sel[:64]).digest(), 'big'
+        )
+
+    def marquer_visitee(self, url: str, profondeur: int = 0) -> None:
+        """
+        Marque une URL comme visitée.
+
+        Args:
+            url: URL normalisée.
+            profondeur: Profondeur de l'URL depuis l'URL de départ.
+        """
+        self._connues.add(url)
+        self._visitees.add(url)
+        self._consigner(url, profondeur, VISITEE)
+
+    def marquer_alias(self, url: str, profondeur: int = 0) -> None:
+        """
+        Marque une URL comme visitée à travers une autre (redirection, URL
+        canonique, doublon écarté) : elle n'est jamais replacée en file.
+
+        Args:
+            url: URL normalisée.
+            profondeur: Profondeur de l'URL demandée.
+        """
+        self._connues.add(url)
+        self._visitees.add(url)
+        self._consigner(url, profondeur, ALIAS)
+
+    def marquer_connue(self, url: str) -> None:
+        """
+        Rend une URL connue sans la placer en file (URL écartée).
+
+        Args:
+            url: URL normalisée.
+        """
+        if url not in self._connues:
+            self._connues.add(url)
+            self._consigner(url, 0, ECARTEE)
+
+    def journaliser(self) -> None:
+        """Active la consignation des changements d'état des URLs."""
+        if self._modifications is None:
+            self._modifications = []
+
+    def _consigner(self, url: str, profondeur: int, etat: str) -> None:
+        """Consigne un changement d'état si la journalisation est active."""
+        if self._modifications is not None:
+            self._modifications.append((url, profondeur, etat))
+
+    def modifications(self) -> List[Tuple[str, int, str]]:
+        """
+        Retire les changements d'état consignés depuis le dernier appel.
+
+        Returns:
+            Liste de (url, profondeur, état), dans l'ordre des changements.
+        """
+        if self._modifications is None:
+            return []
+        modifications = self._modifications
+        self._modifications = []
+        return modifications
+
+    def restaurer(self, entrees: Iterable[Tuple[str, int, str]]) -> None:
+        """
+        Reconstruit la frontière à partir des états enregistrés.
+
+        Les URLs en attente sont replacées en file dans l'ordre fourni ;
+        aucun changement n'est consigné.
+
+        Args:
+            entrees: Tuples (url, profondeur, état).
+        """
+        modifications, self._modifications = self._modifications, None
+        for url, profondeur, etat in entrees:
+            if etat in (VISITEE, ALIAS):
+                self.marquer_visitee(url, profondeur)
+                self.profondeur_max = max(self.profondeur_max, profondeur)
+            elif etat == ECARTEE:
+                self.marquer_connue(url)
+            else:
+                self.ajouter(url, profondeur, differee=etat == DIFFEREE)
+        self._modifications = modifications
+
+    def est_connue(self, url: str) -> bool:
+        """Indique si une URL est en attente ou déjà visitée."""
+        return url in self._connues
+
+    def est_visitee(self, url: str) -> bool:
+        """Indique si une URL a déjà été visitée."""
+        return url in self._visitees
+
+    def vider(self) -> None:
+        """Vide la frontière et remet les compteurs à zéro (le mode d'ordre est conservé)."""
+        self.__init__(self._aleatoire, self._graine, self._prioritaire)
+
+    @property
+    def visitees(self) -> Set[str]:
+        """Retourne l'ensemble des URLs visitées."""
+        return self._visitees
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'URLs en attente."""
+        return len(self._file) + len(self._tas) + len(self._file_differee)
+
+    def __bool__(self) -> bool:
+        """Indique s'il reste des URLs en attente."""
+        return bool(self._file) or bool(self._tas) or bool(self._file_differee)
@@ -14,9 +14,15 @@ from pathlib import Path
 from typing import Optional
 
 from .analyzer import AnalyseurRGAA, ResultatAnalyseGlobal, ResultatPage
+from .cadres import creer_explorateur_cadres
 from .config import get_config
+from .convergence import creer_suivi_convergence
 from .crawler import Crawler, PageCrawlee
+from .incremental import charger_audit_precedent
+from .pipeline import PipelineAnalyse
 from .report_generator import GenerateurRapport
+from .reprise import ouvrir_journal
+from .sondes import creer_sonde_cadres
 from .utils import est_url_valide, formater_date, normaliser_url
 
 
@@ -39,6 +45,11 @@ class ApplicationRGAA(tk.Tk):
         self.crawler = Crawler(self.config)
         self.analyseur = AnalyseurRGAA(self.config)
         self.generateur = GenerateurRapport(self.config)
+        self.pipeline = PipelineAnalyse(
+            self.analyseur,
+            self.config.get("analyse.taille_file_attente", 8),
+            self.config.get("analyse.processus_analyse", 1)
+        )
 
         # État
         self._analyse_en_cours = False
@@ -343,6 +354,10 @@ class ApplicationRGAA(tk.Tk):
             mode: Mode d'analyse ('unique' ou 'crawler').
             max_pages: Nombre maximum de pages.
         """
+        # Sans page récupérée ou en cas d'erreur, l'audit reste à reprendre
+        # et ne sert pas de référence
+        journal = None
+        interrompu = True
         try:
             # Configurer les callbacks du crawler
             self.crawler.definir_callback_log(
@@ -352,42 +367,72 @@ class ApplicationRGAA(tk.Tk):
                 lambda p, t, m: self.after(0, lambda: self._mettre_a_jour_progression(p, t, m))
             )
 
-            # Récupérer les pages
+            # Récupérer et analyser les pages en flux : chaque page est
+            # analysée dès son arrivée puis libérée
+            self._resultat_global = ResultatAnalyseGlobal(
+                url_depart=url,
+                date_analyse=formater_date()
+            )
+
             if mode == "unique":
                 self._log("Mode : Page unique")
                 page = self.crawler.crawl_page_unique(url)
                 pages = [page] if page and page.html else []
             else:
                 self._log(f"Mode : Crawler multi-pages (max {max_pages})")
-                pages = self.crawler.crawl(url, max_pages)
-
-            if not pages:
+                # Un crawl arrêté peut être repris en ligne de commande (--resume)
+                journal = ouvrir_journal(self.config, url, max_pages,
+                                         signature_analyse=self.analyseur.signature)
+                pages = self.crawler.iterer_pages(url, max_pages, journal)
+
+            # Audit incrémental : seules les pages modifiées ou nouvelles sont analysées
+            audit_precedent = None
+            if self.config.get("crawler.audit_incremental", False):
+                audit_precedent = charger_audit_precedent(
+                    self.config, url, exclure=journal.id_audit if journal else None,
+                    signature_analyse=self.analyseur.signature
+                )
+                if audit_precedent is not None:
+                    self._log(f"Audit de référence : {audit_precedent.id_audit}")
+            self.analyseur.definir_audit_precedent(audit_precedent)
+
+            def page_analysee(page: PageCrawlee, resultat_page: ResultatPage) -> None:
+                message = f"Page analysée : {page.url[:50]}... - {resultat_page.cadres_testes} cadre(s)"
+                self.after(0, lambda: self._log(message))
+
+            explorateur = creer_explorateur_cadres(self.config, self.analyseur, self.crawler)
+            sonde = creer_sonde_cadres(self.config, self.crawler)
+            try:
+                self.pipeline.executer(
+                    pages, self._resultat_global, page_analysee, creer_suivi_convergence(self.config),
+                    journal, explorateur, sonde
+                )
+            finally:
+                if explorateur is not None:
+                    explorateur.fermer()
+                    self._resultat_global.exploration_cadres = explorateur.vers_dict()
+                if sonde is not None:
+                    sonde.fermer()
+                    self._resultat_global.sonde_cadres = sonde.vers_dict()
+
+            if not self._resultat_global.pages:
                 self.after(0, lambda: self._terminer_analyse(None, "Aucune page récupérée."))
                 return
 
-            # Analyser les pages
-            self._log(f"Analyse de {len(pages)} page(s)...")
-            self._resultat_global = ResultatAnalyseGlobal(
-                url_depart=url,
-                date_analyse=formater_date()
-            )
-
-            for i, page in enumerate(pages):
-                if not self._analyse_en_cours:
-                    break
-
-                self.after(0, lambda i=i, t=len(pages): self._mettre_a_jour_progression(
-                    i + 1, t, f"Analyse de la page {i + 1}/{t}..."
-                ))
-
-                if page.html:
-                    resultat_page = self.analyseur.analyser_page(page.html, page.url)
-                    self._resultat_global.pages.append(resultat_page)
-
-                    self._log(f"Page analysée : {page.url[:50]}... - {resultat_page.cadres_testes} cadre(s)")
-
             # Calculer les statistiques finales
+            self._resultat_global.motifs_pieges = self.crawler.statistiques.motifs_pieges
+            self._resultat_global.doublons_redirection = self.crawler.statistiques.doublons_redirection
+            self._resultat_global.doublons_canonique = self.crawler.statistiques.doublons_canonique
+            self._resultat_global.requetes_evitees = self.crawler.statistiques.requetes_evitees
+            self._resultat_global.priorisation_cadres = self.crawler.statistiques.priorisation_cadres
+            self._resultat_global.populations_gabarits = self.crawler.statistiques.populations_gabarits
+            self._resultat_global.raison_arret = (
+                self._resultat_global.raison_arret or self.crawler.statistiques.raison_arret
+            )
+            if audit_precedent is not None:
+                self._resultat_global.delta = audit_precedent.comparer(self._resultat_global)
             self._resultat_global.calculer_statistiques()
+            interrompu = self.crawler.statistiques.arret_demande
 
             self.after(0, lambda: self._terminer_analyse(
                 self._resultat_global,
@@ -398,6 +443,13 @@ class ApplicationRGAA(tk.Tk):
         except Exception as e:
             self.after(0, lambda: self._terminer_analyse(None, f"Erreur : {str(e)}"))
 
+        finally:
+            if journal is not None:
+                journal.terminer(
+                    self._resultat_global.raison_arret or "Analyse interrompue par une erreur", interrompu
+                )
+                journal.fermer()
+
     def _terminer_analyse(self, resultat: Optional[ResultatAnalyseGlobal], message: str) -> None:
         """
         Termine l'analyse et met à jour l'interface.
@@ -428,6 +480,7 @@ class ApplicationRGAA(tk.Tk):
         """Arrête l'analyse en cours."""
         self._analyse_en_cours = False
         self.crawler.arreter()
+        self.pipeline.arreter()
         self._log("Arrêt de l'analyse demandé...")
         self.btn_arreter.config(state=tk.DISABLED)
 
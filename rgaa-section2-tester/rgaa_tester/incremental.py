@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Module d'audit incrémental pour RGAA Section 2 Tester
+
+Réaudite un site en s'appuyant sur un audit précédent conservé dans le
+journal de reprise : les pages dont le contenu n'a pas changé (même
+empreinte) reprennent leur résultat sans nouvelle analyse, seules les
+pages modifiées ou nouvelles sont analysées. Les changements depuis
+l'audit de référence sont résumés pour le rapport.
+"""
+
+import copy
+from typing import Any, Dict, List, Optional
+
+from .analyzer import ResultatAnalyseGlobal, ResultatPage
+from .config import Config
+from .reprise import JournalCrawl
+
+
+def charger_audit_precedent(config: Config,
+                            url_depart: str,
+                            id_audit: Optional[str] = None,
+                            exclure: Optional[str] = None,
+                            signature_analyse: Optional[str] = None) -> Optional["AuditPrecedent"]:
+    """
+    Charge l'audit de référence d'un audit incrémental.
+
+    Seul un audit analysé avec les mêmes paramètres (version de l'outil,
+    règles de titres) peut servir de référence : ses résultats seraient
+    sinon reportés tels quels malgré le changement de règles.
+
+    Args:
+        config: Configuration de l'application.
+        url_depart: URL de départ du site.
+        id_audit: Identifiant de l'audit de référence (défaut : dernier
+            audit terminé du même site).
+        exclure: Identifiant d'audit à ignorer (audit en cours).
+        signature_analyse: Signature des paramètres d'analyse de l'audit en cours
+            (`AnalyseurRGAA.signature`).
+
+    Returns:
+        L'audit de référence, ou None si aucun audit terminé compatible n'existe.
+
+    Raises:
+        KeyError: Si l'audit de référence demandé est inconnu.
+        ValueError: Si l'audit de référence demandé a été analysé avec d'autres paramètres.
+    """
+    fichier = config.crawler_config.get('fichier_reprise', 'audits/reprise.sqlite')
+    if not id_audit:
+        id_audit = JournalCrawl.dernier_audit(fichier, url_depart, exclure, signature_analyse)
+        if id_audit is None:
+            return None
+
+    journal = JournalCrawl.reprendre(fichier, id_audit)
+    try:
+        if signature_analyse is not None and journal.signature_analyse != signature_analyse:
+            raise ValueError(id_audit)
+        return AuditPrecedent(id_audit, journal.url_depart, journal.pages())
+    finally:
+        journal.fermer()
+
+
+class AuditPrecedent:
+    """
+    Résultats par URL d'un audit de référence.
+
+    Les résultats enregistrés avant l'ajout des empreintes n'en ont pas :
+    leurs pages sont toujours réanalysées.
+    """
+
+    def __init__(self, id_audit: str, url_depart: str, pages: List[ResultatPage]):
+        """
+        Initialise l'audit de référence.
+
+        Args:
+            id_audit: Identifiant de l'audit.
+            url_depart: URL de départ de l'audit.
+            pages: Résultats de pages de l'audit.
+        """
+        self.id_audit = id_audit
+        self.url_depart = url_depart
+        self._pages: Dict[str, ResultatPage] = {page.url: page for page in pages}
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def reporter(self, url: str, empreinte: str) -> Optional[ResultatPage]:
+        """
+        Reprend le résultat d'une page dont le contenu n'a pas changé.
+
+        Args:
+            url: URL de la page.
+            empreinte: Empreinte du contenu récupéré.
+
+        Returns:
+            Copie du résultat précédent (sans les cadres imbriqués ni la sonde
+            des sources, établis de nouveau), ou None si la page est nouvelle
+            ou modifiée.
+        """
+        precedent = self._pages.get(url)
+        if precedent is None or not precedent.empreinte or precedent.empreinte != empreinte:
+            return None
+
+        copie = copy.deepcopy(precedent)
+        copie.rattacher(url)
+        copie.reportee = True
+        copie.depuis_memo = False
+        return copie
+
+    def comparer(self, resultat: ResultatAnalyseGlobal) -> Dict[str, Any]:
+        """
+        Résume les changements entre l'audit de référence et un nouvel audit.
+
+        Args:
+            resultat: Résultat du nouvel audit.
+
+        Returns:
+            Dictionnaire : audit de référence et son taux 2.1, nombre de pages
+            inchangées, pages modifiées (avec cadres et non-conformités 2.1
+            avant/après), pages nouvelles et pages de référence absentes.
+        """
+        reference = ResultatAnalyseGlobal(url_depart=self.url_depart, pages=list(self._pages.values()))
+        reference.calculer_statistiques()
+
+        inchangees = 0
+        modifiees = []
+        nouvelles = []
+        urls_auditees = set()
+        for page in resultat.pages:
+            urls_auditees.add(page.url)
+            precedent = self._pages.get(page.url)
+            if precedent is None:
+                nouvelles.append({
+                    'url': page.url,
+                    'cadres': page.total_cadres,
+                    'non_conformes_2_1': page.non_conformes_2_1,
+                })
+            elif precedent.empreinte and precedent.empreinte == page.empreinte:
+                inchangees += 1
+            else:
+                modifiees.append({
+                    'url': page.url,
+                    'cadres_avant': precedent.total_cadres,
+                    'cadres_apres': page.total_cadres,
+                    'non_conformes_2_1_avant': precedent.non_conformes_2_1,
+                    'non_conformes_2_1_apres': page.non_conformes_2_1,
+                    'statut_2_1_avant': precedent.statut_2_1.value,
+                    'statut_2_1_apres': page.statut_2_1.value,
+                })
+
+        # Pages dont la conformité a le plus évolué en premier
+        modifiees.sort(key=lambda p: (
+            -abs(p['non_conformes_2_1_apres'] - p['non_conformes_2_1_avant']), p['url']
+        ))
+
+        return {
+            'audit_reference': self.id_audit,
+            'pages_reference': reference.total_pages,
+            'taux_2_1_reference': reference.taux_conformite_2_1,
+            'non_conformes_2_1_reference': reference.total_non_conformes_2_1,
+            'inchangees': inchangees,
+            'modifiees': modifiees,
+            'nouvelles': nouvelles,
+            'absentes': sorted(url for url in self._pages if url not in urls_auditees),
+        }
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+Module d'extraction des liens pour RGAA Section 2 Tester
+
+Transforme les attributs href d'une page parsée en URLs normalisées à
+ajouter à la frontière du crawl. Les filtres sont précompilés et
+appliqués sur de simples opérations de chaînes, sans réanalyser l'URL.
+"""
+
+import re
+from collections import OrderedDict
+from typing import FrozenSet, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from .document import DocumentHTML
+from .utils import UrlCanonique, analyser_url
+
+# Extensions de fichiers non-HTML à ne pas suivre
+EXTENSIONS_IGNOREES: FrozenSet[str] = frozenset((
+    '.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg',
+    '.css', '.js', '.ico', '.xml', '.json', '.zip',
+    '.doc', '.docx', '.xls', '.xlsx', '.mp3', '.mp4'
+))
+
+# Liens ne menant pas à une page (ancres, scripts, messagerie, téléphone)
+_LIEN_IGNORE = re.compile(r'\s*(?:#|javascript:|mailto:|tel:|data:)', re.IGNORECASE)
+_SCHEMA_HTTP = re.compile(r'https?://', re.IGNORECASE)
+
+
+class ExtracteurLiens:
+    """
+    Extracteur de liens d'un crawl.
+
+    Résout les liens par rapport au <base href> de la page s'il existe,
+    les normalise et écarte ceux qui ne doivent pas être suivis (autre
+    domaine, fichier non-HTML, schéma non-HTTP). Les compteurs sont
+    cumulés sur tout le crawl.
+
+    Les liens de navigation se répètent d'une page à l'autre : le résultat
+    de chaque résolution est mémorisé (LRU borné). Un lien absolu ou relatif
+    à la racine ne dépend que de l'origine de la page, et non de son chemin.
+    """
+
+    def __init__(self,
+                 domaine: Optional[str] = None,
+                 extensions_ignorees: FrozenSet[str] = EXTENSIONS_IGNOREES,
+                 taille_memo: int = 10000):
+        """
+        Initialise l'extracteur.
+
+        Args:
+            domaine: Seul domaine suivi (None pour suivre tous les domaines).
+            extensions_ignorees: Extensions (en minuscules) à ne pas suivre.
+            taille_memo: Nombre maximum de résolutions mémorisées.
+        """
+        self._domaine = domaine
+        self._extensions = extensions_ignorees
+        self._memo: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+        self._taille_memo = max(1, taille_memo)
+
+        # Compteurs
+        self.doublons = 0
+        self.filtres = 0
+
+    def accepter(self, url_normalisee: str) -> bool:
+        """
+        Indique si une URL normalisée peut être suivie.
+
+        Args:
+            url_normalisee: URL absolue normalisée.
+
+        Returns:
+            True si l'URL passe les filtres.
+        """
+        return self._filtrer(analyser_url(url_normalisee))
+
+    def _filtrer(self, url: UrlCanonique) -> bool:
+        """
+        Applique les filtres de domaine et d'extension aux composants d'une URL.
+
+        Args:
+            url: URL canonique.
+
+        Returns:
+            True si l'URL passe les filtres.
+        """
+        if not url.hote or (self._domaine is not None and url.hote != self._domaine):
+            return False
+
+        dernier = url.chemin.rsplit('/', 1)[-1]
+        point = dernier.rfind('.')
+        return point == -1 or dernier[point:].lower() not in self._extensions
+
+    def _resoudre(self, base: str, href: str) -> Optional[str]:
+        """
+        Résout et filtre un lien.
+
+        Args:
+            base: URL de base de la page.
+            href: Attribut href débarrassé de ses espaces.
+
+        Returns:
+            URL normalisée à suivre, ou None si le lien est filtré.
+        """
+        # Une URL déjà absolue n'est pas modifiée par urljoin
+        url_absolue = href if _SCHEMA_HTTP.match(href) else urljoin(base, href)
+        if not _SCHEMA_HTTP.match(url_absolue):
+            return None
+
+        url = analyser_url(url_absolue)
+        return url.url if self._filtrer(url) else None
+
+    def extraire(self, document: DocumentHTML) -> List[str]:
+        """
+        Retourne les URLs à suivre d'une page parsée, dans l'ordre du document.
+
+        Args:
+            document: Document parsé de la page.
+
+        Returns:
+            URLs normalisées, sans doublon au sein de la page.
+        """
+        base = document.base or document.url
+        origine = '/'.join(base.split('/', 3)[:3])
+        hrefs_vus: Set[str] = set()
+        urls: List[str] = []
+        memo = self._memo
+
+        for href in document.liens:
+            # Un même lien répété sur la page n'est traité qu'une fois
+            if href in hrefs_vus:
+                self.doublons += 1
+                continue
+            hrefs_vus.add(href)
+
+            if _LIEN_IGNORE.match(href):
+                self.filtres += 1
+                continue
+
+            href = href.strip()
+            if _SCHEMA_HTTP.match(href):
+                cle = ('', href)
+            elif href.startswith('/') and not href.startswith('//'):
+                cle = (origine, href)
+            else:
+                cle = (base, href)
+
+            if cle in memo:
+                memo.move_to_end(cle)
+                url_normalisee = memo[cle]
+            else:
+                url_normalisee = memo[cle] = self._resoudre(base, href)
+                if len(memo) > self._taille_memo:
+                    memo.popitem(last=False)
+
+            if url_normalisee is None:
+                self.filtres += 1
+                continue
+
+            urls.append(url_normalisee)
+
+        return urls
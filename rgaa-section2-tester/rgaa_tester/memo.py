@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+"""
+Module de mémoïsation des analyses pour RGAA Section 2 Tester
+
+Associe l'empreinte du contenu HTML d'une page à son résultat d'analyse,
+afin de ne pas réanalyser les contenus identiques (vues d'impression,
+variantes de session, gabarits partagés), au sein d'une exécution comme
+d'une exécution à l'autre.
+"""
+
+import copy
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from .analyzer import ResultatPage
+
+
+class MemoAnalyse:
+    """
+    Mémo LRU des résultats d'analyse, indexé par empreinte de contenu.
+
+    Les résultats sont conservés en mémoire (nombre d'entrées borné) et,
+    si un fichier est fourni, dans une base SQLite dont la taille totale
+    est bornée : les entrées les moins récemment utilisées sont évincées.
+    """
+
+    def __init__(self,
+                 signature: str,
+                 fichier: Optional[str] = None,
+                 entrees_memoire: int = 1000,
+                 taille_max_mo: float = 100.0):
+        """
+        Initialise le mémo.
+
+        Args:
+            signature: Signature des paramètres d'analyse (`signature_parametres`) ;
+                les modifier invalide le mémo.
+            fichier: Base SQLite de persistance (optionnel).
+            entrees_memoire: Nombre maximum de résultats gardés en mémoire.
+            taille_max_mo: Taille maximale de la base (Mo).
+        """
+        self._prefixe = signature
+        self._memoire: "OrderedDict[str, ResultatPage]" = OrderedDict()
+        self._entrees_memoire = max(1, entrees_memoire)
+        self._taille_max = int(taille_max_mo * 1024 * 1024)
+        self._verrou = threading.Lock()
+
+        # Compteurs
+        self.succes = 0
+        self.echecs = 0
+
+        self._connexion: Optional[sqlite3.Connection] = None
+        self._taille_totale = 0
+        if fichier:
+            self._ouvrir(fichier)
+
+    def _ouvrir(self, fichier: str) -> None:
+        """Ouvre (ou crée) la base de persistance."""
+        try:
+            Path(fichier).parent.mkdir(parents=True, exist_ok=True)
+            self._connexion = sqlite3.connect(fichier, check_same_thread=False)
+            self._connexion.execute(
+                "CREATE TABLE IF NOT EXISTS memo ("
+                " cle TEXT PRIMARY KEY,"
+                " donnees BLOB NOT NULL,"
+                " taille INTEGER NOT NULL,"
+                " dernier_acces REAL NOT NULL)"
+            )
+            self._connexion.execute(
+                "CREATE INDEX IF NOT EXISTS memo_acces ON memo (dernier_acces)"
+            )
+            self._connexion.commit()
+            self._taille_totale = self._connexion.execute(
+                "SELECT COALESCE(SUM(taille), 0) FROM memo"
+            ).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Avertissement: Mémo d'analyse non persistant ({e})")
+            self._connexion = None
+
+    def _cle(self, empreinte: str) -> str:
+        """Construit la clé d'une empreinte pour les paramètres courants."""
+        return f"{self._prefixe}:{empreinte}"
+
+    def obtenir(self, empreinte: str, url: str) -> Optional[ResultatPage]:
+        """
+        Retourne le résultat mémorisé pour un contenu, rattaché à une URL.
+
+        Args:
+            empreinte: Empreinte du contenu HTML.
+            url: URL de la page à laquelle rattacher le résultat.
+
+        Returns:
+            Copie du résultat rattachée à l'URL (`ResultatPage.rattacher`), ou None.
+        """
+        cle = self._cle(empreinte)
+
+        with self._verrou:
+            resultat = self._memoire.get(cle)
+            if resultat is not None:
+                self._memoire.move_to_end(cle)
+            elif self._connexion is not None:
+                resultat = self._lire_base(cle)
+                if resultat is not None:
+                    self._memoriser(cle, resultat)
+
+            if resultat is None:
+                self.echecs += 1
+                return None
+            self.succes += 1
+
+        copie = copy.deepcopy(resultat)
+        copie.rattacher(url)
+        copie.depuis_memo = True
+        return copie
+
+    def enregistrer(self, empreinte: str, resultat: ResultatPage) -> None:
+        """
+        Mémorise le résultat d'analyse d'un contenu.
+
+        Args:
+            empreinte: Empreinte du contenu HTML.
+            resultat: Résultat d'analyse.
+        """
+        cle = self._cle(empreinte)
+        copie = copy.deepcopy(resultat)
+
+        with self._verrou:
+            self._memoriser(cle, copie)
+            if self._connexion is not None:
+                self._ecrire_base(cle, copie)
+
+    def _memoriser(self, cle: str, resultat: ResultatPage) -> None:
+        """Ajoute un résultat au niveau mémoire (verrou détenu)."""
+        self._memoire[cle] = resultat
+        self._memoire.move_to_end(cle)
+        while len(self._memoire) > self._entrees_memoire:
+            self._memoire.popitem(last=False)
+
+    def _lire_base(self, cle: str) -> Optional[ResultatPage]:
+        """Lit un résultat dans la base (verrou détenu)."""
+        try:
+            ligne = self._connexion.execute(
+                "SELECT donnees FROM memo WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ligne is None:
+                return None
+            self._connexion.execute(
+                "UPDATE memo SET dernier_acces = ? WHERE cle = ?", (time.time(), cle)
+            )
+            self._connexion.commit()
+            return ResultatPage.depuis_dict(json.loads(zlib.decompress(ligne[0])))
+        except (sqlite3.Error, zlib.error, ValueError, KeyError, TypeError):
+            return None
+
+    def _ecrire_base(self, cle: str, resultat: ResultatPage) -> None:
+        """Écrit un résultat dans la base et évince les plus anciens (verrou détenu)."""
+        donnees = zlib.compress(
+            json.dumps(resultat.vers_dict(), ensure_ascii=False).encode('utf-8')
+        )
+        try:
+            ancienne = self._connexion.execute(
+                "SELECT taille FROM memo WHERE cle = ?", (cle,)
+            ).fetchone()
+            if ancienne:
+                self._taille_totale -= ancienne[0]
+
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO memo (cle, donnees, taille, dernier_acces) VALUES (?, ?, ?, ?)",
+                (cle, donnees, len(donnees), time.time())
+            )
+            self._taille_totale += len(donnees)
+
+            if self._taille_totale > self._taille_max:
+                self._evincer()
+
+            self._connexion.commit()
+        except sqlite3.Error:
+            pass
+
+    def _evincer(self) -> None:
+        """Supprime les entrées les moins récemment utilisées jusqu'à respecter la taille maximale."""
+        lignes = self._connexion.execute(
+            "SELECT cle, taille FROM memo ORDER BY dernier_acces"
+        )
+        a_supprimer = []
+        for cle, taille in lignes:
+            if self._taille_totale <= self._taille_max:
+                break
+            a_supprimer.append((cle,))
+            self._taille_totale -= taille
+
+        self._connexion.executemany("DELETE FROM memo WHERE cle = ?", a_supprimer)
+
+    def fermer(self) -> None:
+        """Ferme la base de persistance."""
+        with self._verrou:
+            if self._connexion is not None:
+                self._connexion.close()
+                self._connexion = None
@@ -0,0 +1,204 @@
+# -*- coding: utf-8 -*-
+"""
+Module de détection des pièges de crawl pour RGAA Section 2 Tester
+
+Repère les espaces d'URLs sans fin (calendriers, recherches à facettes,
+identifiants de session dans les chemins) afin qu'ils n'épuisent pas le
+budget de pages du crawl.
+"""
+
+import re
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl
+
+from .utils import UrlCanonique
+
+# Verdicts
+NORMAL = 'normal'
+RETROGRADER = 'retrograder'
+BLOQUER = 'bloquer'
+
+_DATE = re.compile(r'\d{4}-\d{1,2}(?:-\d{1,2})?')
+_IDENTIFIANT = re.compile(r'[0-9a-f]{8,}(?:-[0-9a-f]{4,})*', re.IGNORECASE)
+_NOMBRE = re.compile(r'\d+')
+
+
+def generaliser_segment(segment: str) -> str:
+    """
+    Remplace les parties variables d'un segment de chemin par un joker.
+
+    Args:
+        segment: Segment de chemin (entre deux '/').
+
+    Returns:
+        Segment généralisé : {date}, {id} ou chiffres remplacés par {n}.
+    """
+    if _DATE.fullmatch(segment):
+        return '{date}'
+    if _IDENTIFIANT.fullmatch(segment) and any(c.isdigit() for c in segment):
+        return '{id}'
+    return _NOMBRE.sub('{n}', segment)
+
+
+def motif_url(url: UrlCanonique) -> str:
+    """
+    Calcule le motif d'une URL : hôte, chemin généralisé et noms des paramètres.
+
+    Args:
+        url: URL canonique.
+
+    Returns:
+        Motif (ex: exemple.fr/agenda/{n}/{n}?vue).
+    """
+    segments = [generaliser_segment(segment) for segment in url.chemin.split('/') if segment]
+    motif = f"{url.hote}/{'/'.join(segments)}"
+    if url.requete:
+        noms = sorted({nom for nom, _ in parse_qsl(url.requete, keep_blank_values=True)})
+        motif += '?' + '&'.join(noms)
+    return motif
+
+
+@dataclass
+class MotifSupprime:
+    """Motif d'URLs écarté par la détection des pièges."""
+    motif: str
+    raison: str
+    action: str  # RETROGRADER ou BLOQUER
+    urls_ecartees: int = 0
+
+    def vers_dict(self) -> dict:
+        """Convertit le motif en dictionnaire."""
+        return {
+            'motif': self.motif,
+            'raison': self.raison,
+            'action': self.action,
+            'urls_ecartees': self.urls_ecartees
+        }
+
+
+class DetecteurPieges:
+    """
+    Détecteur de pièges de crawl.
+
+    Les URLs anormalement longues, profondes ou aux segments répétés sont
+    bloquées d'emblée. Les motifs trop fréquents, ou dont un paramètre
+    prend trop de valeurs distinctes, sont rétrogradés (explorés après le
+    reste du site) ou bloqués selon `action`.
+    """
+
+    def __init__(self,
+                 seuil_motif: int = 200,
+                 cardinalite_max: int = 50,
+                 longueur_max: int = 300,
+                 profondeur_max: int = 15,
+                 repetitions_max: int = 3,
+                 action: str = RETROGRADER,
+                 callback_log: Optional[Callable[[str], None]] = None):
+        """
+        Initialise le détecteur.
+
+        Args:
+            seuil_motif: Nombre d'URLs d'un même motif au-delà duquel il est écarté.
+            cardinalite_max: Nombre de valeurs distinctes d'un paramètre au-delà
+                duquel le motif est écarté.
+            longueur_max: Longueur maximale d'une URL.
+            profondeur_max: Nombre maximal de segments de chemin.
+            repetitions_max: Nombre maximal d'occurrences d'un même segment.
+            action: RETROGRADER ou BLOQUER pour les motifs écartés.
+            callback_log: Fonction(message) de journalisation (optionnel).
+        """
+        if action not in (RETROGRADER, BLOQUER):
+            raise ValueError(f"Action inconnue pour les pièges de crawl : {action}")
+
+        self._seuil_motif = max(1, seuil_motif)
+        self._cardinalite_max = max(1, cardinalite_max)
+        self._longueur_max = longueur_max
+        self._profondeur_max = profondeur_max
+        self._repetitions_max = max(1, repetitions_max)
+        self._action = action
+        self._callback_log = callback_log
+
+        self._comptes: Counter = Counter()
+        self._valeurs: Dict[Tuple[str, str], Set[str]] = defaultdict(set)
+        self._supprimes: Dict[str, MotifSupprime] = {}
+
+    def _log(self, message: str) -> None:
+        """Envoie un message de log."""
+        if self._callback_log:
+            self._callback_log(message)
+
+    def _supprimer(self, motif: str, raison: str, action: str) -> MotifSupprime:
+        """Enregistre un motif écarté (une seule fois)."""
+        suppression = self._supprimes.get(motif)
+        if suppression is None:
+            suppression = self._supprimes[motif] = MotifSupprime(motif, raison, action)
+            verbe = "rétrogradé" if action == RETROGRADER else "bloqué"
+            self._log(f"Piège de crawl présumé ({raison}), motif {verbe} : {motif}")
+        return suppression
+
+    def _anomalie_structurelle(self, url: UrlCanonique) -> Optional[str]:
+        """Retourne la raison d'un blocage d'emblée, ou None."""
+        if len(url.url) > self._longueur_max:
+            return f"URL de plus de {self._longueur_max} caractères"
+
+        segments = [segment for segment in url.chemin.split('/') if segment]
+        if len(segments) > self._profondeur_max:
+            return f"chemin de plus de {self._profondeur_max} segments"
+
+        if segments:
+            segment, occurrences = Counter(segments).most_common(1)[0]
+            if occurrences > self._repetitions_max:
+                return f"segment « {segment} » répété {occurrences} fois"
+
+        return None
+
+    def evaluer(self, url: UrlCanonique) -> str:
+        """
+        Évalue une nouvelle URL avant son entrée dans la frontière.
+
+        Args:
+            url: URL canonique, encore inconnue de la frontière.
+
+        Returns:
+            NORMAL, RETROGRADER ou BLOQUER.
+        """
+        motif = motif_url(url)
+
+        raison = self._anomalie_structurelle(url)
+        if raison:
+            self._supprimer(motif, raison, BLOQUER).urls_ecartees += 1
+            return BLOQUER
+
+        suppression = self._supprimes.get(motif)
+        if suppression is None:
+            self._comptes[motif] += 1
+            if self._comptes[motif] > self._seuil_motif:
+                suppression = self._supprimer(
+                    motif, f"plus de {self._seuil_motif} URLs du même motif", self._action
+                )
+
+        if suppression is None and url.requete:
+            for nom, valeur in parse_qsl(url.requete, keep_blank_values=True):
+                valeurs = self._valeurs[(motif, nom)]
+                if len(valeurs) <= self._cardinalite_max:
+                    valeurs.add(valeur)
+                if len(valeurs) > self._cardinalite_max:
+                    suppression = self._supprimer(
+                        motif,
+                        f"plus de {self._cardinalite_max} valeurs pour le paramètre « {nom} »",
+                        self._action
+                    )
+                    break
+
+        if suppression is None:
+            return NORMAL
+
+        suppression.urls_ecartees += 1
+        return suppression.action
+
+    @property
+    def motifs_supprimes(self) -> List[MotifSupprime]:
+        """Retourne les motifs écartés, par nombre décroissant d'URLs écartées."""
+        return sorted(self._supprimes.values(), key=lambda m: (-m.urls_ecartees, m.motif))
@@ -0,0 +1,348 @@
+# -*- coding: utf-8 -*-
+"""
+Module de pipeline crawl -> analyse pour RGAA Section 2 Tester
+
+Enchaîne la récupération et l'analyse des pages en flux : chaque page est
+analysée dès son arrivée puis son HTML est libéré, de sorte que la mémoire
+occupée ne dépend plus du nombre de pages du site.
+
+L'analyse peut être répartie sur plusieurs processus : les pages leur sont
+transmises sous forme d'octets bruts et chaque processus renvoie un
+résultat compact, réintégré dans l'ordre des pages.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Dict, Iterable, Optional, Tuple, Union
+
+from .analyzer import AnalyseurRGAA, ResultatAnalyseGlobal, ResultatPage
+from .cadres import ExplorateurCadres
+from .config import Config
+from .convergence import SuiviConvergence
+from .crawler import PageCrawlee
+from .document import calculer_empreinte, parser_document
+from .reprise import JournalCrawl
+from .sondes import SondeCadres
+from .utils import configurer_normalisation_depuis
+
+# Marqueur de fin de flux
+_FIN = object()
+
+# Analyseur propre à chaque processus d'analyse
+_analyseur_processus: Optional[AnalyseurRGAA] = None
+
+
+def _initialiser_processus(config: Config) -> None:
+    """
+    Crée l'analyseur d'un processus d'analyse.
+
+    Le mémo reste dans le processus principal, qui le consulte avant
+    d'envoyer une page : les processus n'y accèdent pas. Les URLs (sources
+    des cadres) y sont canonicalisées avec les règles du crawler.
+
+    Args:
+        config: Configuration de l'application (copie propre au processus).
+    """
+    global _analyseur_processus
+    configurer_normalisation_depuis(config.crawler_config, avertir=False)
+    config.set("analyse.memo_analyse", False)
+    _analyseur_processus = AnalyseurRGAA(config)
+
+
+def _analyser_en_processus(html: Union[str, bytes], url: str,
+                           encodage: Optional[str], empreinte: str) -> Dict[str, Any]:
+    """
+    Parse et analyse une page dans un processus d'analyse.
+
+    Args:
+        html: Corps brut de la page.
+        url: URL de la page.
+        encodage: Encodage détecté par le crawler (optionnel).
+        empreinte: Empreinte du contenu.
+
+    Returns:
+        Résultat sérialisé (`ResultatPage.vers_dict`).
+    """
+    document = parser_document(html, url, empreinte, encodage)
+    return _analyseur_processus.analyser_page(document, url).vers_dict()
+
+
+class PipelineAnalyse:
+    """
+    Pipeline à deux étages : récupération des pages puis analyse.
+
+    L'étage de récupération s'exécute dans un thread dédié et dépose les
+    pages dans une file bornée ; l'étage d'analyse les consomme dans le
+    thread appelant. Quand l'analyse prend du retard, la file se remplit
+    et la récupération se met en attente (contre-pression).
+
+    Avec un suivi de convergence, la récupération s'arrête dès que les
+    estimations sont assez précises ; les pages déjà récupérées sont
+    tout de même analysées.
+
+    Avec plusieurs processus d'analyse, l'étage d'analyse envoie les pages
+    au pool et publie les résultats dans l'ordre d'arrivée des pages ; au
+    plus `2 × processus` pages sont en cours d'analyse.
+
+    Avec un explorateur de cadres, les documents chargés par les cadres de
+    chaque page sont analysés avant la publication de son résultat ; avec
+    une sonde, les sources de ses cadres sont ensuite sondées.
+    """
+
+    def __init__(self, analyseur: AnalyseurRGAA, taille_file: int = 8, processus: int = 1):
+        """
+        Initialise le pipeline.
+
+        Args:
+            analyseur: Analyseur RGAA utilisé pour chaque page (et pour le mémo).
+            taille_file: Nombre maximum de pages en attente d'analyse.
+            processus: Nombre de processus d'analyse (1 : analyse dans le
+                thread appelant, 0 : un par cœur).
+        """
+        self._analyseur = analyseur
+        self._taille_file = max(1, taille_file)
+        self._processus = processus if processus > 0 else (os.cpu_count() or 1)
+        self._arreter = threading.Event()
+        self._fin_production = threading.Event()
+
+    def arreter(self) -> None:
+        """Demande l'arrêt du pipeline."""
+        self._arreter.set()
+
+    def executer(self,
+                 pages: Iterable[PageCrawlee],
+                 resultat: ResultatAnalyseGlobal,
+                 callback_page: Optional[Callable[[PageCrawlee, ResultatPage], None]] = None,
+                 suivi: Optional[SuiviConvergence] = None,
+                 journal: Optional[JournalCrawl] = None,
+                 explorateur: Optional[ExplorateurCadres] = None,
+                 sonde: Optional[SondeCadres] = None
+                 ) -> ResultatAnalyseGlobal:
+        """
+        Analyse les pages au fur et à mesure qu'elles sont produites.
+
+        Args:
+            pages: Source des pages (typiquement Crawler.iterer_pages).
+            resultat: Résultat global à compléter, dans l'ordre des pages.
+            callback_page: Fonction(page, resultat_page) appelée après chaque analyse.
+            suivi: Suivi de convergence pour l'arrêt statistique (optionnel).
+            journal: Journal de reprise recevant le résultat de chaque page (optionnel).
+            explorateur: Explorateur des cadres imbriqués (optionnel).
+            sonde: Sonde des sources de cadres (optionnel).
+
+        Returns:
+            Le résultat global complété (statistiques non calculées).
+        """
+        self._arreter.clear()
+        self._fin_production.clear()
+        file_pages: "queue.Queue" = queue.Queue(maxsize=self._taille_file)
+        if suivi:
+            # Pages déjà analysées avant une reprise
+            for resultat_page in resultat.pages:
+                if suivi.ajouter(resultat_page):
+                    self._fin_production.set()
+        erreurs = []
+
+        producteur = threading.Thread(
+            target=self._produire,
+            args=(pages, file_pages, erreurs),
+            name="rgaa-pipeline",
+            daemon=True
+        )
+        producteur.start()
+
+        def publier(page: PageCrawlee, resultat_page: ResultatPage) -> None:
+            if explorateur:
+                explorateur.explorer(resultat_page)
+            if sonde:
+                sonde.sonder(resultat_page)
+
+            resultat.pages.append(resultat_page)
+            if journal:
+                journal.enregistrer_page(resultat_page, page.alias)
+
+            if suivi and suivi.ajouter(resultat_page):
+                self._fin_production.set()
+
+            if callback_page:
+                callback_page(page, resultat_page)
+
+        try:
+            if self._processus > 1:
+                self._analyser_en_parallele(file_pages, publier)
+            else:
+                self._analyser(file_pages, publier)
+        finally:
+            # Vider la file pour débloquer le producteur s'il attend une place
+            self._arreter.set()
+            while producteur.is_alive():
+                try:
+                    file_pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producteur.join()
+            if journal:
+                journal.sauvegarder()
+
+        if erreurs:
+            raise erreurs[0]
+
+        if suivi:
+            resultat.convergence = suivi.vers_dict()
+            if suivi.converge:
+                resultat.raison_arret = suivi.raison
+
+        return resultat
+
+    def _analyser(self, file_pages: "queue.Queue",
+                  publier: Callable[[PageCrawlee, ResultatPage], None]) -> None:
+        """
+        Étage d'analyse dans le thread appelant.
+
+        Args:
+            file_pages: File alimentée par l'étage de récupération.
+            publier: Fonction(page, resultat_page) appelée dans l'ordre des pages.
+        """
+        while True:
+            page = file_pages.get()
+            if page is _FIN:
+                break
+            if self._arreter.is_set():
+                continue
+
+            if page.html:
+                publier(page, self._analyseur.analyser_page(page.document or page.html, page.url))
+
+            # Libérer le contenu dès que la page est analysée
+            page.html = ""
+            page.document = None
+
+    def _analyser_en_parallele(self, file_pages: "queue.Queue",
+                               publier: Callable[[PageCrawlee, ResultatPage], None]) -> None:
+        """
+        Étage d'analyse réparti sur un pool de processus.
+
+        Args:
+            file_pages: File alimentée par l'étage de récupération.
+            publier: Fonction(page, resultat_page) appelée dans l'ordre des pages.
+        """
+        memo = self._analyseur.memo
+        en_cours: Deque[Tuple[PageCrawlee, str, Future, bool]] = deque()
+        soumises: Dict[str, Future] = {}  # Analyses en cours par empreinte
+        limite = 2 * self._processus
+
+        def recevoir() -> None:
+            page, empreinte, future, partagee = en_cours.popleft()
+            if partagee:
+                # Même contenu qu'une page précédente, déjà publiée : servi par le mémo
+                resultat_page = memo.obtenir(empreinte, page.url)
+            else:
+                resultat_page = future.result()
+                if isinstance(resultat_page, dict):
+                    resultat_page = ResultatPage.depuis_dict(resultat_page)
+                    if memo is not None:
+                        memo.enregistrer(empreinte, resultat_page)
+                    if soumises.get(empreinte) is future:
+                        del soumises[empreinte]
+            publier(page, resultat_page)
+
+        # 'spawn' : le processus principal exécute déjà des threads (crawl)
+        pool = ProcessPoolExecutor(
+            max_workers=self._processus,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_initialiser_processus,
+            initargs=(self._analyseur.config,)
+        )
+        try:
+            while True:
+                page = file_pages.get()
+                if page is _FIN:
+                    break
+                if self._arreter.is_set():
+                    continue
+
+                if page.html:
+                    document = page.document
+                    empreinte = document.empreinte if document else calculer_empreinte(page.html)
+
+                    # Contenu inchangé, déjà analysé ou en cours d'analyse : pas d'envoi au pool
+                    resultat_page = None
+                    if empreinte not in soumises:
+                        resultat_page = self._analyseur.resultat_connu(empreinte, page.url)
+                    if resultat_page is not None:
+                        future = Future()
+                        future.set_result(resultat_page)
+                        en_cours.append((page, empreinte, future, False))
+                    elif empreinte in soumises:
+                        en_cours.append((page, empreinte, soumises[empreinte], True))
+                    else:
+                        future = pool.submit(
+                            _analyser_en_processus, page.html, page.url,
+                            document.encodage if document else None, empreinte
+                        )
+                        if memo is not None:
+                            soumises[empreinte] = future
+                        en_cours.append((page, empreinte, future, False))
+
+                # Le pool a sa copie du contenu : libérer celui de la page
+                page.html = ""
+                page.document = None
+
+                while en_cours and (len(en_cours) >= limite or en_cours[0][2].done()):
+                    recevoir()
+
+            while en_cours and not self._arreter.is_set():
+                recevoir()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _produire(self, pages: Iterable[PageCrawlee], file_pages: "queue.Queue", erreurs: list) -> None:
+        """
+        Étage de récupération : dépose les pages dans la file bornée.
+
+        Args:
+            pages: Source des pages.
+            file_pages: File vers l'étage d'analyse.
+            erreurs: Liste recevant l'éventuelle exception du producteur.
+        """
+        iterateur = iter(pages)
+        try:
+            for page in iterateur:
+                if self._fin_production.is_set() or not self._deposer(file_pages, page):
+                    break
+        except Exception as e:
+            erreurs.append(e)
+        finally:
+            # Fermer le générateur du crawler (arrêt anticipé) avant de signaler la fin
+            try:
+                close = getattr(iterateur, 'close', None)
+                if close:
+                    close()
+            except Exception as e:
+                erreurs.append(e)
+            finally:
+                self._deposer(file_pages, _FIN, forcer=True)
+
+    def _deposer(self, file_pages: "queue.Queue", element, forcer: bool = False) -> bool:
+        """
+        Dépose un élément dans la file en attendant qu'une place se libère.
+
+        Args:
+            file_pages: File vers l'étage d'analyse.
+            element: Page ou marqueur de fin.
+            forcer: Si True, dépose même après une demande d'arrêt.
+
+        Returns:
+            True si l'élément a été déposé.
+        """
+        while forcer or not self._arreter.is_set():
+            try:
+                file_pages.put(element, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
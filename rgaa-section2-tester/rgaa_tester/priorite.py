@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Module de priorisation des pages à cadres pour RGAA Section 2 Tester
+
+Estime, pour chaque URL découverte, la probabilité que la page contienne
+des cadres, afin que la frontière récupère d'abord les pages les plus
+prometteuses quand la limite de pages est très inférieure à la taille du
+site. L'estimation combine le gabarit de l'URL (pages du même gabarit déjà
+récupérées avec ou sans cadres), la densité de cadres de la page où le
+lien a été trouvé et des mots du chemin (/video, /carte, /formulaire...).
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .echantillonnage import gabarit_url
+from .utils import analyser_url
+
+# Mots du chemin annonçant souvent un contenu intégré (lecteur, carte, formulaire tiers)
+MOTS_CLES_CADRES = (
+    "video", "videos", "carte", "cartes", "plan", "formulaire", "formulaires",
+    "contact", "inscription", "map", "maps", "embed", "player", "lecteur",
+    "widget", "podcast", "agenda", "localisation", "acces"
+)
+
+_SEPARATEURS = re.compile(r'[/\-_.]+')
+
+# Nombre de cadres de la page parente au-delà duquel le signal est saturé
+_CADRES_PARENT_MAX = 4
+
+
+class EstimateurCadres:
+    """
+    Estimateur de présence de cadres par URL.
+
+    La priorité d'une URL est la proportion (lissée) de pages de son
+    gabarit ayant des cadres, augmentée de 0,5 au plus selon la densité de
+    cadres de la page parente et de 0,5 si un mot du chemin annonce un
+    contenu intégré. La proportion évolue au fil du crawl : `reevaluer`
+    donne la priorité actuelle d'une URL découverte plus tôt.
+
+    L'estimateur retient aussi l'ordre de découverte des premières URLs :
+    un parcours en largeur d'abord les aurait récupérées dans cet ordre, ce
+    qui permet d'estimer le nombre de cadres qu'il aurait trouvés.
+    """
+
+    def __init__(self, max_pages: int, mots_cles: Iterable[str] = MOTS_CLES_CADRES):
+        """
+        Initialise l'estimateur.
+
+        Args:
+            max_pages: Limite de pages du crawl (URLs dont l'ordre de découverte est retenu).
+            mots_cles: Mots du chemin annonçant des cadres.
+        """
+        self._max_pages = max_pages
+        self._mots_cles = frozenset(mot.lower() for mot in mots_cles)
+        self._pages: Counter = Counter()  # Pages récupérées par gabarit
+        self._avec_cadres: Counter = Counter()  # Dont pages avec au moins un cadre
+        self._cadres: Counter = Counter()  # Cadres trouvés par gabarit
+        self._decouvertes: List[Tuple[str, str]] = []  # (url, gabarit), ordre de découverte
+        self._cadres_par_url: Dict[str, int] = {}
+        # URL en attente -> (gabarit, part de la priorité fixée à la découverte)
+        self._en_attente: Dict[str, Tuple[str, float]] = {}
+
+    def priorite(self, url: str, cadres_parent: int = 0) -> float:
+        """
+        Calcule la priorité d'une URL découverte et retient son ordre de découverte.
+
+        Args:
+            url: URL normalisée.
+            cadres_parent: Nombre de cadres de la page où le lien a été trouvé.
+
+        Returns:
+            Priorité (plus élevée = récupérée plus tôt).
+        """
+        composants = analyser_url(url)
+        gabarit = gabarit_url(composants)
+        if len(self._decouvertes) < self._max_pages:
+            self._decouvertes.append((url, gabarit))
+
+        bonus = 0.5 * min(cadres_parent, _CADRES_PARENT_MAX) / _CADRES_PARENT_MAX
+        mots = _SEPARATEURS.split(composants.chemin.lower())
+        if any(mot in self._mots_cles for mot in mots):
+            bonus += 0.5
+        self._en_attente[url] = (gabarit, bonus)
+        return self._proportion(gabarit) + bonus
+
+    def reevaluer(self, url: str) -> float:
+        """
+        Calcule la priorité actuelle d'une URL en attente.
+
+        Args:
+            url: URL normalisée.
+
+        Returns:
+            Priorité tenant compte des pages récupérées depuis la découverte
+            (URL inconnue, par exemple restaurée d'un journal : gabarit seul).
+        """
+        gabarit, bonus = self._en_attente.get(url) or (gabarit_url(analyser_url(url)), 0.0)
+        return self._proportion(gabarit) + bonus
+
+    def _proportion(self, gabarit: str) -> float:
+        """Proportion lissée (Laplace) des pages du gabarit ayant des cadres."""
+        return (self._avec_cadres[gabarit] + 1) / (self._pages[gabarit] + 2)
+
+    def observer(self, url: str, nombre_cadres: int) -> None:
+        """
+        Enregistre le nombre de cadres d'une page récupérée.
+
+        Args:
+            url: URL normalisée de la page.
+            nombre_cadres: Nombre de cadres (iframe et frame) de la page.
+        """
+        entree = self._en_attente.pop(url, None)
+        gabarit = entree[0] if entree else gabarit_url(analyser_url(url))
+        self._pages[gabarit] += 1
+        self._cadres[gabarit] += nombre_cadres
+        if nombre_cadres:
+            self._avec_cadres[gabarit] += 1
+        self._cadres_par_url[url] = nombre_cadres
+
+    def comparaison(self) -> Dict[str, Any]:
+        """
+        Compare le rendement du crawl priorisé à celui d'un parcours en largeur.
+
+        Le parcours en largeur est estimé sur le même nombre de pages : les
+        premières URLs dans l'ordre de découverte, avec leur nombre réel de
+        cadres si elles ont été récupérées, sinon le nombre moyen de cadres
+        par page de leur gabarit (ou du crawl si le gabarit n'a pas été vu).
+
+        Returns:
+            Dictionnaire : pages, cadres, cadres_par_page, cadres_par_page_largeur
+            (estimation), pages_communes (récupérées par les deux parcours).
+        """
+        pages = len(self._cadres_par_url)
+        cadres = sum(self._cadres_par_url.values())
+        moyenne = cadres / pages if pages else 0.0
+
+        cadres_largeur = 0.0
+        communes = 0
+        premieres = self._decouvertes[:pages]
+        for url, gabarit in premieres:
+            nombre: Optional[int] = self._cadres_par_url.get(url)
+            if nombre is not None:
+                communes += 1
+                cadres_largeur += nombre
+            elif self._pages[gabarit]:
+                cadres_largeur += self._cadres[gabarit] / self._pages[gabarit]
+            else:
+                cadres_largeur += moyenne
+
+        return {
+            'pages': pages,
+            'cadres': cadres,
+            'cadres_par_page': round(moyenne, 2),
+            'cadres_par_page_largeur': round(cadres_largeur / len(premieres), 2) if premieres else 0.0,
+            'pages_communes': communes,
+        }
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Module de régulation par hôte pour RGAA Section 2 Tester
+
+Adapte à chaque hôte le nombre de requêtes simultanées et le délai entre
+requêtes selon les temps de réponse et les erreurs observés : un CDN
+rapide est parcouru au plafond configuré, une origine fragile est
+ralentie dès qu'elle sature (429, 503, latence en hausse, timeouts). Un
+disjoncteur suspend les requêtes vers un hôte après des échecs répétés.
+"""
+
+import email.utils
+import heapq
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+# Issues d'une requête
+SUCCES = 'succes'
+SATURATION = 'saturation'  # 429 ou 503 : l'hôte demande de ralentir
+ECHEC = 'echec'  # Timeout, erreur de connexion, 502 ou 504
+
+# États du disjoncteur
+FERME = 'ferme'
+OUVERT = 'ouvert'
+SEMI_OUVERT = 'semi_ouvert'  # Une requête d'essai décide de la fermeture
+
+# Latence moyenne en deçà de laquelle une hausse n'indique pas une saturation
+_LATENCE_NEGLIGEABLE = 0.05
+
+
+def lire_retry_after(valeur: Optional[str]) -> Optional[float]:
+    """
+    Interprète un en-tête Retry-After.
+
+    Args:
+        valeur: Valeur de l'en-tête (secondes ou date HTTP).
+
+    Returns:
+        Attente demandée en secondes, ou None si absente ou invalide.
+    """
+    if not valeur:
+        return None
+    valeur = valeur.strip()
+    if valeur.isdigit():
+        return float(valeur)
+    try:
+        date = email.utils.parsedate_to_datetime(valeur)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    return max(0.0, date.timestamp() - time.time())
+
+
+class RegulateurHote:
+    """
+    Régulateur des requêtes vers un hôte.
+
+    Les requêtes occupent des créneaux : chaque créneau n'est réutilisable
+    qu'après le délai qui suit la requête précédente. Le nombre de créneaux
+    et le délai suivent une loi additive/multiplicative : une requête
+    rapide ajoute 1/N créneau et réduit le délai de 25 %, une latence
+    au-delà de `seuil_latence` fois la meilleure latence retire 25 % des
+    créneaux et allonge le délai de 25 %, un 429/503 ou un échec retire
+    la moitié des créneaux et allonge le délai de 50 %. Les ralentissements
+    sont appliqués au plus une fois par temps de réponse (ou par délai),
+    une même saturation touchant souvent plusieurs requêtes simultanées.
+    Un Retry-After suspend l'hôte pendant la durée demandée.
+
+    Après `seuil_disjoncteur` échecs consécutifs, le disjoncteur s'ouvre :
+    les requêtes sont refusées pendant `duree_disjoncteur`, puis une
+    requête d'essai le referme ou le rouvre.
+    """
+
+    def __init__(self,
+                 en_vol_min: int,
+                 en_vol_max: int,
+                 delai: float,
+                 delai_min: Optional[float],
+                 delai_max: float,
+                 adaptatif: bool = True,
+                 seuil_latence: float = 2.0,
+                 intervalle_min: float = 0.0,
+                 seuil_disjoncteur: int = 5,
+                 duree_disjoncteur: float = 60.0):
+        """
+        Initialise le régulateur.
+
+        Args:
+            en_vol_min: Plancher de requêtes simultanées.
+            en_vol_max: Plafond de requêtes simultanées.
+            delai: Délai initial (secondes) entre deux requêtes d'un même créneau.
+            delai_min: Plancher du délai (au plus le délai initial) ; None pour
+                ne jamais descendre sous le délai initial.
+            delai_max: Plafond du délai.
+            adaptatif: Si False, créneaux et délai restent fixes (Retry-After
+                et disjoncteur restent appliqués).
+            seuil_latence: Rapport à la meilleure latence au-delà duquel l'hôte
+                est considéré comme saturé.
+            intervalle_min: Intervalle minimal entre deux requêtes vers l'hôte,
+                tous créneaux confondus (Crawl-delay du robots.txt).
+            seuil_disjoncteur: Échecs consécutifs avant ouverture (0 : jamais).
+            duree_disjoncteur: Durée d'ouverture du disjoncteur (secondes).
+        """
+        self._en_vol_max = max(1, en_vol_max)
+        self._en_vol_min = max(1, min(en_vol_min, self._en_vol_max))
+        self._adaptatif = adaptatif
+        # Le délai configuré reste admis même s'il est inférieur au plancher
+        self._delai_min = delai if delai_min is None else min(delai_min, delai)
+        self._delai_max = max(delai_max, self._delai_min)
+        self._seuil_latence = seuil_latence
+        self._intervalle_min = intervalle_min
+        self._seuil_disjoncteur = seuil_disjoncteur
+        self._duree_disjoncteur = duree_disjoncteur
+        self._condition = threading.Condition()
+
+        # Démarrage prudent : plancher de créneaux si la régulation est adaptative
+        self._limite = float(self._en_vol_min if adaptatif else self._en_vol_max)
+        self._creneaux_total = int(self._limite)
+        # Instants à partir desquels chaque créneau libre est réutilisable
+        self._creneaux: List[float] = [0.0] * self._creneaux_total
+        self.delai = self._borner_delai(delai)
+        self._pause_jusqua = 0.0
+
+        # Latences observées
+        self.latence_moyenne = 0.0
+        self._latence_min: Optional[float] = None
+        self._derniere_baisse = 0.0
+
+        # Disjoncteur
+        self.etat_disjoncteur = FERME
+        self._echecs_consecutifs = 0
+        self._reouverture = 0.0
+        self._essai_en_cours = False
+
+        # Compteurs
+        self.requetes = 0
+        self.saturations = 0
+        self.echecs = 0
+        self.disjonctions = 0
+        self.refus = 0
+
+    @property
+    def requetes_simultanees(self) -> int:
+        """Nombre courant de requêtes simultanées autorisées."""
+        return self._creneaux_total
+
+    def _borner_delai(self, delai: float) -> float:
+        """Borne le délai ; le Crawl-delay s'applique à l'ensemble des créneaux."""
+        plancher = max(self._delai_min, self._intervalle_min * self._creneaux_total)
+        return min(max(delai, plancher), max(self._delai_max, plancher))
+
+    def acquerir(self) -> bool:
+        """
+        Réserve un créneau (bloquant) et attend la fin de son délai.
+
+        Returns:
+            False si le disjoncteur refuse la requête (aucun créneau réservé).
+        """
+        with self._condition:
+            if self.etat_disjoncteur != FERME:
+                maintenant = time.monotonic()
+                if self.etat_disjoncteur == OUVERT and maintenant >= self._reouverture:
+                    self.etat_disjoncteur = SEMI_OUVERT
+                if self.etat_disjoncteur == OUVERT or self._essai_en_cours:
+                    self.refus += 1
+                    return False
+                self._essai_en_cours = True
+
+            while not self._creneaux:
+                self._condition.wait()
+            disponible_a = max(heapq.heappop(self._creneaux), self._pause_jusqua)
+            self.requetes += 1
+
+        attente = disponible_a - time.monotonic()
+        if attente > 0:
+            time.sleep(attente)
+        return True
+
+    def liberer(self, issue: str, latence: Optional[float] = None,
+                retry_after: Optional[float] = None) -> None:
+        """
+        Libère le créneau et adapte la régulation à l'issue de la requête.
+
+        Args:
+            issue: SUCCES, SATURATION ou ECHEC.
+            latence: Temps de réponse (secondes) d'une requête réussie.
+            retry_after: Attente demandée par l'hôte (secondes, optionnel).
+        """
+        with self._condition:
+            maintenant = time.monotonic()
+            self._essai_en_cours = False
+
+            if issue == SUCCES:
+                self._echecs_consecutifs = 0
+                self.etat_disjoncteur = FERME
+                if latence is not None:
+                    self._observer_latence(latence, maintenant)
+            elif issue == SATURATION:
+                self.saturations += 1
+                if retry_after:
+                    self._pause_jusqua = max(self._pause_jusqua, maintenant + retry_after)
+                self._ralentir(0.5, 1.5, maintenant)
+            else:
+                self.echecs += 1
+                self._echecs_consecutifs += 1
+                self._ralentir(0.5, 1.5, maintenant)
+                if self.etat_disjoncteur == SEMI_OUVERT or (
+                        self._seuil_disjoncteur and self._echecs_consecutifs >= self._seuil_disjoncteur):
+                    if self.etat_disjoncteur != OUVERT:
+                        self.disjonctions += 1
+                    self.etat_disjoncteur = OUVERT
+                    self._reouverture = maintenant + self._duree_disjoncteur
+
+            self._ajuster_creneaux(maintenant)
+            self._condition.notify_all()
+
+    def _observer_latence(self, latence: float, maintenant: float) -> None:
+        """Met à jour les latences et accélère ou ralentit selon leur évolution."""
+        self.latence_moyenne = (
+            latence if self.latence_moyenne == 0.0 else 0.8 * self.latence_moyenne + 0.2 * latence
+        )
+        if self._latence_min is None or latence < self._latence_min:
+            self._latence_min = latence
+
+        if not self._adaptatif:
+            return
+        if (self.latence_moyenne > _LATENCE_NEGLIGEABLE
+                and self.latence_moyenne > self._seuil_latence * self._latence_min):
+            self._ralentir(0.75, 1.25, maintenant)
+        else:
+            self._limite = min(self._en_vol_max, self._limite + 1.0 / self._limite)
+            self.delai = self._borner_delai(self.delai * 0.75)
+
+    def _ralentir(self, facteur_creneaux: float, facteur_delai: float, maintenant: float) -> None:
+        """Réduit les créneaux et allonge le délai, au plus une fois par temps de réponse."""
+        if not self._adaptatif or maintenant - self._derniere_baisse < max(self.latence_moyenne, self.delai):
+            return
+        self._derniere_baisse = maintenant
+        self._limite = max(self._en_vol_min, self._limite * facteur_creneaux)
+        # Un délai nul ne peut pas être allongé multiplicativement
+        self.delai = self._borner_delai(max(self.delai, 0.1) * facteur_delai)
+
+    def _ajuster_creneaux(self, maintenant: float) -> None:
+        """Remet en circulation le créneau libéré, en ajoute ou en retire selon la limite."""
+        cible = int(self._limite)
+        if self._creneaux_total > cible:
+            # Le créneau libéré est retiré
+            self._creneaux_total -= 1
+        else:
+            heapq.heappush(self._creneaux, maintenant + self.delai)
+            while self._creneaux_total < cible:
+                self._creneaux_total += 1
+                heapq.heappush(self._creneaux, maintenant + self.delai)
+        self.delai = self._borner_delai(self.delai)
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Retourne l'état de la régulation (statistiques du crawl)."""
+        with self._condition:
+            return {
+                'requetes_simultanees': self._creneaux_total,
+                'delai': round(self.delai, 3),
+                'latence_moyenne': round(self.latence_moyenne, 3),
+                'requetes': self.requetes,
+                'saturations': self.saturations,
+                'echecs': self.echecs,
+                'disjonctions': self.disjonctions,
+                'refus_disjoncteur': self.refus,
+                'disjoncteur': self.etat_disjoncteur,
+            }
@@ -0,0 +1,415 @@
+# -*- coding: utf-8 -*-
+"""
+Module de crawl réparti pour RGAA Section 2 Tester
+
+Répartit le crawl d'un site entre N partitions (processus locaux ou hôtes
+partageant un dossier). Chaque partition possède une part de l'espace des
+URLs, déterminée par hachage ; les URLs découvertes qui appartiennent à une
+autre partition lui sont transmises par une file SQLite commune. Chaque
+partition écrit ses résultats partiels, fusionnés ensuite en un seul
+résultat global.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Set, Tuple
+
+from .analyzer import ResultatAnalyseGlobal, ResultatPage
+from .utils import formater_date
+
+FICHIER_ECHANGES = "echanges.sqlite"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS partitions ("
+    " numero INTEGER PRIMARY KEY,"
+    " etat TEXT NOT NULL,"  # 'actif', 'inactif', 'termine' ou 'perdu'
+    " envoyees INTEGER NOT NULL DEFAULT 0,"
+    " recues INTEGER NOT NULL DEFAULT 0,"
+    " maj REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS transferts ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+    " destinataire INTEGER NOT NULL,"
+    " url TEXT NOT NULL,"
+    " profondeur INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS transferts_destinataire ON transferts (destinataire, id)",
+    "CREATE TABLE IF NOT EXISTS limite ("
+    " id INTEGER PRIMARY KEY CHECK (id = 0),"
+    " max_pages INTEGER NOT NULL,"
+    " pages INTEGER NOT NULL)",
+)
+
+
+def partition_url(url: str, nombre: int) -> int:
+    """
+    Retourne la partition propriétaire d'une URL.
+
+    Args:
+        url: URL normalisée.
+        nombre: Nombre de partitions.
+
+    Returns:
+        Numéro de partition (0 à nombre - 1).
+    """
+    empreinte = hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(empreinte, 'big') % nombre
+
+
+class Repartiteur:
+    """
+    Partition d'un crawl réparti.
+
+    Les URLs à transmettre sont regroupées par lots. Le crawl global est
+    terminé lorsque toutes les partitions sont inactives (ou terminées) et
+    qu'aucune URL n'attend une partition encore en cours : une partition
+    inactive ne redevient active qu'en recevant des URLs, et elle envoie
+    les siennes avant de se déclarer inactive.
+
+    La limite de pages est commune à toutes les partitions.
+
+    Un thread signale régulièrement que la partition est en vie. Une
+    partition sans signe de vie depuis `expiration` secondes (processus
+    tué, hôte perdu), ou qui ne s'est jamais déclarée, est considérée
+    comme perdue : les URLs qui l'attendent sont abandonnées et le crawl
+    global peut se terminer sans elle.
+    """
+
+    def __init__(self, dossier: str, numero: int, nombre: int, max_pages: int,
+                 taille_lot: int = 200, expiration: float = 120.0):
+        """
+        Rejoint le crawl réparti décrit par un dossier partagé.
+
+        Args:
+            dossier: Dossier partagé (file d'échange et résultats partiels).
+            numero: Numéro de cette partition (0 à nombre - 1).
+            nombre: Nombre total de partitions.
+            max_pages: Nombre maximum de pages, toutes partitions confondues.
+            taille_lot: Nombre d'URLs transmises par écriture.
+            expiration: Secondes sans signe de vie au-delà desquelles une
+                partition est considérée comme perdue.
+
+        Raises:
+            ValueError: Si le numéro de partition est invalide.
+        """
+        if not 0 <= numero < nombre:
+            raise ValueError(f"Partition invalide : {numero}/{nombre}")
+
+        self.numero = numero
+        self.nombre = nombre
+        self._taille_lot = max(1, taille_lot)
+        self._sortantes: List[Tuple[int, str, int]] = []
+        self._expiration = max(1.0, expiration)
+        self._debut = time.time()
+
+        Path(dossier).mkdir(parents=True, exist_ok=True)
+        # Transactions explicites (BEGIN IMMEDIATE) ; pas de WAL, inutilisable
+        # sur un système de fichiers réseau
+        self._fichier = str(Path(dossier) / FICHIER_ECHANGES)
+        self._connexion = sqlite3.connect(
+            self._fichier, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        with self._transaction() as curseur:
+            for instruction in _SCHEMA:
+                curseur.execute(instruction)
+            curseur.execute(
+                "INSERT OR IGNORE INTO limite (id, max_pages, pages) VALUES (0, ?, 0)", (max_pages,)
+            )
+            curseur.execute(
+                "INSERT OR REPLACE INTO partitions (numero, etat, maj) VALUES (?, 'actif', ?)",
+                (numero, time.time())
+            )
+
+        # Compteurs
+        self.urls_transmises = 0
+        self.urls_recues = 0
+        self.partitions_perdues: Set[int] = set()  # Numéros (à partir de 0)
+        self.urls_abandonnees = 0  # URLs qui attendaient une partition perdue
+
+        self._arret_signal = threading.Event()
+        self._signal = threading.Thread(target=self._signaler, name="rgaa-partition", daemon=True)
+        self._signal.start()
+
+    def _signaler(self) -> None:
+        """Signale périodiquement que la partition est en vie (thread dédié)."""
+        connexion = sqlite3.connect(self._fichier, timeout=60, isolation_level=None)
+        try:
+            while not self._arret_signal.wait(self._expiration / 4):
+                try:
+                    connexion.execute(
+                        "UPDATE partitions SET maj = ? WHERE numero = ?", (time.time(), self.numero)
+                    )
+                except sqlite3.Error:
+                    pass
+        finally:
+            connexion.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction en écriture (verrou pris immédiatement), validée en sortie de bloc."""
+        self._connexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield self._connexion
+        except BaseException:
+            self._connexion.execute("ROLLBACK")
+            raise
+        self._connexion.execute("COMMIT")
+
+    def est_locale(self, url: str) -> bool:
+        """Indique si une URL appartient à cette partition."""
+        return partition_url(url, self.nombre) == self.numero
+
+    def transmettre(self, url: str, profondeur: int) -> None:
+        """
+        Transmet une URL à sa partition propriétaire (par lots).
+
+        Args:
+            url: URL normalisée appartenant à une autre partition.
+            profondeur: Profondeur de l'URL.
+        """
+        self._sortantes.append((partition_url(url, self.nombre), url, profondeur))
+        if len(self._sortantes) >= self._taille_lot:
+            self.envoyer()
+
+    def envoyer(self) -> None:
+        """Écrit les URLs en attente de transmission."""
+        if not self._sortantes:
+            return
+        sortantes, self._sortantes = self._sortantes, []
+        with self._transaction() as curseur:
+            curseur.executemany(
+                "INSERT INTO transferts (destinataire, url, profondeur) VALUES (?, ?, ?)", sortantes
+            )
+            curseur.execute(
+                "UPDATE partitions SET envoyees = envoyees + ?, maj = ? WHERE numero = ?",
+                (len(sortantes), time.time(), self.numero)
+            )
+        self.urls_transmises += len(sortantes)
+
+    def recevoir(self) -> List[Tuple[str, int]]:
+        """
+        Retire les URLs transmises à cette partition.
+
+        Returns:
+            Liste de (url, profondeur), dans l'ordre d'envoi.
+        """
+        self.envoyer()
+        with self._transaction() as curseur:
+            lignes = curseur.execute(
+                "SELECT id, url, profondeur FROM transferts WHERE destinataire = ? ORDER BY id",
+                (self.numero,)
+            ).fetchall()
+            if lignes:
+                curseur.execute(
+                    "DELETE FROM transferts WHERE destinataire = ? AND id <= ?",
+                    (self.numero, lignes[-1][0])
+                )
+                curseur.execute(
+                    "UPDATE partitions SET etat = 'actif', recues = recues + ?, maj = ? WHERE numero = ?",
+                    (len(lignes), time.time(), self.numero)
+                )
+        self.urls_recues += len(lignes)
+        return [(url, profondeur) for _, url, profondeur in lignes]
+
+    def verifier_fin(self) -> bool:
+        """
+        Déclare la partition inactive et indique si le crawl global est terminé.
+
+        À appeler lorsque la frontière locale est vide.
+
+        Returns:
+            True si plus aucune partition n'a de travail en cours ou à venir.
+        """
+        self.envoyer()
+        with self._transaction() as curseur:
+            en_attente = curseur.execute(
+                "SELECT COUNT(*) FROM transferts WHERE destinataire = ?", (self.numero,)
+            ).fetchone()[0]
+            if en_attente:
+                return False
+
+            maintenant = time.time()
+            curseur.execute(
+                "UPDATE partitions SET etat = 'inactif', maj = ? WHERE numero = ? AND etat != 'termine'",
+                (maintenant, self.numero)
+            )
+
+            # Partitions sans signe de vie, ou jamais déclarées passé le délai
+            limite = maintenant - self._expiration
+            curseur.execute(
+                "UPDATE partitions SET etat = 'perdu' WHERE etat IN ('actif', 'inactif') AND maj < ?",
+                (limite,)
+            )
+            etats = dict(curseur.execute("SELECT numero, etat FROM partitions").fetchall())
+            if len(etats) < self.nombre:
+                if self._debut > limite:
+                    return False
+                for numero in set(range(self.nombre)) - set(etats):
+                    curseur.execute(
+                        "INSERT INTO partitions (numero, etat, maj) VALUES (?, 'perdu', ?)", (numero, maintenant)
+                    )
+                    etats[numero] = 'perdu'
+
+            # Les URLs qui attendaient une partition perdue sont abandonnées
+            for numero, etat in etats.items():
+                if etat == 'perdu':
+                    self.partitions_perdues.add(numero)
+                    self.urls_abandonnees += curseur.execute(
+                        "DELETE FROM transferts WHERE destinataire = ?", (numero,)
+                    ).rowcount
+
+            if 'actif' in etats.values():
+                return False
+
+            # URLs destinées à des partitions encore susceptibles de les traiter
+            return curseur.execute(
+                "SELECT COUNT(*) FROM transferts t JOIN partitions p ON p.numero = t.destinataire"
+                " WHERE p.etat != 'termine'"
+            ).fetchone()[0] == 0
+
+    def reserver_page(self) -> bool:
+        """
+        Réserve une page dans la limite commune.
+
+        Returns:
+            True si la limite n'est pas atteinte.
+        """
+        with self._transaction() as curseur:
+            return curseur.execute(
+                "UPDATE limite SET pages = pages + 1 WHERE id = 0 AND pages < max_pages"
+            ).rowcount == 1
+
+    def terminer(self) -> None:
+        """Envoie les dernières URLs et déclare la partition terminée."""
+        self.envoyer()
+        with self._transaction() as curseur:
+            curseur.execute(
+                "UPDATE partitions SET etat = 'termine', maj = ? WHERE numero = ?",
+                (time.time(), self.numero)
+            )
+
+    def fermer(self) -> None:
+        """Arrête le signal de vie et ferme la connexion à la file d'échange."""
+        self._arret_signal.set()
+        self._signal.join()
+        self._connexion.close()
+
+
+def ecrire_partiel(dossier: str, numero: int, resultat: ResultatAnalyseGlobal) -> str:
+    """
+    Écrit les résultats partiels d'une partition.
+
+    Args:
+        dossier: Dossier partagé.
+        numero: Numéro de la partition.
+        resultat: Résultat de la partition (pages et périmètre du crawl).
+
+    Returns:
+        Chemin du fichier écrit.
+    """
+    chemin = Path(dossier) / f"partiel-{numero:03d}.json"
+    donnees = {
+        'url_depart': resultat.url_depart,
+        'numero': numero,
+        'raison_arret': resultat.raison_arret,
+        'motifs_pieges': resultat.motifs_pieges,
+        'doublons_redirection': resultat.doublons_redirection,
+        'doublons_canonique': resultat.doublons_canonique,
+        'requetes_evitees': resultat.requetes_evitees,
+        'populations_gabarits': resultat.populations_gabarits,
+        'priorisation_cadres': resultat.priorisation_cadres,
+        'exploration_cadres': resultat.exploration_cadres,
+        'sonde_cadres': resultat.sonde_cadres,
+        'pages': [page.vers_dict() for page in resultat.pages]
+    }
+    temporaire = chemin.with_suffix('.tmp')
+    with open(temporaire, 'w', encoding='utf-8') as f:
+        json.dump(donnees, f, ensure_ascii=False)
+    os.replace(temporaire, chemin)
+    return str(chemin)
+
+
+def fusionner_partiels(dossier: str) -> ResultatAnalyseGlobal:
+    """
+    Fusionne les résultats partiels de toutes les partitions.
+
+    Les pages sont classées par partition puis dans l'ordre d'analyse de
+    chacune ; les populations de gabarits, les motifs écartés, les doublons
+    le rendement de la priorisation des pages à cadres et les compteurs de
+    l'exploration des cadres imbriqués et de la sonde des sources sont cumulés.
+
+    Args:
+        dossier: Dossier partagé.
+
+    Returns:
+        Résultat global (statistiques non calculées).
+
+    Raises:
+        FileNotFoundError: Si aucun résultat partiel n'est présent.
+    """
+    chemins = sorted(Path(dossier).glob("partiel-*.json"))
+    if not chemins:
+        raise FileNotFoundError(f"Aucun résultat partiel dans {dossier}")
+
+    partiels: List[Dict[str, Any]] = []
+    for chemin in chemins:
+        with open(chemin, 'r', encoding='utf-8') as f:
+            partiels.append(json.load(f))
+
+    resultat = ResultatAnalyseGlobal(
+        url_depart=partiels[0]['url_depart'],
+        date_analyse=formater_date()
+    )
+
+    populations: Counter = Counter()
+    motifs: Dict[str, Dict[str, Any]] = {}
+    raisons: List[str] = []
+    priorisation: Counter = Counter()
+    exploration: Counter = Counter()
+    sonde: Counter = Counter()
+    for partiel in partiels:
+        resultat.pages.extend(ResultatPage.depuis_dict(page) for page in partiel['pages'])
+        populations.update(partiel.get('populations_gabarits', {}))
+        for motif in partiel.get('motifs_pieges', []):
+            if motif['motif'] in motifs:
+                motifs[motif['motif']]['urls_ecartees'] += motif['urls_ecartees']
+            else:
+                motifs[motif['motif']] = dict(motif)
+        resultat.doublons_redirection += partiel.get('doublons_redirection', 0)
+        resultat.doublons_canonique += partiel.get('doublons_canonique', 0)
+        resultat.requetes_evitees += partiel.get('requetes_evitees', 0)
+        partielle = partiel.get('priorisation_cadres')
+        if partielle:
+            priorisation['pages'] += partielle['pages']
+            priorisation['cadres'] += partielle['cadres']
+            priorisation['pages_communes'] += partielle['pages_communes']
+            priorisation['cadres_largeur'] += partielle['cadres_par_page_largeur'] * partielle['pages']
+        for nom, valeur in partiel.get('exploration_cadres', {}).items():
+            if nom in ('profondeur_max', 'profondeur_atteinte'):
+                exploration[nom] = max(exploration[nom], valeur)
+            else:
+                exploration[nom] += valeur
+        sonde.update(partiel.get('sonde_cadres', {}))
+        raison = partiel.get('raison_arret')
+        if raison and raison not in raisons:
+            raisons.append(raison)
+
+    resultat.populations_gabarits = dict(populations)
+    resultat.motifs_pieges = sorted(motifs.values(), key=lambda m: (-m['urls_ecartees'], m['motif']))
+    if priorisation['pages']:
+        resultat.priorisation_cadres = {
+            'pages': priorisation['pages'],
+            'cadres': priorisation['cadres'],
+            'cadres_par_page': round(priorisation['cadres'] / priorisation['pages'], 2),
+            'cadres_par_page_largeur': round(priorisation['cadres_largeur'] / priorisation['pages'], 2),
+            'pages_communes': priorisation['pages_communes'],
+        }
+    resultat.exploration_cadres = dict(exploration)
+    resultat.sonde_cadres = dict(sonde)
+    resultat.raison_arret = f"{len(partiels)} partition(s) : " + " ; ".join(raisons) if raisons else ""
+    return resultat
@@ -46,6 +46,7 @@ class GenerateurRapport:
         self.config = config or get_config()
         self._dossier_sortie = self.config.get("rapport.dossier_sortie", "reports")
         self._inclure_code = self.config.get("rapport.inclure_code_html", True)
+        self._seuil_similarite = self.config.get("analyse.seuil_similarite_titre", 0.2)
         self._analyseur = AnalyseurRGAA(config)
 
     def generer_rapport(self, resultat: ResultatAnalyseGlobal, chemin_sortie: Optional[str] = None) -> str:
@@ -101,10 +102,12 @@ class GenerateurRapport:
             self._generer_synthese_avec_couverture(metrics, resultat),  # ENRICHI
             self._generer_actions_requises(metrics),  # NOUVEAU
             self._generer_synthese_conformite(resultat),
+            self._generer_changements(resultat),
             self._generer_detail_critere_2_1(resultat),
             self._generer_avertissement_critere_2_2(),  # NOUVEAU
             self._generer_detail_critere_2_2(resultat),
             self._generer_detail_pages(resultat),
+            self._generer_perimetre_crawl(resultat),
             self._generer_recommandations(resultat),
             self._generer_annexes(resultat),
             self._generer_annexe_methodologie(metrics, system_info),  # NOUVEAU
@@ -112,7 +115,7 @@ class GenerateurRapport:
             self._generer_pied_page(resultat)
         ]
 
-        return '\n\n'.join(sections)
+        return '\n\n'.join(section for section in sections if section)
 
     def _generer_en_tete(self, resultat: ResultatAnalyseGlobal) -> str:
         """Génère l'en-tête du rapport."""
@@ -188,6 +191,74 @@ class GenerateurRapport:
 
 > **Note** : Le critère 2.2 nécessite une vérification manuelle. L'outil signale les titres potentiellement problématiques mais seul un audit humain peut confirmer la pertinence."""
 
+    def _generer_changements(self, resultat: ResultatAnalyseGlobal) -> str:
+        """Génère la section des changements depuis l'audit de référence (audit incrémental)."""
+        delta = resultat.delta
+        if not delta:
+            return ""
+
+        ecart = resultat.taux_conformite_2_1 - delta['taux_2_1_reference']
+        contenu = f"""## Changements depuis le Dernier Audit
+
+Seules les pages modifiées ou nouvelles ont été analysées ; les résultats des pages dont
+le contenu est identique à celui de l'audit de référence ont été repris.
+
+| Indicateur | Valeur |
+|------------|--------|
+| Audit de référence | {delta['audit_reference']} ({delta['pages_reference']} pages) |
+| Pages inchangées (résultats repris) | {delta['inchangees']} |
+| Pages modifiées (réanalysées) | {len(delta['modifiees'])} |
+| Pages nouvelles | {len(delta['nouvelles'])} |
+| Pages de l'audit de référence absentes de cet audit | {len(delta['absentes'])} |
+| Taux de conformité 2.1 | {formater_taux_conformite(delta['taux_2_1_reference'])} → {formater_taux_conformite(resultat.taux_conformite_2_1)} ({ecart:+.1f} points) |
+| Cadres non conformes 2.1 | {delta['non_conformes_2_1_reference']} → {resultat.total_non_conformes_2_1} |
+"""
+
+        if delta['modifiees']:
+            contenu += """
+### Pages modifiées
+
+| Page | Cadres (avant → après) | Non conformes 2.1 (avant → après) | Statut 2.1 |
+|------|------------------------|-----------------------------------|------------|
+"""
+            for page in delta['modifiees'][:50]:
+                contenu += (
+                    f"| {tronquer_texte(page['url'], 60)} | {page['cadres_avant']} → {page['cadres_apres']} | "
+                    f"{page['non_conformes_2_1_avant']} → {page['non_conformes_2_1_apres']} | "
+                    f"{obtenir_emoji_statut(page['statut_2_1_apres'])} {page['statut_2_1_apres']} |\n"
+                )
+            if len(delta['modifiees']) > 50:
+                contenu += f"\n*... et {len(delta['modifiees']) - 50} autres pages modifiées*\n"
+
+        if delta['nouvelles']:
+            contenu += """
+### Pages nouvelles
+
+| Page | Cadres | Non conformes 2.1 |
+|------|--------|-------------------|
+"""
+            for page in delta['nouvelles'][:50]:
+                contenu += (
+                    f"| {tronquer_texte(page['url'], 60)} | {page['cadres']} | {page['non_conformes_2_1']} |\n"
+                )
+            if len(delta['nouvelles']) > 50:
+                contenu += f"\n*... et {len(delta['nouvelles']) - 50} autres pages nouvelles*\n"
+
+        if delta['absentes']:
+            contenu += """
+### Pages absentes de cet audit
+
+Ces pages de l'audit de référence n'ont pas été récupérées (supprimées, non liées ou hors
+de la limite de pages) ; elles ne sont pas comptées dans cet audit.
+
+"""
+            for url in delta['absentes'][:50]:
+                contenu += f"- {url}\n"
+            if len(delta['absentes']) > 50:
+                contenu += f"\n*... et {len(delta['absentes']) - 50} autres pages*\n"
+
+        return contenu
+
     def _generer_detail_critere_2_1(self, resultat: ResultatAnalyseGlobal) -> str:
         """Génère le détail du critère 2.1."""
         contenu = """## Détail du Critère 2.1
@@ -204,7 +275,7 @@ Ce critère vérifie que tous les éléments `<iframe>` et `<frame>` visibles di
         # Collecter tous les cadres non conformes
         cadres_nc = []
         for page in resultat.pages:
-            for cadre in page.cadres:
+            for cadre in page.tous_cadres():
                 if cadre.resultat_test_2_1 == ResultatTest.NON_CONFORME:
                     cadres_nc.append((page.url, cadre))
 
@@ -217,7 +288,7 @@ Ce critère vérifie que tous les éléments `<iframe>` et `<frame>` visibles di
                 contenu += f"""#### Problème #{i}
 
 **Page** : `{url_page}`
-**Élément** : `<{cadre.type_element}>`
+{self._ligne_document_cadre(cadre)}**Élément** : `<{cadre.type_element}>`
 **Source** : `{tronquer_texte(cadre.src or 'Non spécifiée', 80)}`
 **ID** : `{cadre.id_element or 'Non défini'}`
 **Priorité** : {cadre.priorite.value if cadre.priorite else 'Non définie'}
@@ -254,7 +325,7 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
         # Collecter tous les cadres avec alertes
         cadres_alertes = []
         for page in resultat.pages:
-            for cadre in page.cadres:
+            for cadre in page.tous_cadres():
                 if cadre.alertes_2_2:
                     cadres_alertes.append((page.url, cadre))
 
@@ -268,7 +339,7 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
                 contenu += f"""#### Alerte #{i}
 
 **Page** : `{url_page}`
-**Élément** : `<{cadre.type_element}>`
+{self._ligne_document_cadre(cadre)}**Élément** : `<{cadre.type_element}>`
 **Titre actuel** : `{cadre.title}`
 **Source** : `{tronquer_texte(cadre.src or 'Non spécifiée', 80)}`
 
@@ -282,20 +353,127 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
 """
 
         # Lister tous les cadres à vérifier manuellement
+        # Avec la sonde des sources, le titre du contenu chargé accompagne chaque cadre
+        sonde = bool(resultat.sonde_cadres)
         contenu += """### Tous les Cadres à Vérifier Manuellement
 
-| Page | Type | Titre | Source |
-|------|------|-------|--------|
 """
+        if sonde:
+            contenu += "| Page | Type | Titre | Source | Titre du contenu | Similarité |\n"
+            contenu += "|------|------|-------|--------|------------------|------------|\n"
+        else:
+            contenu += "| Page | Type | Titre | Source |\n"
+            contenu += "|------|------|-------|--------|\n"
         for page in resultat.pages:
-            for cadre in page.cadres:
+            for cadre in page.tous_cadres():
                 if cadre.necessite_verification_2_2:
                     titre_display = tronquer_texte(cadre.title or "", 40)
                     src_display = tronquer_texte(cadre.src or "", 40)
-                    contenu += f"| {tronquer_texte(page.url, 30)} | `{cadre.type_element}` | {titre_display} | {src_display} |\n"
+                    ligne = f"| {tronquer_texte(page.url, 30)} | `{cadre.type_element}` | {titre_display} | {src_display} |"
+                    if sonde:
+                        ligne += f" {tronquer_texte(cadre.titre_source or '-', 40)} | {self._formater_similarite(cadre)} |"
+                    contenu += ligne + "\n"
+
+        if sonde:
+            contenu += self._generer_sonde_sources(resultat)
+
+        return contenu
+
+    def _formater_similarite(self, cadre: DonnesCadre) -> str:
+        """Similarité entre le titre d'un cadre et celui de son contenu (signalée si faible)."""
+        if cadre.source_en_erreur:
+            return f"❌ HTTP {cadre.statut_source}" if cadre.statut_source else "❌ Pas de réponse"
+        if cadre.similarite_titre is None:
+            return "-"
+        if cadre.similarite_titre < self._seuil_similarite:
+            return f"⚠️ {cadre.similarite_titre:.0%}"
+        return f"{cadre.similarite_titre:.0%}"
+
+    def _generer_sonde_sources(self, resultat: ResultatAnalyseGlobal) -> str:
+        """Génère la synthèse de la sonde des sources de cadres (critère 2.2)."""
+        sonde = resultat.sonde_cadres
+
+        # Regrouper les cadres sondés par source
+        sources = {}
+        for page in resultat.pages:
+            for cadre in page.tous_cadres():
+                if cadre.statut_source is None:
+                    continue
+                source = sources.setdefault(cadre.url_src, {
+                    'cadre': cadre, 'pages': set(), 'titres': {}
+                })
+                source['pages'].add(page.url)
+                if cadre.title and cadre.similarite_titre is not None:
+                    source['titres'][cadre.title] = cadre.similarite_titre
+
+        cassees = sorted(
+            (s for s in sources.values() if s['cadre'].source_en_erreur),
+            key=lambda s: (-len(s['pages']), s['cadre'].url_src)
+        )
+        comparaisons = sorted(
+            ((url_src, titre, similarite, s['cadre'].titre_source)
+             for url_src, s in sources.items() for titre, similarite in s['titres'].items()),
+            key=lambda c: (c[2], c[0], c[1])
+        )
+        faibles = sum(1 for c in comparaisons if c[2] < self._seuil_similarite)
+
+        contenu = f"""
+### Contenu chargé par les cadres
+
+Chaque source de cadre distincte a été demandée une fois. Le titre du contenu chargé
+(`og:title` ou `<title>`) est comparé au titre du cadre : une similarité faible (moins de
+{self._seuil_similarite:.0%}) signale un titre qui ne décrit peut-être pas le contenu ; une similarité élevée
+ne dispense pas de la vérification manuelle.
+
+- **Sources sondées** : {sonde['sources']} (dont {sonde['sources_en_erreur']} en erreur)
+- **Cadres dont la source est en erreur** : {sonde['cadres_en_erreur']}
+- **Titres de cadre sans rapport apparent avec le contenu** : {faibles}
+"""
+        if sonde['non_sondees'] or sonde['hors_limite']:
+            contenu += (
+                f"- **Sources non sondées** : {sonde['non_sondees']} (robots.txt, hôte suspendu), "
+                f"{sonde['hors_limite']} cadre(s) au-delà de la limite de sources\n"
+            )
+
+        if cassees:
+            contenu += """
+#### Intégrations cassées
+
+| Source | Statut | Pages concernées |
+|--------|--------|------------------|
+"""
+            for source in cassees[:50]:
+                cadre = source['cadre']
+                statut = f"HTTP {cadre.statut_source}" if cadre.statut_source else "Pas de réponse"
+                contenu += f"| {tronquer_texte(cadre.url_src, 60)} | {statut} | {len(source['pages'])} |\n"
+            if len(cassees) > 50:
+                contenu += f"\n*... et {len(cassees) - 50} autres sources en erreur*\n"
+
+        if comparaisons:
+            contenu += """
+#### Titres de cadre et titres des contenus (similarité croissante)
+
+| Source | Titre du cadre | Titre du contenu | Similarité |
+|--------|----------------|------------------|------------|
+"""
+            for url_src, titre, similarite, titre_source in comparaisons[:50]:
+                marque = "⚠️ " if similarite < self._seuil_similarite else ""
+                contenu += (
+                    f"| {tronquer_texte(url_src, 40)} | {tronquer_texte(titre, 40)} | "
+                    f"{tronquer_texte(titre_source or '', 40)} | {marque}{similarite:.0%} |\n"
+                )
+            if len(comparaisons) > 50:
+                contenu += f"\n*... et {len(comparaisons) - 50} autres titres*\n"
 
         return contenu
 
+    @staticmethod
+    def _ligne_document_cadre(cadre: DonnesCadre) -> str:
+        """Ligne indiquant le document de cadre contenant un cadre imbriqué (vide sinon)."""
+        if not cadre.profondeur:
+            return ""
+        return f"**Document du cadre** : `{cadre.url_page}` (cadre imbriqué, niveau {cadre.profondeur})\n"
+
     def _generer_detail_pages(self, resultat: ResultatAnalyseGlobal) -> str:
         """Génère le détail par page."""
         contenu = """## Détail par Page
@@ -318,7 +496,7 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
                 contenu += "| Type | ID | Titre | Statut 2.1 | Alertes 2.2 |\n"
                 contenu += "|------|-----|-------|------------|-------------|\n"
 
-                for cadre in page.cadres:
+                for cadre in page.tous_cadres():
                     if cadre.est_cache:
                         continue
                     statut_emoji = obtenir_emoji_statut(cadre.resultat_test_2_1.value)
@@ -327,12 +505,152 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
                     alertes = len(cadre.alertes_2_2)
                     alertes_display = f"⚠️ {alertes}" if alertes > 0 else "✅"
 
-                    contenu += f"| `{cadre.type_element}` | {id_display} | {titre_display} | {statut_emoji} | {alertes_display} |\n"
+                    # Cadre imbriqué : décalé selon sa profondeur
+                    type_display = "↳ " * cadre.profondeur + f"`{cadre.type_element}`"
+
+                    contenu += f"| {type_display} | {id_display} | {titre_display} | {statut_emoji} | {alertes_display} |\n"
 
             contenu += "\n---\n\n"
 
         return contenu
 
+    def _generer_perimetre_crawl(self, resultat: ResultatAnalyseGlobal) -> str:
+        """
+        Génère la section sur le périmètre du crawl (arrêt, priorisation, documents
+        de cadres, doublons, échantillonnage, motifs écartés).
+        """
+        doublons = resultat.doublons_redirection + resultat.doublons_canonique
+        if (not resultat.raison_arret and not resultat.motifs_pieges and not resultat.gabarits
+                and not doublons and not resultat.requetes_evitees and not resultat.priorisation_cadres
+                and not resultat.exploration_cadres):
+            return ""
+
+        contenu = "## Périmètre du Crawl\n"
+
+        if resultat.raison_arret:
+            contenu += f"""
+### Arrêt du crawl
+
+- **Raison de l'arrêt** : {resultat.raison_arret}
+"""
+            convergence = resultat.convergence
+            if convergence:
+                niveau = f"{convergence['niveau_confiance']:.0%}"
+                intervalle_2_1 = convergence['intervalle_2_1']
+                taux = (
+                    f"{intervalle_2_1[0]:.1f}% à {intervalle_2_1[1]:.1f}%" if intervalle_2_1
+                    else "non calculable (pas assez de cadres testés)"
+                )
+                bas, haut = convergence['intervalle_sources']
+                contenu += f"""- **Taux de conformité 2.1** : {convergence['taux_2_1']:.1f}% (intervalle à {niveau} : {taux})
+- **Sources de cadres distinctes** : {convergence['sources_observees']} observées, {convergence['sources_estimees']:.0f} estimées (intervalle à {niveau} : {bas:.0f} à {haut:.0f})
+
+Les pages ont été parcourues dans un ordre aléatoire. Les intervalles tiennent compte du
+regroupement des cadres par page ; le nombre de sources est estimé par l'estimateur Chao2.
+"""
+
+        priorisation = resultat.priorisation_cadres
+        if priorisation:
+            gain = (
+                f"{priorisation['cadres_par_page'] / priorisation['cadres_par_page_largeur']:.1f} fois "
+                "celui estimé du parcours en largeur"
+                if priorisation['cadres_par_page_largeur'] else "aucun cadre estimé pour le parcours en largeur"
+            )
+            contenu += f"""
+### Priorisation des pages à cadres
+
+Les pages susceptibles de contenir des cadres ont été récupérées en premier : gabarits
+d'URL déjà vus avec des cadres, liens trouvés sur des pages à cadres, chemins annonçant
+un contenu intégré (vidéo, carte, formulaire...). Le parcours en largeur est estimé sur
+le même nombre de pages, dans l'ordre de découverte des liens, avec le nombre moyen de
+cadres du gabarit pour les pages qu'il aurait récupérées et que ce crawl n'a pas récupérées.
+
+| Indicateur | Crawl priorisé | Parcours en largeur (estimé) |
+|------------|----------------|------------------------------|
+| Pages récupérées | {priorisation['pages']} | {priorisation['pages']} |
+| Cadres par page | {priorisation['cadres_par_page']:.2f} | {priorisation['cadres_par_page_largeur']:.2f} |
+
+- **Cadres trouvés** : {priorisation['cadres']} (rendement : {gain})
+- **Pages communes aux deux parcours** : {priorisation['pages_communes']}
+"""
+
+        exploration = resultat.exploration_cadres
+        if exploration:
+            contenu += f"""
+### Documents chargés par les cadres
+
+Les documents chargés par les cadres visibles de même origine que la page ont été
+récupérés et analysés, jusqu'à {exploration['profondeur_max']} niveau(x) : leurs propres cadres sont rattachés
+au cadre parent et comptés avec ceux de la page. Chaque document n'a été récupéré qu'une fois.
+
+| Indicateur | Nombre |
+|------------|--------|
+| Documents de cadres analysés | {exploration['documents']} |
+| Documents non récupérables (erreur, non-HTML, robots.txt) | {exploration['erreurs']} |
+| Cadres servis par un document déjà récupéré | {exploration['reutilisations']} |
+| Cadres imbriqués trouvés | {exploration['cadres_imbriques']} |
+| Niveau d'imbrication maximal atteint | {exploration['profondeur_atteinte']} |
+| Cadres d'une autre origine (non suivis) | {exploration['hors_origine']} |
+| Cadres chargeant l'un de leurs ancêtres (non suivis) | {exploration['cycles']} |
+| Cadres non suivis (limite de documents atteinte) | {exploration['hors_limite']} |
+"""
+
+        if doublons or resultat.requetes_evitees:
+            contenu += f"""
+### Pages en double
+
+Une page est identifiée par son URL finale (après redirections) et par son URL canonique
+(`<link rel="canonical">`) : les variantes d'une même page (`/page`, `/page/index.html`,
+`http://` redirigé vers `https://`...) ne sont récupérées et analysées qu'une fois.
+
+| Indicateur | Nombre |
+|------------|--------|
+| Pages redirigées vers une page déjà analysée | {resultat.doublons_redirection} |
+| Pages dont l'URL canonique a déjà été analysée | {resultat.doublons_canonique} |
+| Récupérations évitées (URLs déjà couvertes par une redirection ou une URL canonique) | {resultat.requetes_evitees} |
+"""
+
+        if resultat.gabarits:
+            contenu += f"""
+### Échantillonnage par gabarit d'URL
+
+Seules quelques pages représentatives de chaque gabarit ont été analysées. Les résultats
+sont extrapolés aux URLs découvertes de chaque gabarit (les URLs non découvertes par le
+crawl ne sont pas comptées).
+
+- **Pages analysées** : {resultat.total_pages} sur {resultat.total_pages_estime} URLs découvertes
+- **Cadres estimés** : {resultat.total_cadres_estime:.0f} ({resultat.total_cadres} dans l'échantillon)
+- **Taux de conformité 2.1 extrapolé** : {formater_taux_conformite(resultat.taux_conformite_2_1_extrapole)}
+
+| Gabarit | URLs découvertes | Pages analysées | Cadres (échantillon) | Cadres estimés | Taux 2.1 |
+|---------|------------------|-----------------|----------------------|----------------|----------|
+"""
+            for gabarit in resultat.gabarits:
+                taux = formater_taux_conformite(gabarit.taux_conformite_2_1) if gabarit.cadres_testes else "N/A"
+                contenu += (
+                    f"| `{gabarit.gabarit}` | {gabarit.population} | {gabarit.echantillon} | "
+                    f"{gabarit.cadres} | {gabarit.cadres_estimes:.0f} | {taux} |\n"
+                )
+
+        if resultat.motifs_pieges:
+            contenu += """
+### Motifs d'URLs écartés (pièges de crawl présumés)
+
+Ces motifs produisaient un nombre d'URLs sans fin (calendriers, recherches à facettes,
+identifiants de session...). Les URLs rétrogradées n'ont été explorées qu'après le reste
+du site ; les URLs bloquées n'ont pas été explorées.
+
+| Motif | Raison | Action | URLs écartées |
+|-------|--------|--------|---------------|
+"""
+            for motif in resultat.motifs_pieges:
+                action = "Bloqué" if motif['action'] == 'bloquer' else "Rétrogradé"
+                contenu += (
+                    f"| `{motif['motif']}` | {motif['raison']} | {action} | {motif['urls_ecartees']} |\n"
+                )
+
+        return contenu
+
     def _generer_recommandations(self, resultat: ResultatAnalyseGlobal) -> str:
         """Génère la section des recommandations."""
         contenu = """## Recommandations de Correction
@@ -343,7 +661,7 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
         # Collecter les problèmes P1
         p1 = []
         for page in resultat.pages:
-            for cadre in page.cadres:
+            for cadre in page.tous_cadres():
                 if cadre.priorite == PrioriteCorrection.P1_CRITIQUE:
                     p1.append((page.url, cadre))
 
@@ -363,7 +681,7 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
         # Collecter les problèmes P2
         p2 = []
         for page in resultat.pages:
-            for cadre in page.cadres:
+            for cadre in page.tous_cadres():
                 if cadre.priorite == PrioriteCorrection.P2_IMPORTANT:
                     p2.append((page.url, cadre))
 
@@ -382,7 +700,7 @@ Ce critère vérifie que les titres des cadres sont suffisamment descriptifs pou
 """
         p3 = []
         for page in resultat.pages:
-            for cadre in page.cadres:
+            for cadre in page.tous_cadres():
                 if cadre.priorite == PrioriteCorrection.P3_AMELIORATION:
                     p3.append((page.url, cadre))
 
@@ -801,6 +1119,8 @@ Aucun cadre (frame ou iframe) n'a été détecté sur les pages testées.
 **Référentiel** : RGAA 4.1.2
 **URL de départ** : {resultat.url_depart}
 **Pages analysées** : {resultat.total_pages}
+**Analyses servies par le mémo** : {resultat.total_depuis_memo} (contenu identique déjà analysé)
+**Résultats repris de l'audit précédent** : {resultat.total_reportees} (contenu inchangé)
 **Cadres analysés** : {resultat.total_cadres}
 
 ---
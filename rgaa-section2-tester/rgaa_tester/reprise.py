@@ -0,0 +1,375 @@
+# -*- coding: utf-8 -*-
+"""
+Module de reprise des crawls pour RGAA Section 2 Tester
+
+Enregistre dans une base SQLite locale la frontière, les URLs visitées et
+le résultat de chaque page analysée, par points de sauvegarde réguliers.
+Un crawl interrompu (arrêt demandé, processus tué) peut ainsi reprendre
+là où il s'était arrêté, sans récupérer à nouveau les pages terminées.
+Seuls les derniers audits de chaque site sont conservés.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from .analyzer import ResultatPage
+from .config import Config
+from .frontiere import ALIAS, ECARTEE, EN_ATTENTE, VISITEE
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS audits ("
+    " id TEXT PRIMARY KEY,"
+    " url_depart TEXT NOT NULL,"
+    " max_pages INTEGER NOT NULL,"
+    " date_creation REAL NOT NULL,"
+    " date_sauvegarde REAL NOT NULL,"
+    " raison_arret TEXT NOT NULL DEFAULT '',"
+    " interrompu INTEGER NOT NULL DEFAULT 0,"
+    " signature_analyse TEXT NOT NULL DEFAULT '')",
+    "CREATE TABLE IF NOT EXISTS urls ("
+    " audit TEXT NOT NULL,"
+    " url TEXT NOT NULL,"
+    " profondeur INTEGER NOT NULL,"
+    " etat TEXT NOT NULL,"
+    " PRIMARY KEY (audit, url))",
+    "CREATE TABLE IF NOT EXISTS pages ("
+    " audit TEXT NOT NULL,"
+    " ordre INTEGER NOT NULL,"
+    " url TEXT NOT NULL,"
+    " donnees BLOB NOT NULL,"
+    " alias TEXT NOT NULL DEFAULT '',"
+    " PRIMARY KEY (audit, ordre))",
+)
+
+
+# Colonnes ajoutées après la création du schéma (bases existantes)
+_COLONNES_AJOUTEES = (
+    ("audits", "interrompu", "INTEGER NOT NULL DEFAULT 0"),
+    ("audits", "signature_analyse", "TEXT NOT NULL DEFAULT ''"),
+    ("pages", "alias", "TEXT NOT NULL DEFAULT ''"),
+)
+
+
+def ouvrir_journal(config: Config,
+                   url_depart: str,
+                   max_pages: int,
+                   id_audit: Optional[str] = None,
+                   signature_analyse: str = '') -> Optional["JournalCrawl"]:
+    """
+    Ouvre le journal de reprise d'un crawl si la reprise est activée.
+
+    Args:
+        config: Configuration de l'application.
+        url_depart: URL de départ (nouvel audit).
+        max_pages: Nombre maximum de pages (nouvel audit).
+        id_audit: Identifiant de l'audit à reprendre (optionnel).
+        signature_analyse: Signature des paramètres d'analyse (nouvel audit).
+
+    Returns:
+        Le journal, ou None si la reprise est désactivée.
+
+    Raises:
+        KeyError: Si l'audit à reprendre est inconnu.
+    """
+    crawler_config = config.crawler_config
+    fichier = crawler_config.get('fichier_reprise', 'audits/reprise.sqlite')
+    audits_conserves = int(crawler_config.get('audits_conserves', 10))
+    if id_audit:
+        return JournalCrawl.reprendre(fichier, id_audit, audits_conserves)
+    if not crawler_config.get('reprise_crawl', True):
+        return None
+    return JournalCrawl.creer(fichier, url_depart, max_pages, audits_conserves, signature_analyse)
+
+
+class JournalCrawl:
+    """
+    Journal de reprise d'un audit.
+
+    Les résultats de pages sont insérés au fil de l'analyse et validés avec
+    les changements de la frontière à chaque point de sauvegarde : après une
+    interruption, la base décrit toujours un état cohérent. Une page visitée
+    dont le résultat n'a pas été enregistré est replacée en tête de file.
+
+    À la fin de l'audit, seuls les `audits_conserves` audits les plus
+    récents du même site restent dans la base.
+    """
+
+    def __init__(self, connexion: sqlite3.Connection, id_audit: str,
+                 url_depart: str, max_pages: int, pages_enregistrees: int = 0,
+                 audits_conserves: int = 0, signature_analyse: str = ''):
+        """
+        Initialise le journal (utiliser `creer` ou `reprendre`).
+
+        Args:
+            connexion: Connexion à la base de reprise.
+            id_audit: Identifiant de l'audit.
+            url_depart: URL de départ de l'audit.
+            max_pages: Nombre maximum de pages de l'audit.
+            pages_enregistrees: Nombre de résultats déjà enregistrés.
+            audits_conserves: Nombre d'audits conservés par site (0 : tous).
+            signature_analyse: Signature des paramètres d'analyse de l'audit.
+        """
+        self._connexion = connexion
+        self._verrou = threading.Lock()
+        self.id_audit = id_audit
+        self.url_depart = url_depart
+        self.max_pages = max_pages
+        self._pages_enregistrees = pages_enregistrees
+        self._audits_conserves = audits_conserves
+        self.signature_analyse = signature_analyse
+        self.reprise = pages_enregistrees > 0 or self._compter_urls() > 0
+
+    @staticmethod
+    def _connecter(fichier: str) -> sqlite3.Connection:
+        """Ouvre (ou crée) la base de reprise."""
+        Path(fichier).parent.mkdir(parents=True, exist_ok=True)
+        connexion = sqlite3.connect(fichier, check_same_thread=False)
+        connexion.execute("PRAGMA journal_mode=WAL")
+        connexion.execute("PRAGMA synchronous=NORMAL")
+        for instruction in _SCHEMA:
+            connexion.execute(instruction)
+        for table, colonne, definition in _COLONNES_AJOUTEES:
+            colonnes = {ligne[1] for ligne in connexion.execute(f"PRAGMA table_info({table})")}
+            if colonne not in colonnes:
+                connexion.execute(f"ALTER TABLE {table} ADD COLUMN {colonne} {definition}")
+        connexion.commit()
+        return connexion
+
+    @classmethod
+    def creer(cls, fichier: str, url_depart: str, max_pages: int,
+              audits_conserves: int = 0, signature_analyse: str = '') -> "JournalCrawl":
+        """
+        Crée un nouvel audit.
+
+        Args:
+            fichier: Base SQLite de reprise.
+            url_depart: URL de départ du crawl.
+            max_pages: Nombre maximum de pages du crawl.
+            audits_conserves: Nombre d'audits conservés par site (0 : tous).
+            signature_analyse: Signature des paramètres d'analyse.
+
+        Returns:
+            Le journal du nouvel audit.
+        """
+        connexion = cls._connecter(fichier)
+        maintenant = time.time()
+        id_audit = (
+            time.strftime('%Y%m%d-%H%M%S', time.localtime(maintenant)) + '-'
+            + hashlib.sha256(f"{url_depart}{maintenant}".encode('utf-8')).hexdigest()[:6]
+        )
+        connexion.execute(
+            "INSERT INTO audits (id, url_depart, max_pages, date_creation, date_sauvegarde, signature_analyse)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (id_audit, url_depart, max_pages, maintenant, maintenant, signature_analyse)
+        )
+        connexion.commit()
+        return cls(connexion, id_audit, url_depart, max_pages,
+                   audits_conserves=audits_conserves, signature_analyse=signature_analyse)
+
+    @classmethod
+    def reprendre(cls, fichier: str, id_audit: str, audits_conserves: int = 0) -> "JournalCrawl":
+        """
+        Rouvre un audit existant.
+
+        Args:
+            fichier: Base SQLite de reprise.
+            id_audit: Identifiant de l'audit.
+            audits_conserves: Nombre d'audits conservés par site (0 : tous).
+
+        Returns:
+            Le journal de l'audit, avec ses limites d'origine.
+
+        Raises:
+            KeyError: Si l'audit est inconnu.
+        """
+        if not Path(fichier).exists():
+            raise KeyError(id_audit)
+        connexion = cls._connecter(fichier)
+        ligne = connexion.execute(
+            "SELECT url_depart, max_pages, signature_analyse FROM audits WHERE id = ?", (id_audit,)
+        ).fetchone()
+        if ligne is None:
+            connexion.close()
+            raise KeyError(id_audit)
+        pages = connexion.execute(
+            "SELECT COUNT(*) FROM pages WHERE audit = ?", (id_audit,)
+        ).fetchone()[0]
+        return cls(connexion, id_audit, ligne[0], ligne[1], pages, audits_conserves, ligne[2])
+
+    @classmethod
+    def dernier_audit(cls, fichier: str, url_depart: str,
+                      exclure: Optional[str] = None,
+                      signature_analyse: Optional[str] = None) -> Optional[str]:
+        """
+        Recherche le dernier audit terminé d'un site.
+
+        Les audits interrompus (arrêt demandé) ne sont pas retenus : leurs
+        pages non atteintes passeraient pour nouvelles.
+
+        Args:
+            fichier: Base SQLite de reprise.
+            url_depart: URL de départ du site.
+            exclure: Identifiant d'audit à ignorer (audit en cours).
+            signature_analyse: Ne retenir que les audits analysés avec ces
+                paramètres (optionnel).
+
+        Returns:
+            Identifiant de l'audit, ou None s'il n'y en a pas.
+        """
+        if not Path(fichier).exists():
+            return None
+        connexion = cls._connecter(fichier)
+        try:
+            requete = "SELECT id FROM audits WHERE url_depart = ? AND raison_arret != '' AND NOT interrompu AND id != ?"
+            parametres = [url_depart, exclure or '']
+            if signature_analyse is not None:
+                requete += " AND signature_analyse = ?"
+                parametres.append(signature_analyse)
+            ligne = connexion.execute(
+                requete + " ORDER BY date_creation DESC LIMIT 1", parametres
+            ).fetchone()
+        finally:
+            connexion.close()
+        return ligne[0] if ligne else None
+
+    def _compter_urls(self) -> int:
+        """Nombre d'URLs enregistrées pour l'audit."""
+        return self._connexion.execute(
+            "SELECT COUNT(*) FROM urls WHERE audit = ?", (self.id_audit,)
+        ).fetchone()[0]
+
+    def enregistrer_page(self, resultat: ResultatPage, alias: Iterable[str] = ()) -> None:
+        """
+        Enregistre le résultat d'une page (validé au prochain point de sauvegarde).
+
+        Args:
+            resultat: Résultat d'analyse de la page.
+            alias: Autres URLs couvertes par la page (URL demandée avant
+                redirection, URL canonique).
+        """
+        donnees = zlib.compress(
+            json.dumps(resultat.vers_dict(), ensure_ascii=False).encode('utf-8')
+        )
+        with self._verrou:
+            self._connexion.execute(
+                "INSERT OR REPLACE INTO pages (audit, ordre, url, donnees, alias) VALUES (?, ?, ?, ?, ?)",
+                (self.id_audit, self._pages_enregistrees, resultat.url, donnees, '\n'.join(alias))
+            )
+            self._pages_enregistrees += 1
+
+    def sauvegarder(self, modifications: Iterable[Tuple[str, int, str]] = ()) -> None:
+        """
+        Point de sauvegarde : enregistre les changements de la frontière et
+        valide les résultats de pages en attente.
+
+        Args:
+            modifications: Changements d'état (url, profondeur, état) depuis
+                le point de sauvegarde précédent.
+        """
+        with self._verrou:
+            self._connexion.executemany(
+                "INSERT INTO urls (audit, url, profondeur, etat) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (audit, url) DO UPDATE SET etat = excluded.etat",
+                ((self.id_audit, url, profondeur, etat) for url, profondeur, etat in modifications)
+            )
+            self._connexion.execute(
+                "UPDATE audits SET date_sauvegarde = ? WHERE id = ?", (time.time(), self.id_audit)
+            )
+            self._connexion.commit()
+
+    def etat_frontiere(self) -> List[Tuple[str, int, str]]:
+        """
+        Retourne l'état enregistré de la frontière, prêt à être restauré.
+
+        Les URLs visitées sans résultat enregistré (analyse interrompue ou
+        page en erreur) repassent en attente, en tête de file. Une URL visitée
+        à travers une autre (alias) n'est jamais replacée en file : elle reste
+        visitée si la page qui la couvre a été enregistrée, sinon elle est
+        seulement connue et sera de nouveau rattachée à cette page.
+
+        Returns:
+            Liste de (url, profondeur, état).
+        """
+        with self._verrou:
+            terminees = set()
+            for url, alias in self._connexion.execute(
+                "SELECT url, alias FROM pages WHERE audit = ?", (self.id_audit,)
+            ):
+                terminees.add(url)
+                terminees.update(alias.split('\n') if alias else ())
+            lignes = self._connexion.execute(
+                "SELECT url, profondeur, etat FROM urls WHERE audit = ? ORDER BY rowid",
+                (self.id_audit,)
+            ).fetchall()
+
+        a_reprendre = []
+        autres = []
+        for url, profondeur, etat in lignes:
+            if etat == VISITEE and url not in terminees:
+                a_reprendre.append((url, profondeur, EN_ATTENTE))
+            elif etat == ALIAS and url not in terminees:
+                autres.append((url, profondeur, ECARTEE))
+            else:
+                autres.append((url, profondeur, etat))
+        return a_reprendre + autres
+
+    def pages(self) -> List[ResultatPage]:
+        """Retourne les résultats enregistrés, dans l'ordre d'analyse."""
+        with self._verrou:
+            lignes = self._connexion.execute(
+                "SELECT donnees FROM pages WHERE audit = ? ORDER BY ordre", (self.id_audit,)
+            ).fetchall()
+        return [
+            ResultatPage.depuis_dict(json.loads(zlib.decompress(donnees)))
+            for (donnees,) in lignes
+        ]
+
+    @property
+    def pages_enregistrees(self) -> int:
+        """Nombre de résultats de pages enregistrés."""
+        return self._pages_enregistrees
+
+    def terminer(self, raison_arret: str, interrompu: bool = False) -> None:
+        """
+        Valide les derniers résultats, consigne la raison de l'arrêt et
+        supprime les audits les plus anciens du site.
+
+        Args:
+            raison_arret: Raison de la fin du crawl.
+            interrompu: Le crawl n'a pas abouti (arrêt demandé, aucune page
+                récupérée, erreur) ; l'audit peut être repris mais ne sert
+                pas de référence.
+        """
+        with self._verrou:
+            self._connexion.execute(
+                "UPDATE audits SET raison_arret = ?, interrompu = ?, date_sauvegarde = ? WHERE id = ?",
+                (raison_arret, int(interrompu), time.time(), self.id_audit)
+            )
+            if self._audits_conserves > 0:
+                self._elaguer()
+            self._connexion.commit()
+
+    def _elaguer(self) -> None:
+        """Supprime les audits du site au-delà des plus récents (verrou détenu)."""
+        anciens = [
+            (id_audit,) for (id_audit,) in self._connexion.execute(
+                "SELECT id FROM audits WHERE url_depart = ? AND id != ?"
+                " ORDER BY date_creation DESC LIMIT -1 OFFSET ?",
+                (self.url_depart, self.id_audit, self._audits_conserves - 1)
+            )
+        ]
+        for table in ('pages', 'urls'):
+            self._connexion.executemany(f"DELETE FROM {table} WHERE audit = ?", anciens)
+        self._connexion.executemany("DELETE FROM audits WHERE id = ?", anciens)
+
+    def fermer(self) -> None:
+        """Ferme la base de reprise."""
+        with self._verrou:
+            self._connexion.commit()
+            self._connexion.close()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Module robots.txt pour RGAA Section 2 Tester
+
+Récupère, analyse et met en cache le fichier robots.txt de chaque hôte
+afin de filtrer les URLs interdites et de connaître le Crawl-delay.
+"""
+
+import threading
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+
+import requests
+
+from .transport import TransportHTTP
+
+
+class GestionnaireRobots:
+    """
+    Cache des fichiers robots.txt, un par hôte.
+
+    Chaque fichier n'est récupéré qu'une seule fois, même si plusieurs
+    workers le demandent simultanément (verrou par hôte).
+    """
+
+    def __init__(self,
+                 transport: TransportHTTP,
+                 user_agent: str,
+                 timeout: float = 30,
+                 callback_log: Optional[Callable[[str], None]] = None):
+        """
+        Initialise le gestionnaire.
+
+        Args:
+            transport: Transport HTTP utilisé pour récupérer les fichiers.
+            user_agent: User-Agent dont les règles s'appliquent.
+            timeout: Délai maximum de récupération (secondes).
+            callback_log: Fonction(message) de journalisation (optionnel).
+        """
+        self._transport = transport
+        self._user_agent = user_agent
+        self._timeout = timeout
+        self._callback_log = callback_log
+
+        self._analyseurs: Dict[str, RobotFileParser] = {}
+        self._verrous: Dict[str, threading.Lock] = {}
+        self._verrou = threading.Lock()
+
+    def _log(self, message: str) -> None:
+        """Envoie un message de log."""
+        if self._callback_log:
+            self._callback_log(message)
+
+    def _analyseur(self, url: str) -> RobotFileParser:
+        """
+        Retourne l'analyseur robots.txt de l'hôte d'une URL (récupéré si besoin).
+
+        Args:
+            url: URL quelconque de l'hôte.
+
+        Returns:
+            Analyseur robots.txt de l'hôte.
+        """
+        parsed = urlparse(url)
+        origine = f"{parsed.scheme}://{parsed.netloc}"
+
+        with self._verrou:
+            analyseur = self._analyseurs.get(origine)
+            if analyseur is not None:
+                return analyseur
+            verrou_hote = self._verrous.setdefault(origine, threading.Lock())
+
+        with verrou_hote:
+            with self._verrou:
+                analyseur = self._analyseurs.get(origine)
+            if analyseur is None:
+                analyseur = self._recuperer(origine)
+                with self._verrou:
+                    self._analyseurs[origine] = analyseur
+            return analyseur
+
+    def _recuperer(self, origine: str) -> RobotFileParser:
+        """
+        Récupère et analyse le robots.txt d'une origine.
+
+        Mêmes conventions que urllib.robotparser : 401/403 interdisent
+        tout, les autres erreurs 4xx autorisent tout. Un serveur
+        injoignable ou en erreur 5xx n'empêche pas l'audit (tout autorisé).
+
+        Args:
+            origine: Schéma et hôte (ex: https://exemple.fr).
+
+        Returns:
+            Analyseur robots.txt.
+        """
+        url_robots = f"{origine}/robots.txt"
+        analyseur = RobotFileParser(url_robots)
+
+        try:
+            reponse = self._transport.get(url_robots, timeout=self._timeout, allow_redirects=True)
+        except requests.RequestException as e:
+            self._log(f"robots.txt inaccessible : {url_robots} - {str(e)}")
+            analyseur.allow_all = True
+            return analyseur
+
+        if reponse.status_code in (401, 403):
+            analyseur.disallow_all = True
+        elif reponse.status_code >= 400:
+            analyseur.allow_all = True
+        else:
+            lignes = reponse.text.splitlines()
+            analyseur.parse(lignes)
+            analyseur.delai_decimal = self._lire_delai_decimal(lignes)
+            self._log(f"robots.txt chargé : {url_robots}")
+
+        return analyseur
+
+    def autorise(self, url: str) -> bool:
+        """
+        Indique si le robots.txt de l'hôte autorise l'URL.
+
+        Args:
+            url: URL à vérifier.
+
+        Returns:
+            True si l'URL peut être récupérée.
+        """
+        return self._analyseur(url).can_fetch(self._user_agent, url)
+
+    def sitemaps(self, url: str) -> List[str]:
+        """
+        Retourne les sitemaps déclarés (directives Sitemap:) pour l'hôte d'une URL.
+
+        Args:
+            url: URL quelconque de l'hôte.
+
+        Returns:
+            URLs des sitemaps, dans l'ordre du fichier.
+        """
+        analyseur = self._analyseur(url)
+        return [urljoin(analyseur.url, sitemap) for sitemap in analyseur.site_maps() or []]
+
+    def delai_crawl(self, url: str) -> Optional[float]:
+        """
+        Retourne le Crawl-delay déclaré pour l'hôte d'une URL.
+
+        Args:
+            url: URL quelconque de l'hôte.
+
+        Returns:
+            Délai en secondes, ou None s'il n'est pas déclaré.
+        """
+        analyseur = self._analyseur(url)
+        delai = analyseur.crawl_delay(self._user_agent)
+        if delai is None:
+            # urllib.robotparser ignore les valeurs décimales (ex: 0.5)
+            delai = getattr(analyseur, 'delai_decimal', None)
+        return float(delai) if delai is not None else None
+
+    def _lire_delai_decimal(self, lignes: List[str]) -> Optional[float]:
+        """
+        Lit un Crawl-delay décimal applicable au User-Agent.
+
+        Args:
+            lignes: Lignes du fichier robots.txt.
+
+        Returns:
+            Délai du groupe correspondant au User-Agent (sinon du groupe '*').
+        """
+        produit = self._user_agent.split('/')[0].lower()
+        delais: Dict[str, float] = {}
+        agents: List[str] = []
+        dans_regles = False
+
+        for ligne in lignes:
+            ligne = ligne.split('#', 1)[0].strip()
+            if ':' not in ligne:
+                continue
+            cle, valeur = (partie.strip() for partie in ligne.split(':', 1))
+            cle = cle.lower()
+
+            if cle == 'user-agent':
+                if dans_regles:
+                    agents, dans_regles = [], False
+                agents.append(valeur.lower())
+            else:
+                dans_regles = True
+                if cle == 'crawl-delay':
+                    try:
+                        delai = float(valeur)
+                    except ValueError:
+                        continue
+                    for agent in agents:
+                        delais.setdefault(agent, delai)
+
+        for agent, delai in delais.items():
+            if agent != '*' and agent in produit:
+                return delai
+        return delais.get('*')
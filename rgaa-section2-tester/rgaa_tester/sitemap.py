@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Module de lecture des sitemaps pour RGAA Section 2 Tester
+
+Lit les sitemaps XML (éventuellement compressés en .xml.gz) en flux :
+les URLs sont produites au fil de la lecture, sans jamais charger le
+fichier complet en mémoire, et les index de sitemaps sont suivis.
+"""
+
+import gzip
+import io
+from collections import deque
+from typing import Callable, Deque, Iterable, Iterator, Optional, Set
+
+import requests
+from lxml import etree
+
+from .transport import TransportHTTP
+
+
+def _local(tag) -> str:
+    """Retourne le nom local d'une balise XML (sans espace de noms)."""
+    if not isinstance(tag, str):
+        return ""
+    return tag.rsplit('}', 1)[-1]
+
+
+class LecteurSitemap:
+    """
+    Lecteur de sitemaps en flux.
+
+    Chaque sitemap est téléchargé en streaming et analysé de manière
+    incrémentale (lxml.etree.iterparse) ; les éléments déjà traités sont
+    libérés au fur et à mesure. Les sitemaps référencés par un index
+    sont lus à leur tour, dans l'ordre, dans la limite de `max_sitemaps`.
+    """
+
+    def __init__(self,
+                 transport: TransportHTTP,
+                 timeout: float = 30,
+                 max_sitemaps: int = 100,
+                 callback_log: Optional[Callable[[str], None]] = None):
+        """
+        Initialise le lecteur.
+
+        Args:
+            transport: Transport HTTP utilisé pour récupérer les sitemaps.
+            timeout: Délai maximum de réponse (secondes).
+            max_sitemaps: Nombre maximum de fichiers sitemap lus.
+            callback_log: Fonction(message) de journalisation (optionnel).
+        """
+        self._transport = transport
+        self._timeout = timeout
+        self._max_sitemaps = max(1, max_sitemaps)
+        self._callback_log = callback_log
+
+        # Compteurs
+        self.sitemaps_lus = 0
+        self.urls_lues = 0
+
+    def _log(self, message: str) -> None:
+        """Envoie un message de log."""
+        if self._callback_log:
+            self._callback_log(message)
+
+    def iterer_urls(self, sitemaps: Iterable[str]) -> Iterator[str]:
+        """
+        Produit les URLs de pages déclarées dans les sitemaps.
+
+        Args:
+            sitemaps: URLs des sitemaps (ou index de sitemaps) de départ.
+
+        Returns:
+            Itérateur sur les URLs de pages, dans l'ordre des fichiers.
+        """
+        a_lire: Deque[str] = deque()
+        connus: Set[str] = set()
+        for url in sitemaps:
+            if url not in connus:
+                connus.add(url)
+                a_lire.append(url)
+
+        while a_lire and self.sitemaps_lus < self._max_sitemaps:
+            url_sitemap = a_lire.popleft()
+            self.sitemaps_lus += 1
+
+            for nature, url in self._lire(url_sitemap):
+                if nature == 'sitemap':
+                    if url not in connus:
+                        connus.add(url)
+                        a_lire.append(url)
+                else:
+                    self.urls_lues += 1
+                    yield url
+
+    def _lire(self, url_sitemap: str) -> Iterator[tuple]:
+        """
+        Lit un fichier sitemap en flux.
+
+        Args:
+            url_sitemap: URL du sitemap.
+
+        Returns:
+            Itérateur de tuples ('url' | 'sitemap', adresse).
+        """
+        try:
+            reponse = self._transport.get(
+                url_sitemap, timeout=self._timeout, allow_redirects=True, stream=True
+            )
+        except requests.RequestException as e:
+            self._log(f"Sitemap inaccessible : {url_sitemap} - {str(e)}")
+            return
+
+        try:
+            if reponse.status_code != 200:
+                if reponse.status_code != 404:
+                    self._log(f"Sitemap ignoré (HTTP {reponse.status_code}) : {url_sitemap}")
+                return
+
+            # Décompression du transport (Content-Encoding) puis du fichier (.gz)
+            reponse.raw.decode_content = True
+            reponse.raw.auto_close = False  # Fin de flux lisible par les lecteurs tamponnés
+            flux = io.BufferedReader(reponse.raw, buffer_size=64 * 1024)
+            if flux.peek(2)[:2] == b'\x1f\x8b':
+                flux = gzip.GzipFile(fileobj=flux)
+
+            self._log(f"Lecture du sitemap : {url_sitemap}")
+            for _, element in etree.iterparse(flux, events=('end',), recover=True, huge_tree=True):
+                nom = _local(element.tag)
+                if nom == 'loc' and element.text:
+                    # <loc> d'une entrée de page ou d'index (pas image:loc, video:loc...)
+                    parent = element.getparent()
+                    nature = _local(parent.tag) if parent is not None else ''
+                    if nature in ('url', 'sitemap'):
+                        yield (nature, element.text.strip())
+                elif nom in ('url', 'sitemap'):
+                    # Libérer les entrées déjà traitées
+                    element.clear()
+                    while element.getprevious() is not None:
+                        del element.getparent()[0]
+        except (etree.XMLSyntaxError, OSError, EOFError, requests.RequestException) as e:
+            self._log(f"Sitemap illisible : {url_sitemap} - {str(e)}")
+        finally:
+            reponse.close()
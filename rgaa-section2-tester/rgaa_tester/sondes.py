@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Module de sonde des sources de cadres pour RGAA Section 2 Tester
+
+Aide à la vérification du critère 2.2 : chaque source de cadre distincte
+(`src` des iframes et frames, toutes origines confondues) est demandée une
+seule fois par audit, dans un pool de threads soumis aux régulateurs par
+hôte du crawler. La sonde relève le statut HTTP, l'URL finale et le titre
+du contenu chargé (og:title ou <title>), puis mesure sa proximité avec le
+titre du cadre. Les sources en erreur (4xx, 5xx, pas de réponse) sont
+signalées comme intégrations cassées.
+"""
+
+import re
+import threading
+import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from .analyzer import ResultatPage
+from .config import Config
+from .crawler import Crawler, PageCrawlee
+from .utils import nettoyer_texte, normaliser_url
+
+# Mots ignorés dans la comparaison des titres
+MOTS_VIDES = frozenset((
+    "le", "la", "les", "l", "un", "une", "des", "de", "du", "d", "et", "ou", "a", "au",
+    "aux", "en", "sur", "pour", "par", "avec", "dans", "the", "of", "and", "on", "in", "to"
+))
+
+_MOT = re.compile(r'[a-z0-9]+')
+
+# Ressemblance minimale de deux mots considérés comme identiques
+SEUIL_MOTS_PROCHES = 0.8
+
+
+def creer_sonde_cadres(config: Config, crawler: Crawler) -> Optional["SondeCadres"]:
+    """
+    Crée la sonde des sources de cadres si elle est activée.
+
+    Args:
+        config: Configuration de l'application.
+        crawler: Crawler utilisé pour les requêtes.
+
+    Returns:
+        Une nouvelle sonde, ou None si la sonde est désactivée.
+    """
+    if not config.get("analyse.sonder_sources_cadres", False):
+        return None
+    return SondeCadres(
+        crawler.sonder_cible,
+        workers=int(config.get("analyse.workers_sonde", 8)),
+        max_sources=int(config.get("analyse.max_sources_sondees", 2000))
+    )
+
+
+def _mots(texte: str) -> Set[str]:
+    """Mots significatifs d'un titre, sans accents ni casse."""
+    texte = unicodedata.normalize('NFKD', texte.lower())
+    texte = ''.join(c for c in texte if not unicodedata.combining(c))
+    return {mot for mot in _MOT.findall(texte) if mot not in MOTS_VIDES}
+
+
+def _mots_proches(mot: str, autre: str) -> bool:
+    """Indique si deux mots sont identiques à une flexion ou une faute de frappe près."""
+    return mot == autre or (min(len(mot), len(autre)) >= 4 and SequenceMatcher(None, mot, autre).ratio() >= SEUIL_MOTS_PROCHES)
+
+
+def similarite_titres(titre_cadre: str, titre_source: str) -> float:
+    """
+    Mesure la proximité entre le titre d'un cadre et celui du contenu chargé.
+
+    Le score est le coefficient de Dice sur les mots significatifs (sans
+    accents, casse ni mots vides) ; deux mots proches (pluriel, faute de
+    frappe) sont considérés comme communs.
+
+    Args:
+        titre_cadre: Attribut title du cadre.
+        titre_source: Titre du contenu chargé.
+
+    Returns:
+        Score entre 0 (aucun rapport) et 1 (titres équivalents).
+    """
+    mots_cadre, mots_source = _mots(titre_cadre), _mots(titre_source)
+    if not mots_cadre or not mots_source:
+        return 0.0
+    communs = sum(1 for mot in mots_cadre if any(_mots_proches(mot, autre) for autre in mots_source))
+    communs += sum(1 for mot in mots_source if any(_mots_proches(mot, autre) for autre in mots_cadre))
+    return round(communs / (len(mots_cadre) + len(mots_source)), 2)
+
+
+@dataclass
+class SondeSource:
+    """Résultat de la sonde d'une source de cadre."""
+    statut: int  # Statut HTTP (0 : pas de réponse)
+    url_finale: str
+    titres: List[str] = field(default_factory=list)  # og:title puis <title>, s'ils existent
+
+    @property
+    def en_erreur(self) -> bool:
+        """Indique si la source n'a pas répondu ou a répondu en erreur."""
+        return self.statut == 0 or self.statut >= 400
+
+
+class SondeCadres:
+    """
+    Sonde des sources de cadres.
+
+    Les sources des cadres d'une page sont toutes demandées avant que la
+    première réponse ne soit attendue ; le cache par source conserve le
+    résultat (ou la requête en cours) pour les pages suivantes. Le rythme
+    des requêtes vers chaque hôte est celui du crawler (délai, requêtes
+    simultanées, Retry-After, disjoncteur).
+    """
+
+    def __init__(self,
+                 sonder: Callable[[str], Optional[PageCrawlee]],
+                 workers: int = 8,
+                 max_sources: int = 2000):
+        """
+        Initialise la sonde.
+
+        Args:
+            sonder: Fonction(url) demandant une source (Crawler.sonder_cible).
+            workers: Nombre de sources demandées simultanément.
+            max_sources: Nombre maximum de sources distinctes sondées par audit.
+        """
+        self._sonder = sonder
+        self._max_sources = max_sources
+        self._executeur = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="rgaa-sonde")
+        # Source normalisée -> SondeSource (None : non sondée, robots.txt ou hôte suspendu)
+        self._cache: Dict[str, Future] = {}
+        self._verrou = threading.Lock()
+
+        # Compteurs
+        self.sources = 0  # Sources distinctes sondées
+        self.sources_en_erreur = 0  # Dont en erreur (4xx, 5xx, pas de réponse)
+        self.non_sondees = 0  # Interdites par le robots.txt ou hôte suspendu
+        self.reutilisations = 0  # Cadres servis par le cache par source
+        self.hors_limite = 0  # Cadres non sondés, `max_sources` atteint
+        self.cadres_en_erreur = 0  # Cadres dont la source est en erreur
+
+    def sonder(self, resultat: ResultatPage) -> None:
+        """
+        Complète les cadres visibles d'une page (cadres imbriqués compris)
+        avec la sonde de leur source.
+
+        Args:
+            resultat: Résultat d'analyse de la page.
+        """
+        en_attente = []
+        for cadre in resultat.tous_cadres():
+            cadre.statut_source = cadre.titre_source = cadre.similarite_titre = None
+            if cadre.est_cache or not cadre.url_src:
+                continue
+            future = self._source(normaliser_url(cadre.url_src))
+            if future is not None:
+                en_attente.append((cadre, future))
+
+        for cadre, future in en_attente:
+            sonde = future.result()
+            if sonde is None:
+                continue
+            cadre.statut_source = sonde.statut
+            cadre.url_cible = sonde.url_finale
+            if sonde.en_erreur:
+                self._compter('cadres_en_erreur')
+            if sonde.titres:
+                cadre.titre_source = sonde.titres[0]
+                if cadre.title:
+                    cadre.similarite_titre = max(similarite_titres(cadre.title, titre) for titre in sonde.titres)
+
+    def _source(self, source: str) -> Optional[Future]:
+        """
+        Retourne la sonde (futur) d'une source, en lançant la requête si besoin.
+
+        Args:
+            source: URL normalisée de la source.
+
+        Returns:
+            Futur de la sonde, ou None si la limite de sources est atteinte.
+        """
+        with self._verrou:
+            future = self._cache.get(source)
+            if future is not None:
+                self.reutilisations += 1
+                return future
+            if len(self._cache) >= self._max_sources:
+                self.hors_limite += 1
+                return None
+            future = self._executeur.submit(self._sonder_source, source)
+            self._cache[source] = future
+            return future
+
+    def _sonder_source(self, source: str) -> Optional[SondeSource]:
+        """
+        Demande une source et relève son statut, son URL finale et ses titres
+        (thread de la sonde).
+
+        Args:
+            source: URL normalisée de la source.
+
+        Returns:
+            Sonde de la source, ou None si elle n'a pas été demandée.
+        """
+        try:
+            page = self._sonder(source)
+        except Exception as e:
+            page = PageCrawlee(url=source, html="", statut_http=0, erreur=str(e))
+        if page is None:
+            self._compter('non_sondees')
+            return None
+
+        sonde = SondeSource(statut=page.statut_http, url_finale=page.url)
+        document = page.document
+        if document is not None and document.arbre is not None:
+            for meta in document.arbre.iter('meta'):
+                if 'og:title' in (meta.get('property'), meta.get('name')):
+                    titre = nettoyer_texte(meta.get('content') or '')
+                    if titre:
+                        sonde.titres.append(titre)
+                    break
+            titre = nettoyer_texte(document.titre or '')
+            if titre and titre not in sonde.titres:
+                sonde.titres.append(titre)
+
+        self._compter('sources')
+        if sonde.en_erreur:
+            self._compter('sources_en_erreur')
+        return sonde
+
+    def _compter(self, nom: str) -> None:
+        """Incrémente un compteur (appelé depuis plusieurs threads)."""
+        with self._verrou:
+            setattr(self, nom, getattr(self, nom) + 1)
+
+    def fermer(self) -> None:
+        """Arrête les threads de la sonde."""
+        self._executeur.shutdown(wait=True, cancel_futures=True)
+
+    def vers_dict(self) -> Dict[str, Any]:
+        """Retourne les compteurs de la sonde (rapport)."""
+        with self._verrou:
+            return {
+                'sources': self.sources,
+                'sources_en_erreur': self.sources_en_erreur,
+                'non_sondees': self.non_sondees,
+                'reutilisations': self.reutilisations,
+                'hors_limite': self.hors_limite,
+                'cadres_en_erreur': self.cadres_en_erreur,
+            }
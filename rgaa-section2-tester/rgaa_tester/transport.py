@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+Module de transport HTTP pour RGAA Section 2 Tester
+
+Fournit des sessions HTTP persistantes (keep-alive) mutualisées par hôte,
+partagées sans risque entre les workers du crawler.
+"""
+
+import threading
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class _PolitiqueSansCookies(DefaultCookiePolicy):
+    """Politique de cookies refusant tout cookie, à l'enregistrement comme à l'envoi."""
+
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+    def return_ok(self, cookie, request) -> bool:
+        return False
+
+
+class TransportHTTP:
+    """
+    Transport HTTP à sessions persistantes, une par hôte.
+
+    Chaque session est entièrement configurée à sa création puis n'est
+    plus modifiée : elle peut donc être utilisée simultanément par
+    plusieurs threads (le pool de connexions urllib3 est thread-safe).
+    Les sessions ne conservent aucun cookie : chaque page est récupérée
+    comme lors d'une première visite, comme avec des requêtes isolées.
+    Le pool est bloquant : un hôte n'a jamais plus de `taille_pool`
+    connexions ouvertes, et les connexions (et donc leur session TLS)
+    sont réutilisées au lieu d'être rouvertes à chaque requête.
+    """
+
+    def __init__(self, user_agent: str, taille_pool: int = 4, keep_alive: bool = True):
+        """
+        Initialise le transport.
+
+        Args:
+            user_agent: En-tête User-Agent envoyé à chaque requête.
+            taille_pool: Nombre maximum de connexions conservées par hôte.
+            keep_alive: Si False, ferme la connexion après chaque requête.
+        """
+        self._taille_pool = max(1, taille_pool)
+        self._keep_alive = keep_alive
+        self._en_tetes = {
+            'User-Agent': user_agent,
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+            'Connection': 'keep-alive' if keep_alive else 'close',
+        }
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._verrou = threading.Lock()
+
+    def session(self, url: str) -> requests.Session:
+        """
+        Retourne la session associée à l'hôte d'une URL (créée si besoin).
+
+        Args:
+            url: URL à récupérer.
+
+        Returns:
+            Session HTTP de l'hôte.
+        """
+        parsed = urlparse(url)
+        cle = f"{parsed.scheme}://{parsed.netloc}"
+
+        with self._verrou:
+            session = self._sessions.get(cle)
+            if session is None:
+                session = self._creer_session()
+                self._sessions[cle] = session
+            return session
+
+    def _creer_session(self) -> requests.Session:
+        """Crée une session configurée pour un hôte."""
+        session = requests.Session()
+        session.headers.update(self._en_tetes)
+        session.cookies.set_policy(_PolitiqueSansCookies())
+
+        # Quelques pools en plus de celui de l'hôte pour les redirections
+        # (http -> https, sous-domaine) sans évincer les connexions de l'hôte
+        adaptateur = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=self._taille_pool,
+            pool_block=True,
+            max_retries=0
+        )
+        session.mount('https://', adaptateur)
+        session.mount('http://', adaptateur)
+        return session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Effectue une requête GET via la session de l'hôte.
+
+        Args:
+            url: URL à récupérer.
+            **kwargs: Arguments transmis à requests.Session.get.
+
+        Returns:
+            Réponse HTTP.
+        """
+        return self.session(url).get(url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        """
+        Effectue une requête HEAD via la session de l'hôte.
+
+        Args:
+            url: URL à sonder.
+            **kwargs: Arguments transmis à requests.Session.head.
+
+        Returns:
+            Réponse HTTP (sans corps).
+        """
+        return self.session(url).head(url, **kwargs)
+
+    def fermer(self) -> None:
+        """Ferme toutes les sessions et leurs connexions."""
+        with self._verrou:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    @property
+    def nombre_sessions(self) -> int:
+        """Retourne le nombre de sessions ouvertes."""
+        with self._verrou:
+            return len(self._sessions)
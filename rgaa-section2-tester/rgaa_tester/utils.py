@@ -5,44 +5,192 @@ Module utilitaire pour RGAA Section 2 Tester
 Fonctions utilitaires diverses pour le traitement d'URLs, de texte, etc.
 """
 
+import fnmatch
 import platform
 import re
 import sys
 from datetime import datetime
-from typing import Dict, Optional, Tuple
-from urllib.parse import urljoin, urlparse
+from functools import lru_cache
+from typing import Dict, Iterable, NamedTuple, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlsplit
+
+
+class UrlCanonique(NamedTuple):
+    """URL canonique et ses composants, pour éviter de la réanalyser."""
+    url: str
+    schema: str
+    hote: str
+    chemin: str
+    requete: str
+
+
+# Paramètres de suivi ignorés par défaut (mode 'conserver')
+PARAMETRES_SUIVI = ('utm_*', 'fbclid', 'gclid', 'msclkid', 'mc_cid', 'mc_eid', '_ga')
+
+_PORTS_PAR_DEFAUT = {'http': ':80', 'https': ':443'}
+_SCHEMA_HTTP = re.compile(r'https?://', re.IGNORECASE)
+
+
+class NormaliseurURL:
+    """
+    Moteur de canonicalisation d'URLs avec mémo LRU borné.
+
+    La chaîne de requête est traitée selon un mode :
+    - 'supprimer' : elle est entièrement retirée ;
+    - 'conserver' : tous les paramètres sont gardés, sauf ceux qui
+      correspondent à `parametres_ignores` (motifs du type utm_*) ;
+    - 'liste_blanche' : seuls les paramètres correspondant à
+      `parametres_conserves` sont gardés.
+    Les paramètres gardés sont triés pour que leur ordre ne crée pas
+    de doublons.
+    """
 
+    MODES = ('supprimer', 'conserver', 'liste_blanche')
 
-def normaliser_url(url: str) -> str:
+    def __init__(self,
+                 mode_requete: str = 'conserver',
+                 parametres_ignores: Iterable[str] = PARAMETRES_SUIVI,
+                 parametres_conserves: Iterable[str] = (),
+                 taille_memo: int = 10000):
+        """
+        Initialise le moteur.
+
+        Args:
+            mode_requete: Traitement de la chaîne de requête (voir MODES).
+            parametres_ignores: Motifs de paramètres retirés (mode 'conserver').
+            parametres_conserves: Motifs de paramètres gardés (mode 'liste_blanche').
+            taille_memo: Nombre maximum d'URLs mémorisées.
+        """
+        if mode_requete not in self.MODES:
+            raise ValueError(f"Mode de requête inconnu : {mode_requete}")
+
+        self.mode_requete = mode_requete
+        self._ignores = self._compiler(parametres_ignores)
+        self._conserves = self._compiler(parametres_conserves)
+        self.analyser = lru_cache(maxsize=max(1, taille_memo))(self._analyser)
+
+    @staticmethod
+    def _compiler(motifs: Iterable[str]) -> Optional[Pattern]:
+        """Compile une liste de motifs (insensibles à la casse) en une expression."""
+        motifs = [fnmatch.translate(motif.lower()) for motif in motifs]
+        return re.compile('|'.join(motifs)) if motifs else None
+
+    def _garder(self, nom: str) -> bool:
+        """Indique si un paramètre de requête est conservé."""
+        nom = nom.lower()
+        if self.mode_requete == 'liste_blanche':
+            return self._conserves is not None and self._conserves.match(nom) is not None
+        return self._ignores is None or self._ignores.match(nom) is None
+
+    def _analyser(self, url: str) -> UrlCanonique:
+        """
+        Canonicalise une URL (résultat mémorisé par `analyser`).
+
+        Args:
+            url: URL à normaliser.
+
+        Returns:
+            URL canonique et ses composants.
+        """
+        # Supprimer les espaces
+        url = url.strip()
+
+        # Ajouter le protocole si manquant
+        if not _SCHEMA_HTTP.match(url):
+            url = 'https://' + url
+
+        # Parser l'URL
+        parsed = urlsplit(url)
+
+        # Reconstruire l'URL normalisée (sans fragment ni port par défaut)
+        schema = parsed.scheme.lower()
+        hote = parsed.netloc.lower()
+        port = _PORTS_PAR_DEFAUT.get(schema)
+        if port and hote.endswith(port):
+            hote = hote[:-len(port)]
+        chemin = parsed.path or '/'
+
+        # Supprimer le slash final sauf pour la racine
+        if chemin != '/' and chemin.endswith('/'):
+            chemin = chemin[:-1]
+
+        requete = ''
+        if parsed.query and self.mode_requete != 'supprimer':
+            parametres = [
+                (nom, valeur)
+                for nom, valeur in parse_qsl(parsed.query, keep_blank_values=True)
+                if self._garder(nom)
+            ]
+            requete = urlencode(sorted(parametres))
+
+        url_canonique = f"{schema}://{hote}{chemin}"
+        if requete:
+            url_canonique += f"?{requete}"
+        return UrlCanonique(url_canonique, schema, hote, chemin, requete)
+
+
+_normaliseur = NormaliseurURL()
+
+
+def configurer_normalisation(normaliseur: NormaliseurURL) -> None:
+    """
+    Remplace le moteur de canonicalisation utilisé par normaliser_url.
+
+    Args:
+        normaliseur: Moteur configuré (règles de requête, taille du mémo).
     """
-    Normalise une URL pour éviter les doublons.
+    global _normaliseur
+    _normaliseur = normaliseur
+
+
+def configurer_normalisation_depuis(crawler_config: Dict, avertir: bool = True) -> None:
+    """
+    Configure la canonicalisation des URLs d'après la section crawler de la
+    configuration (crawler et processus d'analyse appliquent ainsi les
+    mêmes règles).
+
+    Args:
+        crawler_config: Section crawler de la configuration.
+        avertir: Affiche un avertissement si les règles sont invalides.
+    """
+    try:
+        normaliseur = NormaliseurURL(
+            crawler_config.get('parametres_requete', 'conserver'),
+            crawler_config.get('parametres_ignores', PARAMETRES_SUIVI),
+            crawler_config.get('parametres_conserves', ()),
+            int(crawler_config.get('taille_memo_url', 10000))
+        )
+    except ValueError as e:
+        if avertir:
+            print(f"Avertissement: {e} ; règles de normalisation par défaut utilisées")
+        normaliseur = NormaliseurURL()
+    configurer_normalisation(normaliseur)
+
+
+def analyser_url(url: str) -> UrlCanonique:
+    """
+    Canonicalise une URL et retourne ses composants.
 
     Args:
         url: URL à normaliser.
 
     Returns:
-        URL normalisée.
+        URL canonique et ses composants (schéma, hôte, chemin, requête).
     """
-    # Supprimer les espaces
-    url = url.strip()
+    return _normaliseur.analyser(url)
 
-    # Ajouter le protocole si manquant
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
 
-    # Parser l'URL
-    parsed = urlparse(url)
-
-    # Reconstruire l'URL normalisée (sans fragment)
-    scheme = parsed.scheme.lower()
-    netloc = parsed.netloc.lower()
-    path = parsed.path or '/'
+def normaliser_url(url: str) -> str:
+    """
+    Normalise une URL pour éviter les doublons.
 
-    # Supprimer le slash final sauf pour la racine
-    if path != '/' and path.endswith('/'):
-        path = path[:-1]
+    Args:
+        url: URL à normaliser.
 
-    return f"{scheme}://{netloc}{path}"
+    Returns:
+        URL normalisée.
+    """
+    return _normaliseur.analyser(url).url
 
 
 def est_url_valide(url: str) -> bool:
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Tests de reprise d'un crawl interrompu (redirections et URLs canoniques).
+"""
+
+import http.server
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from rgaa_tester.analyzer import AnalyseurRGAA  # noqa: E402
+from rgaa_tester.config import Config  # noqa: E402
+from rgaa_tester.crawler import Crawler  # noqa: E402
+from rgaa_tester.reprise import JournalCrawl  # noqa: E402
+
+PAGES = {
+    '/': '<a href="/old">a</a><a href="/dup">b</a><a href="/canon">c</a><a href="/p1">d</a><a href="/p2">e</a>',
+    '/new': '<p>Cible de la redirection</p>',
+    '/dup': '<link rel="canonical" href="/canon"><p>Contenu</p>',
+    '/canon': '<link rel="canonical" href="/canon"><p>Contenu</p>',
+    '/p1': '<iframe src="/p2" title="Page 2"></iframe>',
+    '/p2': '<p>Fin</p>',
+}
+
+
+class _Gestionnaire(http.server.BaseHTTPRequestHandler):
+    demandes = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.demandes.append(self.path)
+        if self.path == '/old':
+            self.send_response(301)
+            self.send_header('Location', '/new')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if self.path not in PAGES:
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        corps = f'<html><head><title>{self.path}</title></head><body>{PAGES[self.path]}</body></html>'.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corps)))
+        self.end_headers()
+        self.wfile.write(corps)
+
+
+@pytest.fixture
+def site():
+    serveur = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _Gestionnaire)
+    serveur.daemon_threads = True
+    threading.Thread(target=serveur.serve_forever, daemon=True).start()
+    _Gestionnaire.demandes = []
+    yield f"http://127.0.0.1:{serveur.server_address[1]}"
+    serveur.shutdown()
+    serveur.server_close()
+
+
+def _config(fichier: Path) -> Config:
+    config = Config()
+    config.set("crawler.fichier_reprise", str(fichier))
+    config.set("crawler.delai_entre_requetes", 0)
+    config.set("crawler.cache_http", False)
+    config.set("crawler.respecter_robots_txt", False)
+    config.set("crawler.utiliser_sitemap", False)
+    config.set("analyse.memo_analyse", False)
+    return config
+
+
+def _crawler(config: Config, journal: JournalCrawl, url: str, pages_analysees: int):
+    """Crawle `url`, enregistre les `pages_analysees` premières pages puis interrompt le crawl."""
+    crawler = Crawler(config)
+    analyseur = AnalyseurRGAA(config)
+    urls = []
+    pages = crawler.iterer_pages(url, 20, journal)
+    for page in pages:
+        urls.append(page.url)
+        if len(urls) > pages_analysees:
+            break
+        journal.enregistrer_page(analyseur.analyser_page(page.document or page.html, page.url), page.alias)
+    pages.close()
+    crawler.fermer()
+    return urls
+
+
+def test_reprise_sans_nouvelle_recuperation_des_alias(site, tmp_path):
+    fichier = tmp_path / "reprise.sqlite"
+
+    # Référence : crawl complet, /canon est écartée comme URL canonique de /dup
+    journal = JournalCrawl.creer(str(tmp_path / "complet.sqlite"), site + "/", 20)
+    complet = _crawler(_config(tmp_path / "complet.sqlite"), journal, site + "/", 20)
+    journal.fermer()
+    assert [url[len(site):] for url in complet] == ['/', '/new', '/dup', '/p1', '/p2']
+
+    # Crawl interrompu après /, /old (-> /new) et /dup ; /p1 récupérée mais pas analysée
+    journal = JournalCrawl.creer(str(fichier), site + "/", 20)
+    interrompu = _crawler(_config(fichier), journal, site + "/", 3)
+    journal.fermer()
+    assert [url[len(site):] for url in interrompu] == ['/', '/new', '/dup', '/p1']
+
+    _Gestionnaire.demandes = []
+    journal = JournalCrawl.reprendre(str(fichier), journal.id_audit)
+    repris = _crawler(_config(fichier), journal, site + "/", 20)
+    journal.fermer()
+
+    assert [url[len(site):] for url in repris] == ['/p1', '/p2']
+    assert not {'/', '/old', '/new', '/dup', '/canon'} & set(_Gestionnaire.demandes)